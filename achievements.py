@@ -2,8 +2,11 @@
 
 import json
 import os
+import sqlite3
 
-PROFILES_FILE = "profiles.json"
+from profile_store import ProfileStore, PROFILES_DB_FILE
+
+PROFILES_FILE = "profiles.json"  # источник однократного переноса в PROFILES_DB_FILE
 LAST_PROFILE_FILE = "last_profile.json"
 USER_SETTINGS_FILE = "user_settings.json"  # ОБЪЕДИНЕННЫЙ ФАЙЛ НАСТРОЕК
 
@@ -20,31 +23,63 @@ def create_default_achievements():
     return achievements
 
 
+_profile_store = None
+
+
+def get_profile_store():
+    global _profile_store
+    if _profile_store is None:
+        _profile_store = ProfileStore(PROFILES_DB_FILE)
+        _profile_store.migrate_from_json(PROFILES_FILE)
+    return _profile_store
+
+
 def load_all_profiles_data():
-    if not os.path.exists(PROFILES_FILE):
-        default_data = {"Guest": create_default_achievements()}
-        save_all_profiles_data(default_data)
-        return default_data
     try:
-        with open(PROFILES_FILE, "r") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
+        profiles_data = get_profile_store().load_all()
+    except sqlite3.Error as e:
         print(f"Ошибка загрузки профилей: {e}. Создание профиля по умолчанию.")
         return {"Guest": create_default_achievements()}
+    if not profiles_data:
+        profiles_data = {"Guest": create_default_achievements()}
+        save_all_profiles_data(profiles_data)
+    return profiles_data
 
 
 def save_all_profiles_data(profiles_data):
     try:
-        with open(PROFILES_FILE, "w") as f:
-            json.dump(profiles_data, f, indent=4)
-    except IOError as e:
+        get_profile_store().replace_all(profiles_data)
+    except sqlite3.Error as e:
         print(f"Ошибка сохранения профилей: {e}")
 
 
+def save_profile(profile_name, achievements):
+    try:
+        get_profile_store().save_profile(profile_name, achievements)
+    except sqlite3.Error as e:
+        print(f"Ошибка сохранения профиля: {e}")
+
+
+def save_profile_value(profile_name, key, value):
+    """Сохраняет одно изменившееся значение профиля."""
+    try:
+        get_profile_store().set_value(profile_name, key, value)
+    except sqlite3.Error as e:
+        print(f"Ошибка сохранения профиля: {e}")
+
+
+def delete_profile(profile_name):
+    try:
+        get_profile_store().delete_profile(profile_name)
+    except sqlite3.Error as e:
+        print(f"Ошибка удаления профиля: {e}")
+
+
 # ИЗМЕНЕНО: Создает новую структуру данных для нового профиля
 def get_achievements_for_profile(profiles_data, profile_name):
     if profile_name not in profiles_data:
         profiles_data[profile_name] = create_default_achievements()
+        save_profile(profile_name, profiles_data[profile_name])
     # Проверка на случай, если у старого профиля нет новых ключей
     elif not all(
         key in profiles_data[profile_name] for key in create_default_achievements()
@@ -52,6 +87,7 @@ def get_achievements_for_profile(profiles_data, profile_name):
         default_achievements = create_default_achievements()
         default_achievements.update(profiles_data[profile_name])
         profiles_data[profile_name] = default_achievements
+        save_profile(profile_name, default_achievements)
 
     return profiles_data[profile_name]
 
@@ -0,0 +1,330 @@
+# assets.py
+
+"""Области видимости ресурсов: каждое состояние объявляет, какие изображения
+ему нужны, и держит их через счетчик ссылок.
+
+StateManager при переходе захватывает ресурсы нового состояния, затем
+отпускает ресурсы старого: общие ресурсы не перезагружаются, а ресурсы, на
+которые больше никто не ссылается, выгружаются вместе с исходником в памяти.
+Подсказки предзагрузки (State.preload_hints) заранее масштабируют в фоне
+ресурсы следующего вероятного состояния, поэтому переход проходит без
+заминки. Небольшой набор ресурсов (курсор, значки интерфейса, птицы) и
+звуки загружены всегда.
+
+Менеджер считает байты каждого ресурса и категории. Ресурсы без ссылок не
+выгружаются сразу, а остаются в кэше, пока общий объем (с декодированными
+исходниками и звуками) укладывается в бюджет; при превышении первыми
+выгружаются те, что дольше всех не захватывались. Исходники постоянных и
+захваченных ресурсов закреплены: смена разрешения не декодирует их заново.
+Готовые фоновые предзагрузки забирает poll() из главного цикла, сразу
+укладывая объем в бюджет.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+from settings import (
+    ASSET_MEMORY_BUDGET,
+    build_images,
+    image_specs,
+    load_images_async,
+    source_images,
+    spec_name,
+)
+
+# Нужны почти каждому кадру любого состояния
+RESIDENT_IMAGES = (
+    "cursor_img",
+    "speaker_on_img",
+    "speaker_off_img",
+    "pause_img",
+    "resume_img",
+    "lightbulb_img",
+    "bird_imgs",
+)
+MENU_IMAGES = ("menu_background",)
+SLINGSHOT_IMAGES = (
+    "background_far",
+    "background_near",
+    "small_bird_img",
+    "target_img",
+    "target_defeated_img",
+    "brick_img",
+    "smoke_img",
+    "feather_imgs",
+)
+MATCH3_IMAGES = ("background",)
+BACKGROUND_IMAGES = (
+    "menu_background",
+    "background",
+    "background_far",
+    "background_near",
+)
+UI_IMAGES = tuple(name for name in RESIDENT_IMAGES if name != "bird_imgs")
+
+
+def surface_bytes(image):
+    """Сколько байт пикселей держит ресурс (поверхность или список поверхностей)."""
+    if isinstance(image, list):
+        return sum(surface_bytes(item) for item in image if item is not None)
+    return image.get_pitch() * image.get_height()
+
+
+def sound_bytes(sound):
+    """Объем декодированного PCM звука в формате микшера."""
+    mixer = pygame.mixer.get_init()
+    if mixer is None:
+        return 0
+    frequency, size, channels = mixer
+    return int(sound.get_length() * frequency) * channels * (abs(size) // 8)
+
+
+def image_category(name):
+    if name in BACKGROUND_IMAGES:
+        return "backgrounds"
+    if name in UI_IMAGES:
+        return "ui"
+    return "sprites"
+
+
+class AssetImages(dict):
+    """Словарь game_state["images"]: недостающий ресурс грузится при обращении."""
+
+    def __init__(self, manager, images=()):
+        super().__init__(images)
+        self.manager = manager
+
+    def __missing__(self, name):
+        return self.manager.load_now(name)
+
+
+class AssetManager:
+    def __init__(self, images, metrics, budget=ASSET_MEMORY_BUDGET):
+        """images — уже загруженные ресурсы, metrics — (ширина, высота,
+        масштаб интерфейса, масштаб игры), под которые они масштабированы."""
+        self.metrics = metrics
+        self.budget = budget
+        self.images = AssetImages(self, images)
+        self.refs = {}
+        self.pending = {}  # имя -> (metrics, future) фоновой предзагрузки
+        self.hinted = set()
+        self.files = {}
+        for key, filename, *_ in image_specs(*metrics):
+            self.files.setdefault(spec_name(key), []).append(filename)
+        self.recent = OrderedDict()  # имя -> байты; от давних к недавним
+        self.sounds = {}  # имя -> байты PCM
+        self.peak = 0
+        for name in images:
+            self._touch(name)
+        self._pin_sources()
+
+    def _pin_sources(self):
+        # Исходники постоянных и захваченных ресурсов не вытесняются
+        source_images.pin(
+            filename
+            for name, files in self.files.items()
+            if name in RESIDENT_IMAGES or self.refs.get(name, 0) > 0
+            for filename in files
+        )
+
+    def _touch(self, name):
+        self.recent[name] = surface_bytes(self.images.get(name))
+        self.recent.move_to_end(name)
+
+    def track_sounds(self, sounds):
+        """Учитывает звуки в общем объеме; они не выгружаются."""
+        self.sounds = {
+            name: sound_bytes(sound)
+            for name, sound in sounds.items()
+            if isinstance(sound, pygame.mixer.Sound)
+        }
+        self.enforce_budget()
+
+    def total_bytes(self):
+        return (
+            sum(self.recent.values()) + sum(self.sounds.values()) + source_images.total
+        )
+
+    def _take_pending(self, name, wait):
+        # Забирает готовую (или дожидается, если wait) предзагрузку ресурса
+        metrics, future = self.pending.get(name, (None, None))
+        if future is None or not (wait or future.done()):
+            return
+        for loaded_name in [n for n, p in self.pending.items() if p[1] is future]:
+            del self.pending[loaded_name]
+        try:
+            images = future.result()
+        except Exception as e:
+            print(f"Ошибка предзагрузки изображений: {e}")
+            return
+        if metrics == self.metrics:
+            for loaded_name, image in images.items():
+                if loaded_name not in self.images:
+                    self.images[loaded_name] = image
+                    self._touch(loaded_name)
+
+    def _load(self, names):
+        for name in names:
+            if name in self.images:
+                self._touch(name)
+        for name in names:
+            if name not in self.images:
+                self._take_pending(name, wait=True)
+        missing = [name for name in names if name not in self.images]
+        if missing:
+            self.images.update(build_images(*self.metrics, names=missing))
+            for name in missing:
+                self._touch(name)
+        self.enforce_budget(keep=names)
+
+    def load_now(self, name):
+        if name not in self.files:
+            raise KeyError(name)
+        self._load((name,))
+        return self.images.get(name)
+
+    def acquire(self, names):
+        for name in names:
+            self.refs[name] = self.refs.get(name, 0) + 1
+        self._pin_sources()
+        self._load(names)
+
+    def release(self, names):
+        for name in names:
+            self.refs[name] = self.refs.get(name, 0) - 1
+        self._pin_sources()
+        self.enforce_budget()
+
+    def evictable(self, name):
+        return (
+            name not in RESIDENT_IMAGES
+            and self.refs.get(name, 0) <= 0
+            and name not in self.hinted
+        )
+
+    def evict(self, name):
+        """Выгружает ресурс вместе с его декодированными исходниками."""
+        del self.images[name]
+        self.recent.pop(name, None)
+        for filename in self.files[name]:
+            source_images.discard(filename)
+
+    def enforce_budget(self, keep=()):
+        """Выгружает давно не использованные ресурсы без ссылок (кроме keep),
+        пока объем больше бюджета; возвращает выгруженные имена."""
+        evicted = []
+        total = self.total_bytes()
+        self.peak = max(self.peak, total)
+        for name in list(self.recent):
+            if total <= self.budget:
+                break
+            if name not in keep and self.evictable(name):
+                self.evict(name)
+                evicted.append(name)
+                total = self.total_bytes()
+        if total > self.budget:
+            # Исходники нужны только для быстрой смены разрешения
+            source_images.trim(max(0, source_images.total - (total - self.budget)))
+        return evicted
+
+    def preload(self, names):
+        """Масштабирует ресурсы в фоновом потоке, если их еще нет."""
+        self.hinted = set(names)
+        missing = [
+            name
+            for name in names
+            if name not in self.images
+            and self.pending.get(name, (None,))[0] != self.metrics
+        ]
+        if missing:
+            future = load_images_async(*self.metrics, names=missing)
+            for name in missing:
+                self.pending[name] = (self.metrics, future)
+
+    def poll(self):
+        """Забирает завершенные фоновые предзагрузки и сразу укладывает объем
+        в бюджет; вызывается из главного цикла раз в кадр."""
+        done = [name for name, (_, future) in self.pending.items() if future.done()]
+        for name in done:
+            self._take_pending(name, wait=False)
+        if done:
+            self.enforce_budget()
+
+    def loaded_names(self):
+        return set(self.images)
+
+    def replace(self, images, metrics):
+        """Подменяет ресурсы пересчитанными под новое разрешение; словарь
+        остается тем же объектом."""
+        self.metrics = metrics
+        self.pending.clear()
+        self.images.clear()
+        self.images.update(images)
+        order = [name for name in self.recent if name in images]
+        self.recent.clear()
+        for name in order + [name for name in images if name not in order]:
+            self._touch(name)
+        self.enforce_budget()
+
+    def estimate_bytes(self, name):
+        """Размер ресурса: точный для загруженного, иначе оценка по размерам
+        из image_specs (4 байта на пиксель)."""
+        if name in self.images:
+            return surface_bytes(self.images.get(name))
+        total = 0
+        for key, _, _, size in image_specs(*self.metrics):
+            if spec_name(key) != name or size is None:
+                continue
+            if size[0] == "width":
+                # Высота до загрузки неизвестна: оценка сверху квадратом
+                total += 4 * size[1] * size[1]
+            else:
+                total += 4 * size[-2] * size[-1]
+        return total
+
+    def report(self, states=None):
+        """Байты по ресурсам и категориям, бюджет и пик; если передан словарь
+        состояний — объем, который каждое из них держит вместе с постоянными."""
+        sizes = dict(self.recent)
+        categories = {"backgrounds": 0, "sprites": 0, "ui": 0}
+        for name, nbytes in sizes.items():
+            categories[image_category(name)] += nbytes
+        categories["sounds"] = sum(self.sounds.values())
+        categories["sources"] = source_images.total
+        total = sum(categories.values())
+        self.peak = max(self.peak, total)
+        report = {
+            "images": sizes,
+            "sounds": dict(self.sounds),
+            "categories": categories,
+            "total": total,
+            "peak": self.peak,
+            "budget": self.budget,
+        }
+        if states is not None:
+            resident = sum(self.estimate_bytes(name) for name in RESIDENT_IMAGES)
+            report["states"] = {
+                state_name: resident
+                + sum(
+                    self.estimate_bytes(name)
+                    for name in set(state.assets) - set(RESIDENT_IMAGES)
+                )
+                for state_name, state in states.items()
+            }
+        return report
+
+
+def format_report(report):
+    """Строки отладочного оверлея (F3): итог, пик, бюджет и категории в КБ."""
+    lines = [
+        "Ресурсы: {} / пик {} / бюджет {} КБ".format(
+            report["total"] // 1024, report["peak"] // 1024, report["budget"] // 1024
+        )
+    ]
+    for category, nbytes in report["categories"].items():
+        lines.append(f"  {category}: {nbytes // 1024} КБ")
+    largest = sorted(report["images"].items(), key=lambda item: -item[1])[:3]
+    for name, nbytes in largest:
+        lines.append(f"  {name}: {nbytes // 1024} КБ")
+    return lines
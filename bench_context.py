@@ -0,0 +1,48 @@
+# bench_context.py
+
+"""Замер одного чтения состояния игры: словарь, GameContext по ключу и
+атрибуты раздела, в наносекундах на обращение.
+
+    python bench_context.py --number 2000000
+
+Большая часть кода еще читает game_state["ключ"] через совместимый доступ
+GameContext; замер держит его цену на виду рядом с прямым атрибутом.
+"""
+
+import argparse
+import timeit
+
+from context import GameContext
+
+CASES = (
+    ('dict["score"]', 'values["score"]'),
+    ('GameContext["score"]', 'game_state["score"]'),
+    ('GameContext.get("score")', 'game_state.get("score")'),
+    ("section.score", "section.score"),
+    ("game_state.slingshot.score", "game_state.slingshot.score"),
+)
+
+
+def run(number, repeat=5):
+    values = {"score": 0, "WIDTH": 800, "paused": False}
+    game_state = GameContext(values)
+    namespace = {
+        "values": values,
+        "game_state": game_state,
+        "section": game_state.slingshot,
+    }
+    return {
+        label: min(timeit.repeat(stmt, globals=namespace, number=number, repeat=repeat))
+        / number
+        * 1e9
+        for label, stmt in CASES
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Замер доступа к game_state.")
+    parser.add_argument("--number", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    for label, ns in run(args.number).items():
+        print(f"{label:28s} {ns:6.1f} нс")
@@ -0,0 +1,100 @@
+# bench_entities.py
+
+"""Замер кадра с 1000 мишенями: шаг физики, снятие положений, обновление,
+столкновения и отрисовка, в миллисекундах на кадр.
+
+    python bench_entities.py --count 1000 --frames 300
+
+Работает без окна. На деревьях до entities.EntityGroup берется
+pygame.sprite.Group, так что те же цифры снимаются и со старого кода.
+"""
+
+import argparse
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import entities
+
+WIDTH, HEIGHT, GROUND = 1280, 720, 700
+SIZE = 50
+
+
+def run(count, frames, seed=1):
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    group_cls = getattr(entities, "EntityGroup", pygame.sprite.Group)
+    img = pygame.transform.scale(
+        pygame.image.load("target.png").convert_alpha(), (SIZE, SIZE)
+    )
+    rng = random.Random(seed)
+    space = entities.create_space(WIDTH, HEIGHT, GROUND)
+    group = group_cls()
+    for _ in range(count):
+        group.add(
+            entities.Target(
+                rng.uniform(50, WIDTH - 50),
+                rng.uniform(50, GROUND - 50),
+                rng.uniform(-2, 2),
+                rng.uniform(-2, 2),
+                SIZE,
+                space,
+                img,
+            )
+        )
+    bird = entities.MainBird(200, 400, SIZE, space)
+    bird.set_image(img, 0)
+
+    def collide():
+        if hasattr(group, "collide"):
+            return group.collide(bird)
+        return pygame.sprite.spritecollide(
+            bird, group, False, pygame.sprite.collide_mask
+        )
+
+    phases = dict.fromkeys(("step", "sync", "update", "collide", "draw"), 0.0)
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        space.step(1 / 60)
+        t1 = time.perf_counter()
+        if hasattr(group, "sync"):
+            group.sync()
+            bird.pull()
+        t2 = time.perf_counter()
+        group.update(1 / 60, WIDTH, HEIGHT)
+        bird.update(1 / 60, 0, GROUND, WIDTH, HEIGHT)
+        t3 = time.perf_counter()
+        collide()
+        t4 = time.perf_counter()
+        screen.fill((0, 0, 0))
+        group.draw(screen)
+        t5 = time.perf_counter()
+        for name, start, end in (
+            ("step", t0, t1),
+            ("sync", t1, t2),
+            ("update", t2, t3),
+            ("collide", t3, t4),
+            ("draw", t4, t5),
+        ):
+            phases[name] += end - start
+    return {name: total / frames * 1000 for name, total in phases.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Замер кадра с множеством сущностей.")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    pygame.display.init()
+    phases = run(args.count, args.frames)
+    for name, ms in phases.items():
+        print(f"{name:8s} {ms:7.3f} мс/кадр")
+    # Физика общая для любых сущностей: итог — то, что зависит от них
+    print(
+        f"{'итого':8s} {sum(phases.values()) - phases['step']:7.3f} мс/кадр без шага физики"
+    )
@@ -0,0 +1,221 @@
+# context.py
+
+"""Состояние игры по разделам со слотами вместо одного словаря по строкам.
+
+GameContext делит game_state на разделы: экран (display), ресурсы
+(resources), звук (audio), сессия рогатки (slingshot) и сессия 'Прохождения'
+(match3). Атрибуты раздела называются так же, как прежние ключи, а у
+объектов со __slots__ обращение к атрибуту дешевле поиска в словаре.
+Горячие пути (кадр рогатки и отрисовка доски) читают разделы напрямую:
+game_state.slingshot.targets.
+
+Остальной код по-прежнему пишет game_state["score"]: GameContext
+поддерживает протокол словаря и направляет ключ в его раздел. Ключи, для
+которых раздела нет (профили, меню, службы), лежат в обычном словаре extra.
+Пока слоту ничего не присвоено, ключа нет, как в словаре: get возвращает
+default, in — False, а чтение атрибута — AttributeError. Горячие пути
+читают только ключи, которые задают init_game и сбросы режимов.
+"""
+
+from collections.abc import MutableMapping
+
+
+class DisplayContext:
+    """Окно, кадр и размеры, зависящие от разрешения."""
+
+    __slots__ = (
+        "screen",
+        "window",
+        "fixed_resolution",
+        "pending_fixed_resolution",
+        "frame_cap",
+        "clock",
+        "viewport",
+        "screen_mode",
+        "pending_screen_mode",
+        "brightness_slider_pos",
+        "WIDTH",
+        "HEIGHT",
+        "scale_factor",
+        "game_scale_factor",
+        "object_size",
+        "small_object_size",
+        "gravity",
+        "GROUND_LEVEL",
+        "sling_x",
+        "sling_y",
+        "EXPLOSION_RADIUS",
+    )
+
+
+class ResourceContext:
+    __slots__ = ("assets", "images", "sounds", "fonts", "texts", "pending_images")
+
+
+class AudioSettings:
+    __slots__ = (
+        "sound_on",
+        "music_volume",
+        "sfx_volume",
+        "current_music_track_index",
+        "music",
+        "sfx",
+    )
+
+
+class SlingshotSession:
+    """Физика, сущности, счет и эффекты режима рогатки."""
+
+    __slots__ = (
+        "space",
+        "main_bird",
+        "targets",
+        "obstacles",
+        "small_birds",
+        "defeated_pigs",
+        "bird_queue",
+        "current_bird_type",
+        "current_shot_hit",
+        "score",
+        "lives",
+        "combo",
+        "game_over",
+        "target_duration",
+        "target_timer_start",
+        "explosions",
+        "MAX_EXPLOSION_FRAMES",
+        "trail_particles",
+        "dust_particles",
+        "spark_particles",
+        "feather_particles",
+        "last_shot_path",
+        "path_display_timer",
+        "screen_shake",
+        "shake_offset",
+        "boost_trail_start_time",
+        "show_rope",
+        "show_hint_popup",
+        "show_training_popup",
+        "training_complete",
+        "training_bird_index",
+        "training_shots_fired",
+        "training_popup_text",
+    )
+
+
+class Match3Session:
+    """Доска, анимации и бот режима 'Прохождение'."""
+
+    __slots__ = (
+        "campaign_level",
+        "campaign_grid_size",
+        "campaign_target_score",
+        "campaign_score",
+        "campaign_level_complete",
+        "campaign_board",
+        "campaign_board_state",
+        "campaign_cell_size",
+        "campaign_grid_rect",
+        "campaign_selected_tile",
+        "campaign_is_processing",
+        "campaign_matched_tiles",
+        "campaign_falling_tiles",
+        "campaign_refilling_tiles",
+        "campaign_clear_tween",
+        "campaign_dirty_cells",
+        "campaign_tweens",
+        "campaign_is_swapping",
+        "campaign_swap_anim",
+        "campaign_drag_start_pos",
+        "campaign_drag_start_tile",
+        "campaign_is_dragging_tile",
+        "campaign_demo",
+        "campaign_demo_wait",
+        "campaign_bot",
+        "show_campaign_hint_popup",
+    )
+
+
+SECTIONS = {
+    "display": DisplayContext,
+    "resources": ResourceContext,
+    "audio": AudioSettings,
+    "slingshot": SlingshotSession,
+    "match3": Match3Session,
+}
+# Ключ game_state -> раздел, в котором он хранится
+KEY_SECTIONS = {
+    key: section for section, cls in SECTIONS.items() for key in cls.__slots__
+}
+
+
+class GameContext(MutableMapping):
+    """game_state: разделы со слотами и совместимый с dict доступ по ключу."""
+
+    __slots__ = tuple(SECTIONS) + ("extra", "_route")
+
+    def __init__(self, values=()):
+        for section, cls in SECTIONS.items():
+            setattr(self, section, cls())
+        self.extra = {}
+        # Ключ -> объект раздела: один поиск в словаре на обращение
+        self._route = {
+            key: getattr(self, section) for key, section in KEY_SECTIONS.items()
+        }
+        self.update(values)
+
+    def __getitem__(self, key):
+        section = self._route.get(key)
+        if section is None:
+            return self.extra[key]
+        try:
+            return getattr(section, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        section = self._route.get(key)
+        if section is None:
+            self.extra[key] = value
+        else:
+            setattr(section, key, value)
+
+    def __delitem__(self, key):
+        section = self._route.get(key)
+        if section is None:
+            del self.extra[key]
+            return
+        try:
+            delattr(section, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        section = self._route.get(key)
+        if section is None:
+            return key in self.extra
+        return hasattr(section, key)
+
+    def __iter__(self):
+        for key, section in self._route.items():
+            if hasattr(section, key):
+                yield key
+        yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def get(self, key, default=None):
+        section = self._route.get(key)
+        if section is None:
+            return self.extra.get(key, default)
+        return getattr(section, key, default)
+
+    def update(self, values=(), **kwargs):
+        # Быстрее общего MutableMapping.update: reset_slingshot зовет его часто
+        if hasattr(values, "keys"):
+            values = values.items()
+        for key, value in values:
+            self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
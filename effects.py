@@ -0,0 +1,74 @@
+# effects.py
+
+"""Заранее отрисованные анимации эффектов.
+
+Кадры взрыва (масштаб, поворот и прозрачность по ключевым кадрам) строятся
+один раз на изображение дыма, то есть на разрешение. За кадр игры каждый
+активный взрыв — один blit готового кадра без копий поверхностей, сколько
+бы взрывов ни шло одновременно. Взрывы хранятся в game_state["explosions"]
+списками [x, y, оставшиеся кадры], как частицы в utils.py.
+"""
+
+import pygame
+
+# (доля анимации, масштаб, угол в градусах, прозрачность)
+EXPLOSION_KEYFRAMES = ((0.0, 0.9, 0.0, 255), (1.0, 1.15, 25.0, 0))
+
+
+def interpolate(keyframes, t):
+    """Масштаб, угол и прозрачность в момент t (0..1) между ключевыми кадрами."""
+    for (t0, *a), (t1, *b) in zip(keyframes, keyframes[1:]):
+        if t <= t1:
+            k = (t - t0) / (t1 - t0) if t1 > t0 else 0.0
+            return tuple(x + (y - x) * k for x, y in zip(a, b))
+    return tuple(keyframes[-1][1:])
+
+
+def bake_frames(image, count, keyframes=EXPLOSION_KEYFRAMES):
+    """Полоса из count кадров (поверхность, смещение от центра); кадр i
+    соответствует доле анимации i / count."""
+    frames = []
+    for i in range(count):
+        scale, angle, alpha = interpolate(keyframes, i / count)
+        frame = pygame.transform.rotozoom(image, angle, scale)
+        # Прозрачность вносится в альфа-канал пикселей, а кадр обрезается до
+        # видимой части: blit идет по обычному пути и по меньшей площади
+        frame.fill(
+            (255, 255, 255, max(0, min(255, int(alpha)))),
+            special_flags=pygame.BLEND_RGBA_MULT,
+        )
+        crop = frame.get_bounding_rect()
+        offset = (crop.x - frame.get_width() // 2, crop.y - frame.get_height() // 2)
+        frames.append((frame.subsurface(crop).copy(), offset))
+    return frames
+
+
+def spawn_explosion(explosions, x, y, frames):
+    explosions.append([x, y, frames])
+
+
+def update_explosions(explosions, dt_factor):
+    for explosion in explosions:
+        explosion[2] -= dt_factor
+    explosions[:] = [e for e in explosions if e[2] > 0]
+
+
+class EffectRenderer:
+    def __init__(self):
+        self.source = None  # изображение дыма, из которого построены кадры
+        self.frames = []
+
+    def prepare(self, smoke_img, frame_count):
+        if smoke_img is not self.source or len(self.frames) != frame_count:
+            self.source = smoke_img
+            self.frames = bake_frames(smoke_img, frame_count)
+
+    def draw_explosions(self, screen, explosions, smoke_img, frame_count):
+        # Перестройка после смены разрешения — сразу, а не на первом взрыве
+        self.prepare(smoke_img, frame_count)
+        last = frame_count - 1
+        for x, y, frames_left in explosions:
+            frame, (dx, dy) = self.frames[
+                min(last, max(0, int(frame_count - frames_left)))
+            ]
+            screen.blit(frame, (int(x) + dx, int(y) + dy))
@@ -6,31 +6,153 @@ import pymunk
 BIRD_FILTER = pymunk.ShapeFilter(categories=0b0001, mask=0b1010)
 TARGET_FILTER = pymunk.ShapeFilter(categories=0b0010, mask=0b1011)
 DEBRIS_FILTER = pymunk.ShapeFilter(categories=0b0100, mask=0b1000)
+WALL_FILTER = pymunk.ShapeFilter(categories=0b1000, mask=0b0111)
+
+GRAVITY = (0, 1800)
+
+
+def create_space(width, height, ground_level):
+    """Создает физическое пространство с полом и стенами вокруг экрана."""
+    space = pymunk.Space()
+    space.gravity = GRAVITY
+
+    floor = pymunk.Segment(space.static_body, (-2000, ground_level), (width + 2000, ground_level), 50)
+    floor.friction = 1.0
+    floor.elasticity = 0.5
+    floor.filter = WALL_FILTER
+    space.add(floor)
+
+    walls = [
+        pymunk.Segment(space.static_body, (0, -2000), (0, height), 50),
+        pymunk.Segment(space.static_body, (width, -2000), (width, height), 50),
+        pymunk.Segment(space.static_body, (-2000, -2000), (width + 2000, -2000), 50)
+    ]
+    for w in walls:
+        w.elasticity = 0.8; w.friction = 0.5; w.filter = WALL_FILTER
+        space.add(w)
+    return space
+
+class Entity:
+    """Основа игровых объектов: слоты вместо __dict__ и координаты тела pymunk,
+    снятые один раз за шаг физики (pull / EntityGroup.sync)."""
+    __slots__ = ("space", "size", "body", "shape", "x", "y", "angle", "original_image", "image", "rect", "_mask", "_image_angle", "groups")
+
+    def __init__(self, space, size):
+        self.space = space
+        self.size = int(size)
+        self.groups = []
+        self.original_image = None
+        self._mask = None
+        self._image_angle = None
+
+    def _add_body(self, body, shape, x, y):
+        self.body, self.shape = body, shape
+        body.position = (x, y)
+        self.x, self.y, self.angle = x, y, 0.0
+        self.space.add(body, shape)
+
+    def pull(self):
+        """Снимает положение и угол с тела pymunk."""
+        self.x, self.y = self.body.position
+        self.angle = self.body.angle
+
+    def _fix_nan(self, fallback):
+        if math.isnan(self.angle): self.body.angle = self.angle = 0.0
+        if math.isnan(self.x) or math.isnan(self.y):
+            self.body.position = fallback; self.x, self.y = fallback
+
+    def _set_image(self, image, angle=None):
+        self.image = image; self._mask = None; self._image_angle = angle
+        self.rect = image.get_rect(center=(int(self.x), int(self.y)))
+
+    def _rotate(self):
+        # Поворот пересчитывается только при изменении угла, маска строится
+        # только для проверки столкновения
+        angle_deg = math.degrees(-self.angle) % 360
+        if angle_deg != self._image_angle:
+            self._image_angle = angle_deg
+            try: self.image = pygame.transform.rotate(self.original_image, angle_deg)
+            except ValueError: self.image = self.original_image
+            self._mask = None
+        self.rect = self.image.get_rect(center=(int(self.x), int(self.y)))
+
+    @property
+    def mask(self):
+        if self._mask is None: self._mask = pygame.mask.from_surface(self.image)
+        return self._mask
+
+    def kill(self):
+        if self.shape.space is not None:
+            self.space.remove(self.body, self.shape)
+        for group in self.groups: group.remove(self)
+        self.groups.clear()
+
+
+class EntityGroup:
+    """Упорядоченный набор сущностей вместо pygame.sprite.Group."""
+    __slots__ = ("entities",)
+
+    def __init__(self, *entities):
+        self.entities = {}
+        self.add(*entities)
+
+    def add(self, *entities):
+        for entity in entities:
+            if entity not in self.entities:
+                self.entities[entity] = None; entity.groups.append(self)
+
+    def remove(self, entity):
+        self.entities.pop(entity, None)
+
+    def __iter__(self):
+        # Копия: сущности удаляют себя из группы прямо во время обхода
+        return iter(list(self.entities))
+
+    def __len__(self):
+        return len(self.entities)
+
+    def sync(self):
+        """Снимает положения и углы всех тел группы после шага физики."""
+        for entity in self.entities:
+            body = entity.body
+            entity.x, entity.y = body.position
+            entity.angle = body.angle
+
+    def update(self, *args):
+        for entity in list(self.entities): entity.update(*args)
+
+    def draw(self, surface):
+        surface.blits([(entity.image, entity.rect) for entity in self.entities], doreturn=False)
+
+    def collide(self, entity):
+        """Сущности группы, пересекающиеся с entity по маскам (как collide_mask)."""
+        rect, hits = entity.rect, []
+        for other in list(self.entities):
+            if rect.colliderect(other.rect) and entity.mask.overlap(other.mask, (other.rect.x - rect.x, other.rect.y - rect.y)):
+                hits.append(other)
+        return hits
+
+
+class MainBird(Entity):
+    __slots__ = ("start_x", "start_y", "base_mass", "base_moment", "state", "tumble_timer", "type_index", "boost_available", "is_boosted", "split_available", "boomerang_available", "jump_progress", "jump_start_pos", "jump_image", "shot", "flight_time", "flight_frames")
 
-class MainBird(pygame.sprite.Sprite):
     def __init__(self, start_x, start_y, size, space):
-        super().__init__()
-        self.space = space
+        super().__init__(space, size)
         self.start_x = start_x
         self.start_y = start_y
-        self.size = int(size)
         
         # Создаем птицу как KINEMATIC (не подвержена гравитации пока в рогатке)
         self.base_mass = 5.0
         self.base_moment = pymunk.moment_for_circle(self.base_mass, 0, self.size // 2)
-        self.body = pymunk.Body(self.base_mass, self.base_moment, body_type=pymunk.Body.KINEMATIC)
-        self.body.position = (start_x, start_y)
-        
-        self.shape = pymunk.Circle(self.body, self.size // 2)
-        self.shape.elasticity = 0.5
-        self.shape.friction = 0.8
-        self.shape.filter = BIRD_FILTER
-        self.space.add(self.body, self.shape)
+        body = pymunk.Body(self.base_mass, self.base_moment, body_type=pymunk.Body.KINEMATIC)
+        shape = pymunk.Circle(body, self.size // 2)
+        shape.elasticity = 0.5
+        shape.friction = 0.8
+        shape.filter = BIRD_FILTER
+        self._add_body(body, shape, start_x, start_y)
 
-        self.original_image = None
-        self.image = pygame.Surface((self.size, self.size))
-        self.rect = self.image.get_rect(center=(start_x, start_y))
-        self.mask = pygame.mask.Mask((self.size, self.size))
+        self._set_image(pygame.Surface((self.size, self.size)))
+        self._mask = pygame.mask.Mask((self.size, self.size))
 
         self.state = "idle" 
         self.tumble_timer = 0
@@ -45,16 +167,10 @@ class MainBird(pygame.sprite.Sprite):
         self.jump_start_pos = (0, 0)
         self.jump_image = None
 
-    @property
-    def x(self): return self.body.position.x
-        
-    @property
-    def y(self): return self.body.position.y
-
-    def kill(self):
-        if hasattr(self, 'shape') and self.shape in self.space.shapes:
-            self.space.remove(self.body, self.shape)
-        super().kill()
+        # Параметры текущего выстрела для телеметрии (см. telemetry.py)
+        self.shot = None
+        self.flight_time = 0.0
+        self.flight_frames = 0
 
     def die(self):
         self.state = "dead"
@@ -65,8 +181,7 @@ class MainBird(pygame.sprite.Sprite):
             self.original_image = pygame.transform.scale(img, (self.size, self.size))
         else:
             self.original_image = img
-        self.image = self.original_image
-        self.mask = pygame.mask.from_surface(self.image)
+        self._image_angle = None
         self.type_index = type_index
         self.update_rect()
 
@@ -85,18 +200,10 @@ class MainBird(pygame.sprite.Sprite):
         self.update_rect()
 
     def update_rect(self):
-        if math.isnan(self.body.angle): self.body.angle = 0.0
-        if math.isnan(self.body.position.x) or math.isnan(self.body.position.y):
-            self.body.position = (self.start_x, self.start_y)
-
-        if self.original_image:
-            angle_deg = math.degrees(-self.body.angle) % 360
-            try:
-                self.image = pygame.transform.rotate(self.original_image, angle_deg)
-            except ValueError:
-                self.image = self.original_image
-            self.mask = pygame.mask.from_surface(self.image)
-            self.rect = self.image.get_rect(center=(int(self.x), int(self.y)))
+        # Кинематическое тело птица двигает сама, поэтому положение снимается заново
+        self.pull()
+        self._fix_nan((self.start_x, self.start_y))
+        if self.original_image: self._rotate()
 
     def start_drag(self):
         self.state = "dragging"
@@ -128,6 +235,9 @@ class MainBird(pygame.sprite.Sprite):
         
         self.body.velocity = (vx * 60, vy * 60)
 
+        self.shot = {"angle": angle, "power": distance / max_drag_dist, "bird_type": self.type_index, "ability_used": False}
+        self.flight_time, self.flight_frames = 0.0, 0
+
         if self.type_index == 2: self.boost_available = True
         elif self.type_index == 3: self.split_available = True
         elif self.type_index == 4: self.boomerang_available = True
@@ -136,6 +246,7 @@ class MainBird(pygame.sprite.Sprite):
         event = None
         
         if self.state in ["flying", "tumbling"]:
+            self.flight_time += dt; self.flight_frames += 1
             if self.type_index == 4 and self.state == "flying":
                 self.body.angular_velocity = -15.0
 
@@ -175,139 +286,87 @@ class MainBird(pygame.sprite.Sprite):
         return event
 
 
-class Target(pygame.sprite.Sprite):
+class Target(Entity):
+    __slots__ = ()
+
     def __init__(self, x, y, vx, vy, size, space, image):
-        super().__init__()
-        self.space = space
-        self.size = int(size)
+        super().__init__(space, size)
         if image.get_size() != (self.size, self.size):
             self.original_image = pygame.transform.scale(image, (self.size, self.size))
         else:
             self.original_image = image
-        self.image = self.original_image
-        self.mask = pygame.mask.from_surface(self.image)
-        self.rect = self.image.get_rect(center=(x, y))
         
         mass = 1.0
         radius = self.size // 2
         moment = pymunk.moment_for_circle(mass, 0, radius)
-        self.body = pymunk.Body(mass, moment)
-        self.body.position = (x, y)
-        self.body.velocity = (vx * 60, vy * 60)
-        self.shape = pymunk.Circle(self.body, radius)
-        self.shape.elasticity = 0.4
-        self.shape.friction = 0.6
-        self.shape.filter = TARGET_FILTER
-        self.space.add(self.body, self.shape)
-
-    @property
-    def x(self): return self.body.position.x
-    @property
-    def y(self): return self.body.position.y
-
-    def kill(self):
-        if hasattr(self, 'shape') and self.shape in self.space.shapes:
-            self.space.remove(self.body, self.shape)
-        super().kill()
+        body = pymunk.Body(mass, moment)
+        body.velocity = (vx * 60, vy * 60)
+        shape = pymunk.Circle(body, radius)
+        shape.elasticity = 0.4
+        shape.friction = 0.6
+        shape.filter = TARGET_FILTER
+        self._add_body(body, shape, x, y)
+        self._set_image(self.original_image, 0.0)
 
     def update(self, dt, screen_width, screen_height):
-        if math.isnan(self.body.angle): self.body.angle = 0.0
-        if math.isnan(self.x) or math.isnan(self.y): self.body.position = (100, 100)
-            
-        angle_deg = math.degrees(-self.body.angle) % 360
-        try: self.image = pygame.transform.rotate(self.original_image, angle_deg)
-        except ValueError: self.image = self.original_image
-        self.mask = pygame.mask.from_surface(self.image)
-        self.rect = self.image.get_rect(center=(int(self.x), int(self.y)))
+        self._fix_nan((100, 100))
+        self._rotate()
+
 
+class Obstacle(Entity):
+    __slots__ = ()
 
-class Obstacle(pygame.sprite.Sprite):
     def __init__(self, x, y, vx, vy, size, space, image):
-        super().__init__()
-        self.space = space
-        self.size = int(size)
+        super().__init__(space, size)
         if image.get_size() != (self.size, self.size):
             self.original_image = pygame.transform.scale(image, (self.size, self.size))
         else:
             self.original_image = image
-        self.image = self.original_image
-        self.mask = pygame.mask.from_surface(self.image)
-        self.rect = self.image.get_rect(center=(x, y))
         
         mass = 3.0
         moment = pymunk.moment_for_box(mass, (self.size, self.size))
-        self.body = pymunk.Body(mass, moment)
-        self.body.position = (x, y)
-        self.body.velocity = (vx * 60, vy * 60)
-        self.shape = pymunk.Poly.create_box(self.body, (self.size, self.size))
-        self.shape.elasticity = 0.2
-        self.shape.friction = 0.8
-        self.shape.filter = TARGET_FILTER
-        self.space.add(self.body, self.shape)
-
-    @property
-    def x(self): return self.body.position.x
-    @property
-    def y(self): return self.body.position.y
-
-    def kill(self):
-        if hasattr(self, 'shape') and self.shape in self.space.shapes:
-            self.space.remove(self.body, self.shape)
-        super().kill()
+        body = pymunk.Body(mass, moment)
+        body.velocity = (vx * 60, vy * 60)
+        shape = pymunk.Poly.create_box(body, (self.size, self.size))
+        shape.elasticity = 0.2
+        shape.friction = 0.8
+        shape.filter = TARGET_FILTER
+        self._add_body(body, shape, x, y)
+        self._set_image(self.original_image, 0.0)
 
     def update(self, dt, screen_width, screen_height):
-        if math.isnan(self.body.angle): self.body.angle = 0.0
-        if math.isnan(self.x) or math.isnan(self.y): self.body.position = (100, 100)
-            
-        angle_deg = math.degrees(-self.body.angle) % 360
-        try: self.image = pygame.transform.rotate(self.original_image, angle_deg)
-        except ValueError: self.image = self.original_image
-        self.mask = pygame.mask.from_surface(self.image)
-        self.rect = self.image.get_rect(center=(int(self.x), int(self.y)))
+        self._fix_nan((100, 100))
+        self._rotate()
 
 
-class SmallBird(pygame.sprite.Sprite):
+class SmallBird(Entity):
+    __slots__ = ("state", "tumble_timer")
+
     def __init__(self, x, y, vx, vy, size, space, image):
-        super().__init__()
-        self.space = space
-        self.size = int(size)
+        super().__init__(space, size)
         if image.get_size() != (self.size, self.size):
             self.original_image = pygame.transform.scale(image, (self.size, self.size))
         else:
             self.original_image = image
-        self.image = self.original_image
-        self.mask = pygame.mask.from_surface(self.image)
-        self.rect = self.image.get_rect(center=(x, y))
         
         mass = 0.5
         radius = self.size // 2
         moment = pymunk.moment_for_circle(mass, 0, radius)
-        self.body = pymunk.Body(mass, moment)
-        self.body.position = (x, y)
-        self.body.velocity = (vx, vy)
-        self.shape = pymunk.Circle(self.body, radius)
-        self.shape.elasticity = 0.5
-        self.shape.friction = 0.8
-        self.shape.filter = DEBRIS_FILTER
-        self.space.add(self.body, self.shape)
+        body = pymunk.Body(mass, moment)
+        body.velocity = (vx, vy)
+        shape = pymunk.Circle(body, radius)
+        shape.elasticity = 0.5
+        shape.friction = 0.8
+        shape.filter = DEBRIS_FILTER
+        self._add_body(body, shape, x, y)
+        self._set_image(self.original_image, 0.0)
         
         self.state = "flying"
         self.tumble_timer = 0
 
-    @property
-    def x(self): return self.body.position.x
-    @property
-    def y(self): return self.body.position.y
-
-    def kill(self):
-        if hasattr(self, 'shape') and self.shape in self.space.shapes:
-            self.space.remove(self.body, self.shape)
-        super().kill()
-
     def update(self, dt, gravity, ground_level):
         event = None
-        if math.isnan(self.body.angle): self.body.angle = 0.0
-        if math.isnan(self.x) or math.isnan(self.y): self.body.position = (100, 100)
+        self._fix_nan((100, 100))
 
         if self.state == "flying":
             if self.y >= ground_level - self.size // 2:
@@ -320,53 +379,37 @@ class SmallBird(pygame.sprite.Sprite):
                 self.state = "dead"
                 self.kill()
 
-        angle_deg = math.degrees(-self.body.angle) % 360
-        try: self.image = pygame.transform.rotate(self.original_image, angle_deg)
-        except ValueError: self.image = self.original_image
-        self.mask = pygame.mask.from_surface(self.image)
-        self.rect = self.image.get_rect(center=(int(self.x), int(self.y)))
+        self._rotate()
         return event
 
 
-class DefeatedPig(pygame.sprite.Sprite):
+class DefeatedPig(Entity):
+    __slots__ = ("on_ground", "timer")
+
     def __init__(self, x, y, vy, size, space, image):
-        super().__init__()
-        self.space = space
-        self.size = int(size)
-        if image.get_size() != (self.size, self.size):
-            self.image = pygame.transform.scale(image, (self.size, self.size))
-        else:
-            self.image = image
-        self.rect = self.image.get_rect(center=(x, y))
+        super().__init__(space, size)
         
         mass = 1.0
         radius = self.size // 2
         moment = pymunk.moment_for_circle(mass, 0, radius)
-        self.body = pymunk.Body(mass, moment)
-        self.body.position = (x, y)
-        self.body.velocity = (0, vy * 60)
-        self.shape = pymunk.Circle(self.body, radius)
-        self.shape.elasticity = 0.3
-        self.shape.friction = 0.9
-        self.shape.filter = DEBRIS_FILTER
-        self.space.add(self.body, self.shape)
+        body = pymunk.Body(mass, moment)
+        body.velocity = (0, vy * 60)
+        shape = pymunk.Circle(body, radius)
+        shape.elasticity = 0.3
+        shape.friction = 0.9
+        shape.filter = DEBRIS_FILTER
+        self._add_body(body, shape, x, y)
+        if image.get_size() != (self.size, self.size):
+            self._set_image(pygame.transform.scale(image, (self.size, self.size)))
+        else:
+            self._set_image(image)
         
         self.on_ground = False
         self.timer = -1
 
-    @property
-    def x(self): return self.body.position.x
-    @property
-    def y(self): return self.body.position.y
-
-    def kill(self):
-        if hasattr(self, 'shape') and self.shape in self.space.shapes:
-            self.space.remove(self.body, self.shape)
-        super().kill()
-
     def update(self, dt, gravity, ground_level):
         event = None
-        if math.isnan(self.x) or math.isnan(self.y): self.body.position = (100, 100)
+        if math.isnan(self.x) or math.isnan(self.y): self.body.position = (100, 100); self.x, self.y = 100, 100
 
         if not self.on_ground:
             if self.y >= ground_level - self.size // 2:
@@ -380,4 +423,4 @@ class DefeatedPig(pygame.sprite.Sprite):
                 self.kill()
         
         self.rect.center = (int(self.x), int(self.y))
-        return event
\ No newline at end of file
+        return event
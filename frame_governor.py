@@ -0,0 +1,57 @@
+# frame_governor.py
+
+"""Темп главного цикла: полная частота, пока что-то движется, и сон в простое.
+
+Состояния сообщают через State.is_animating(), идет ли у них анимация.
+Пока идет анимация или недавно был ввод, цикл работает с заданным
+ограничением частоты кадров. В простое поток спит в pygame.event.wait с
+таймаутом и просыпается сразу по любому событию, поэтому возврат к полной
+частоте мгновенный, а кадр раз в 1 / IDLE_FPS секунды обновляет время на
+экране (курсор ввода, всплывающие надписи) и очередь музыки.
+"""
+
+import time
+
+import pygame
+
+FRAME_CAPS = (60, 120, 0)  # 0 — без ограничения, для замеров производительности
+DEFAULT_FRAME_CAP = 60
+IDLE_FPS = 10
+# Сколько секунд после ввода или анимации держится полная частота
+IDLE_DELAY = 0.5
+
+
+class FrameGovernor:
+    def __init__(self, clock, idle_fps=IDLE_FPS, idle_delay=IDLE_DELAY):
+        self.clock = clock
+        self.idle_fps = idle_fps
+        self.idle_delay = idle_delay
+        self.last_active = time.monotonic()
+        self.idle = False
+        self.woken = None  # событие, разбудившее цикл в простое
+
+    def tick(self, active, frame_cap=DEFAULT_FRAME_CAP):
+        """Ждет начала следующего кадра; возвращает прошедшее время в секундах."""
+        now = time.monotonic()
+        if active:
+            self.last_active = now
+        if now - self.last_active < self.idle_delay:
+            self.idle = False
+            return self.clock.tick(frame_cap) / 1000.0
+
+        self.idle = True
+        event = pygame.event.wait(int(1000 / self.idle_fps))
+        if event.type != pygame.NOEVENT:
+            # Событие отдает events() первым: post поставил бы его в конец
+            # очереди, за события, пришедшие одновременно с ним
+            self.woken = event
+            self.last_active = time.monotonic()
+        return self.clock.tick() / 1000.0
+
+    def events(self):
+        """События кадра по порядку, включая разбудившее цикл."""
+        events = pygame.event.get()
+        if self.woken is not None:
+            events.insert(0, self.woken)
+            self.woken = None
+        return events
@@ -1,63 +1,166 @@
 import pygame
-from settings import load_images, load_fonts, EXPLOSION_RADIUS
+from settings import load_images_async, load_fonts, EXPLOSION_RADIUS
+from achievements import save_user_settings, save_last_profile_name
+from persistence import submit_write
+from text_layout import clear_layout_cache
 
 BASE_WIDTH = 800.0
-CAMPAIGN_GRID_SIZE = 7
+# Уровни кампании: доска растет от 7x7 на первом уровне до 32x32 на последнем
+CAMPAIGN_LEVEL_COUNT = 20
+CAMPAIGN_MIN_GRID_SIZE = 7
+CAMPAIGN_MAX_GRID_SIZE = 32
+# Логическое разрешение режима фиксированного рендера: кадр рисуется в
+# поверхность этого размера и один раз за кадр масштабируется в окно
+LOGICAL_RESOLUTION = (800, 600)
+
+
+def compute_screen_metrics(width, height):
+    """Масштабы и размеры игрового поля для заданного разрешения."""
+    ui_scale_factor = width / BASE_WIDTH
+    game_scale_factor = (ui_scale_factor + 1.0) / 2.0
+    return {
+        "scale_factor": ui_scale_factor,
+        "game_scale_factor": game_scale_factor,
+        "object_size": int(50 * game_scale_factor),
+        "small_object_size": int(25 * game_scale_factor),
+        "gravity": 0.5 * game_scale_factor,
+        "WIDTH": width,
+        "HEIGHT": height,
+        "GROUND_LEVEL": height - int(10 * ui_scale_factor),
+        "sling_x": int(width * 0.23),
+        "sling_y": height - int(height * 0.33),
+        "EXPLOSION_RADIUS": int(EXPLOSION_RADIUS * game_scale_factor),
+    }
+
+
+def campaign_level_config(level):
+    """Размер доски и цель по очкам для уровня кампании (с 1)."""
+    step = (level - 1) / (CAMPAIGN_LEVEL_COUNT - 1)
+    size = round(
+        CAMPAIGN_MIN_GRID_SIZE
+        + (CAMPAIGN_MAX_GRID_SIZE - CAMPAIGN_MIN_GRID_SIZE) * step
+    )
+    # Цель растет вместе с площадью доски: 10000 очков на первом уровне
+    target_score = int(round(10000 * size * size / CAMPAIGN_MIN_GRID_SIZE**2, -2))
+    return size, target_score
+
+
+def update_campaign_layout(game_state):
+    c_size = min(game_state["WIDTH"] * 0.6, game_state["HEIGHT"] * 0.8)
+    game_state["campaign_grid_rect"] = pygame.Rect(
+        (game_state["WIDTH"] - c_size) / 2,
+        (game_state["HEIGHT"] - c_size) / 2,
+        c_size,
+        c_size,
+    )
+    game_state["campaign_cell_size"] = c_size / game_state["campaign_grid_size"]
+
+
+def open_window(screen_mode):
+    if screen_mode == "fullscreen":
+        info = pygame.display.Info()
+        return pygame.display.set_mode(
+            (info.current_w, info.current_h), pygame.FULLSCREEN
+        )
+    return pygame.display.set_mode(screen_mode)
+
+
+def update_viewport(game_state):
+    """Прямоугольник окна, в который вписывается логический кадр с полями."""
+    window, screen = game_state["window"], game_state["screen"]
+    ww, wh = window.get_size()
+    sw, sh = screen.get_size()
+    scale = min(ww / sw, wh / sh)
+    viewport = pygame.Rect(0, 0, int(sw * scale), int(sh * scale))
+    viewport.center = (ww // 2, wh // 2)
+    game_state["viewport"] = viewport
+
+
+def window_to_logical(game_state, pos):
+    if game_state["window"] is game_state["screen"]:
+        return pos
+    vp, (sw, sh) = game_state["viewport"], game_state["screen"].get_size()
+    x = (pos[0] - vp.x) * sw // max(1, vp.width)
+    y = (pos[1] - vp.y) * sh // max(1, vp.height)
+    return min(max(0, x), sw - 1), min(max(0, y), sh - 1)
+
+
+def present_frame(game_state):
+    window, screen = game_state["window"], game_state["screen"]
+    if window is not screen:
+        vp = game_state["viewport"]
+        if vp.size == screen.get_size():
+            window.blit(screen, vp)
+        else:
+            window.fill((0, 0, 0))
+            pygame.transform.smoothscale(screen, vp.size, window.subsurface(vp))
+    pygame.display.flip()
 
 
 def apply_screen_settings(game_state):
-    if game_state["screen_mode"] == game_state["pending_screen_mode"]:
+    fixed = game_state["pending_fixed_resolution"]
+    if (
+        game_state["screen_mode"] == game_state["pending_screen_mode"]
+        and game_state["fixed_resolution"] == fixed
+    ):
         return
     game_state["screen_mode"] = game_state["pending_screen_mode"]
+    window = game_state["window"] = open_window(game_state["screen_mode"])
 
-    if game_state["screen_mode"] == "fullscreen":
-        info = pygame.display.Info()
-        new_width, new_height = info.current_w, info.current_h
-        game_state["screen"] = pygame.display.set_mode(
-            (new_width, new_height), pygame.FULLSCREEN
-        )
+    if fixed:
+        if game_state["fixed_resolution"]:
+            # Логический кадр и ресурсы не зависят от окна: смена мгновенная,
+            # игра продолжается без перезагрузки и сброса
+            update_viewport(game_state)
+            return
+        new_width, new_height = LOGICAL_RESOLUTION
+        game_state["screen"] = pygame.Surface(LOGICAL_RESOLUTION).convert()
     else:
-        new_width, new_height = game_state["screen_mode"]
-        game_state["screen"] = pygame.display.set_mode((new_width, new_height))
+        new_width, new_height = window.get_size()
+        game_state["screen"] = window
+    game_state["fixed_resolution"] = fixed
+    update_viewport(game_state)
+    if (new_width, new_height) == (game_state["WIDTH"], game_state["HEIGHT"]):
+        return
 
-    ui_scale_factor = new_width / BASE_WIDTH
-    game_scale_factor = (ui_scale_factor + 1.0) / 2.0
-    game_state.update(
-        {
-            "scale_factor": ui_scale_factor,
-            "game_scale_factor": game_scale_factor,
-            "object_size": int(50 * game_scale_factor),
-            "small_object_size": int(25 * game_scale_factor),
-            "gravity": 0.5 * game_scale_factor,
-            "WIDTH": new_width,
-            "HEIGHT": new_height,
-            "GROUND_LEVEL": new_height - int(10 * ui_scale_factor),
-            "sling_x": int(new_width * 0.23),
-            "sling_y": new_height - int(new_height * 0.33),
-            "EXPLOSION_RADIUS": int(EXPLOSION_RADIUS * game_scale_factor),
-        }
-    )
+    game_state.update(compute_screen_metrics(new_width, new_height))
+    ui_scale_factor = game_state["scale_factor"]
+    game_scale_factor = game_state["game_scale_factor"]
 
-    c_size = min(new_width * 0.6, new_height * 0.8)
-    game_state["campaign_grid_rect"] = pygame.Rect(
-        (new_width - c_size) / 2, (new_height - c_size) / 2, c_size, c_size
+    update_campaign_layout(game_state)
+
+    game_state["fonts"] = load_fonts(ui_scale_factor)
+    clear_layout_cache()
+    # Загруженные ресурсы пересчитываются из исходников в памяти в фоне; до
+    # готовности рисуются прежние, затем они подменяются в finish_screen_switch
+    game_state["pending_images"] = load_images_async(
+        new_width,
+        new_height,
+        ui_scale_factor,
+        game_scale_factor,
+        names=game_state["assets"].loaded_names(),
     )
-    game_state["campaign_cell_size"] = c_size / CAMPAIGN_GRID_SIZE
 
-    game_state["images"] = load_images(
-        new_width, new_height, ui_scale_factor, game_scale_factor
+
+def finish_screen_switch(game_state):
+    future = game_state.get("pending_images")
+    if future is None or not future.done():
+        return
+    game_state["pending_images"] = None
+    try:
+        images = future.result()
+    except Exception as e:
+        print(f"Ошибка загрузки изображений: {e}")
+        return
+    game_state["assets"].replace(
+        images,
+        (
+            game_state["WIDTH"],
+            game_state["HEIGHT"],
+            game_state["scale_factor"],
+            game_state["game_scale_factor"],
+        ),
     )
-    game_state["fonts"] = load_fonts(ui_scale_factor)
-    bird_names_ru = [
-        "Красная Птица",
-        "Взрывная Птица",
-        "Ускоряющаяся Птица",
-        "Птица-Дробилка",
-        "Птица-Бумеранг",
-    ]
-    game_state["bird_image_to_name"] = {
-        img: name for img, name in zip(game_state["images"]["bird_imgs"], bird_names_ru)
-    }
     reset_game(game_state)
 
 
@@ -65,19 +168,43 @@ def update_all_volumes(game_state):
     music_vol = game_state["music_volume"] if game_state["sound_on"] else 0.0
     sfx_vol = game_state["sfx_volume"] if game_state["sound_on"] else 0.0
     pygame.mixer.music.set_volume(music_vol)
-    for key, sound in game_state["sounds"].items():
-        if key != "music_playlist":
-            sound.set_volume(sfx_vol)
-
-
-def play_music_track(game_state, track_index):
-    if game_state["sounds"].get("music_playlist"):
-        try:
-            pygame.mixer.music.load(game_state["sounds"]["music_playlist"][track_index])
-            pygame.mixer.music.play()
-            game_state["current_music_track_index"] = track_index
-        except:
-            pass
+    # Громкость эффектов применяется по категориям в микшере эффектов
+    sfx = game_state.get("sfx")
+    if sfx is not None:
+        sfx.set_volume(sfx_vol)
+
+
+def build_user_settings(game_state):
+    return {
+        "audio": {
+            "music_volume": game_state["music_volume"],
+            "sfx_volume": game_state["sfx_volume"],
+        },
+        "display": {
+            "brightness": game_state["brightness_slider_pos"],
+            "fixed_resolution": game_state["pending_fixed_resolution"],
+            "frame_cap": game_state["frame_cap"],
+        },
+        "language": game_state["language"],
+    }
+
+
+def persist_user_settings(game_state):
+    submit_write(
+        game_state, "user_settings", save_user_settings, build_user_settings(game_state)
+    )
+
+
+def persist_last_profile(game_state):
+    submit_write(
+        game_state, "last_profile", save_last_profile_name, game_state["current_profile"]
+    )
+
+
+def play_music_track(game_state, track_index, step=1):
+    player = game_state.get("music")
+    if player is not None and game_state["sounds"].get("music_playlist"):
+        game_state["current_music_track_index"] = player.play(track_index, step)
 
 
 def reset_game(game_state):
@@ -6,9 +6,17 @@ from game_objects import (
     play_music_track,
     reset_game,
     apply_screen_settings,
+    persist_user_settings,
+    persist_last_profile,
+    CAMPAIGN_LEVEL_COUNT,
 )
-from achievements import save_all_profiles_data, create_default_achievements
-from localization import LANGUAGES
+from achievements import create_default_achievements, save_profile, delete_profile
+from localization import load_catalog
+from persistence import submit_write
+from text_layout import render_paragraph, clear_layout_cache
+from widgets import VirtualList
+from frame_governor import FRAME_CAPS
+from assets import MENU_IMAGES, SLINGSHOT_IMAGES, MATCH3_IMAGES
 
 PEDIA_IMAGES = {
     "Красная Птица": ("bird_imgs", 0),
@@ -26,6 +34,7 @@ PEDIA_IMAGES = {
     "Target Pig": "target_img",
     "Brick": "brick_img",
 }
+PEDIA_DETAIL_IMAGES = MENU_IMAGES + ("target_img", "brick_img")
 
 
 class StateManager:
@@ -38,13 +47,33 @@ class StateManager:
         self.states[name] = state
 
     def change_state(self, name, game_state):
+        new_state = self.states[name]
+        assets = game_state.get("assets")
+        # Сначала захват, потом освобождение: общие ресурсы не перезагружаются
+        if assets:
+            assets.acquire(new_state.assets)
         if self.current_state:
             self.current_state.exit(game_state)
-        self.current_state = self.states[name]
+            if assets:
+                assets.release(self.current_state.assets)
+        self.current_state = new_state
         self.current_state.enter(game_state)
+        if assets:
+            assets.preload(self.current_state.preload_hints(game_state))
+
+    def asset_report(self, game_state):
+        """Загруженные ресурсы и объем ресурсов каждого состояния в байтах."""
+        return game_state["assets"].report(self.states)
 
 
 class State:
+    # Изображения, которые держатся, пока состояние активно (см. assets.py)
+    assets = ()
+
+    def preload_hints(self, game_state):
+        """Ресурсы вероятного следующего состояния для фоновой загрузки."""
+        return ()
+
     def enter(self, game_state):
         pass
 
@@ -60,11 +89,21 @@ class State:
     def draw(self, screen, mx, my, game_state):
         pass
 
+    def is_animating(self, game_state):
+        """Нужна ли полная частота кадров без ввода (см. frame_governor)."""
+        return False
+
 
 class MainMenuState(State):
+    assets = MENU_IMAGES
+
     def __init__(self):
         self.buttons = {}
 
+    def preload_hints(self, game_state):
+        # В прохождение ведет выбор уровня с тем же фоном меню
+        return () if game_state["game_mode"] == "campaign" else SLINGSHOT_IMAGES
+
     def handle_event(self, event, mx, my, game_state):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             sm = game_state["state_manager"]
@@ -224,10 +263,27 @@ class MainMenuState(State):
 
 
 class ProfileMenuState(State):
+    assets = MENU_IMAGES
+
     def __init__(self):
-        self.buttons, self.del_buttons, self.conf_buttons = {}, {}, {}
+        self.buttons, self.conf_buttons = {}, {}
+        self.profile_list = VirtualList(row_height=40)
+
+    def enter(self, game_state):
+        self.profile_list.set_items(game_state["all_profiles_data"])
+        self.profile_list.scroll_to(game_state["current_profile"])
+
+    def delete_button_rect(self, name, row_rect, font):
+        """Кнопка удаления справа от имени; считается по метрикам шрифта."""
+        name_w, name_h = font.size(name)
+        x_w, x_h = font.size("X")
+        return pygame.Rect(
+            row_rect.x + name_w + 20, row_rect.y + (name_h - x_h) // 2, x_w, x_h
+        )
 
     def handle_event(self, event, mx, my, game_state):
+        if self.profile_list.handle_event(event, mx, my):
+            return
         if event.type == pygame.KEYDOWN:
             if game_state["profile_input_active"]:
                 if event.key == pygame.K_BACKSPACE:
@@ -252,10 +308,17 @@ class ProfileMenuState(State):
                     ptd = game_state["profile_to_delete"]
                     if ptd in game_state["all_profiles_data"]:
                         del game_state["all_profiles_data"][ptd]
-                        save_all_profiles_data(game_state["all_profiles_data"])
+                        game_state["leaderboard"].remove_profile(ptd)
+                        submit_write(
+                            game_state, f"profile:{ptd}", delete_profile, ptd
+                        )
                         if game_state["current_profile"] == ptd:
                             game_state["current_profile"] = "Guest"
+                            persist_last_profile(game_state)
                             reset_game(game_state)
+                        self.profile_list.set_items(
+                            game_state["all_profiles_data"]
+                        )
                     game_state["show_profile_delete_confirm"] = False
                 elif self.conf_buttons.get("no_btn") and self.conf_buttons[
                     "no_btn"
@@ -276,10 +339,22 @@ class ProfileMenuState(State):
                     game_state["all_profiles_data"][
                         new_name
                     ] = create_default_achievements()
-                    save_all_profiles_data(game_state["all_profiles_data"])
+                    game_state["leaderboard"].set_profile(
+                        new_name, game_state["all_profiles_data"][new_name]
+                    )
+                    submit_write(
+                        game_state,
+                        f"profile:{new_name}",
+                        save_profile,
+                        new_name,
+                        dict(game_state["all_profiles_data"][new_name]),
+                    )
                     game_state["current_profile"] = new_name
+                    persist_last_profile(game_state)
                     reset_game(game_state)
                     game_state["profile_input_text"] = ""
+                    self.profile_list.set_items(game_state["all_profiles_data"])
+                    self.profile_list.scroll_to(new_name)
             elif self.buttons.get("back_btn") and self.buttons["back_btn"].collidepoint(
                 mx, my
             ):
@@ -288,50 +363,79 @@ class ProfileMenuState(State):
                 else:
                     game_state["state_manager"].change_state("main_menu", game_state)
             else:
-                for name, rect in self.del_buttons.items():
-                    if rect.collidepoint(mx, my):
-                        game_state["show_profile_delete_confirm"] = True
-                        game_state["profile_to_delete"] = name
-                        return
-                for name, rect in self.buttons.get("profiles", {}).items():
-                    if rect.collidepoint(mx, my):
-                        game_state["current_profile"] = name
-                        reset_game(game_state)
-                        if game_state["initial_profile_selection"]:
-                            game_state["initial_profile_selection"] = False
-                            game_state["state_manager"].change_state(
-                                "main_menu", game_state
-                            )
-                        break
+                index = self.profile_list.index_at(mx, my)
+                if index is None:
+                    return
+                name = self.profile_list.keys[index]
+                row_rect = self.profile_list.row_rect(index)
+                font = game_state["fonts"]["small_font"]
+                if name != "Guest" and self.delete_button_rect(
+                    name, row_rect, font
+                ).collidepoint(mx, my):
+                    game_state["show_profile_delete_confirm"] = True
+                    game_state["profile_to_delete"] = name
+                    return
+                if mx < row_rect.x + font.size(name)[0]:
+                    game_state["current_profile"] = name
+                    persist_last_profile(game_state)
+                    reset_game(game_state)
+                    if game_state["initial_profile_selection"]:
+                        game_state["initial_profile_selection"] = False
+                        game_state["state_manager"].change_state(
+                            "main_menu", game_state
+                        )
 
     def draw(self, screen, mx, my, game_state):
         bg = game_state["images"]["menu_background"]
         screen.blit(bg, bg.get_rect(center=screen.get_rect().center))
         fonts, texts = game_state["fonts"], game_state["texts"]
-        self.buttons = {"profiles": {}}
-        self.del_buttons = {}
-        y_pos = 280
-        for name in game_state["all_profiles_data"].keys():
-            color = (0, 150, 0) if name == game_state["current_profile"] else (0, 0, 0)
-            text_surf, text_rect = draw_text(name, fonts["small_font"], color)
-            text_rect.topleft = (150, y_pos)
-            if text_rect.collidepoint(mx, my) and name != game_state["current_profile"]:
-                text_surf, _ = draw_text(name, fonts["small_font"], (255, 200, 0))
-            screen.blit(text_surf, text_rect)
-            self.buttons["profiles"][name] = text_rect
-            if name != "Guest":
-                del_surf, del_rect = draw_text("X", fonts["small_font"], (180, 0, 0))
-                del_rect.left, del_rect.centery = (
-                    text_rect.right + 20,
-                    text_rect.centery,
-                )
-                if del_rect.collidepoint(mx, my):
-                    del_surf, _ = draw_text("X", fonts["small_font"], (255, 0, 0))
-                screen.blit(del_surf, del_rect)
-                self.del_buttons[name] = del_rect
-            y_pos += 40
+        self.buttons = {}
+        font, plist = fonts["small_font"], self.profile_list
+        plist.set_style(font)
+        plist.set_rect(150, 280, 400, game_state["HEIGHT"] - 280 - 150)
+
+        def variant_for(name, row_rect):
+            current = name == game_state["current_profile"]
+            hover_name = (
+                row_rect.collidepoint(mx, my) and mx < row_rect.x + font.size(name)[0]
+            )
+            hover_del = name != "Guest" and self.delete_button_rect(
+                name, row_rect, font
+            ).collidepoint(mx, my)
+            return current, hover_name and not current, hover_del
+
+        def render(name, variant):
+            current, hover_name, hover_del = variant
+            color = (0, 0, 0)
+            if current:
+                color = (0, 150, 0)
+            elif hover_name:
+                color = (255, 200, 0)
+            text_surf = draw_text(name, font, color)[0]
+            if name == "Guest":
+                return text_surf
+            del_color = (255, 0, 0) if hover_del else (180, 0, 0)
+            del_surf = draw_text("X", font, del_color)[0]
+            surf = pygame.Surface(
+                (
+                    text_surf.get_width() + 20 + del_surf.get_width(),
+                    max(text_surf.get_height(), del_surf.get_height()),
+                ),
+                pygame.SRCALPHA,
+            )
+            surf.blit(text_surf, (0, 0))
+            surf.blit(
+                del_surf,
+                (
+                    text_surf.get_width() + 20,
+                    (text_surf.get_height() - del_surf.get_height()) // 2,
+                ),
+            )
+            return surf
+
+        plist.draw(screen, variant_for, render)
 
-        ib_rect = pygame.Rect(150, y_pos + 30, 250, 40)
+        ib_rect = pygame.Rect(150, plist.rect.bottom + 30, 250, 40)
         pygame.draw.rect(screen, (255, 255, 255), ib_rect)
         pygame.draw.rect(
             screen,
@@ -410,6 +514,8 @@ class ProfileMenuState(State):
 
 
 class SettingsState(State):
+    assets = MENU_IMAGES
+
     def __init__(self):
         self.buttons = {}
 
@@ -476,6 +582,8 @@ class SettingsState(State):
 
 
 class SoundSettingsState(State):
+    assets = MENU_IMAGES
+
     def __init__(self):
         self.buttons = {}
 
@@ -499,7 +607,7 @@ class SoundSettingsState(State):
                     - 1
                     + len(game_state["sounds"]["music_playlist"])
                 ) % len(game_state["sounds"]["music_playlist"])
-                play_music_track(game_state, n_idx)
+                play_music_track(game_state, n_idx, step=-1)
             elif self.buttons.get("next_track_btn") and self.buttons[
                 "next_track_btn"
             ].collidepoint(mx, my):
@@ -527,6 +635,7 @@ class SoundSettingsState(State):
                 ),
             )
             update_all_volumes(game_state)
+            persist_user_settings(game_state)
         if game_state.get("is_dragging_sfx_volume"):
             game_state["sfx_volume"] = max(
                 0.0,
@@ -537,6 +646,7 @@ class SoundSettingsState(State):
                 ),
             )
             update_all_volumes(game_state)
+            persist_user_settings(game_state)
 
     def draw(self, screen, mx, my, game_state):
         bg = game_state["images"]["menu_background"]
@@ -592,6 +702,15 @@ class SoundSettingsState(State):
         )
         t_rect.center = (game_state["WIDTH"] // 2, ty)
         screen.blit(t_surf, t_rect)
+        switch_ms = game_state["music"].last_switch_ms()
+        if switch_ms is not None:
+            sw_surf, sw_rect = draw_text(
+                get_text(texts, "track_switch_time").format(ms=switch_ms),
+                fonts["info_font"],
+                (60, 60, 60),
+            )
+            sw_rect.midtop = (t_rect.centerx, t_rect.bottom + 5)
+            screen.blit(sw_surf, sw_rect)
 
         p_surf, p_btn = draw_text(
             get_text(texts, "prev_track"), fonts["small_font"], (0, 0, 0)
@@ -628,6 +747,8 @@ class SoundSettingsState(State):
 
 
 class ScreenSettingsState(State):
+    assets = MENU_IMAGES
+
     def __init__(self):
         self.buttons = {}
 
@@ -648,6 +769,22 @@ class ScreenSettingsState(State):
                 "res_fs_btn"
             ].collidepoint(mx, my):
                 game_state["pending_screen_mode"] = "fullscreen"
+            elif self.buttons.get("fixed_render_btn") and self.buttons[
+                "fixed_render_btn"
+            ].collidepoint(mx, my):
+                game_state["pending_fixed_resolution"] = not game_state[
+                    "pending_fixed_resolution"
+                ]
+                persist_user_settings(game_state)
+            elif self.buttons.get("frame_cap_btn") and self.buttons[
+                "frame_cap_btn"
+            ].collidepoint(mx, my):
+                caps = list(FRAME_CAPS)
+                current = game_state["frame_cap"]
+                game_state["frame_cap"] = caps[
+                    (caps.index(current) + 1) % len(caps) if current in caps else 0
+                ]
+                persist_user_settings(game_state)
             elif self.buttons.get("back_btn") and self.buttons["back_btn"].collidepoint(
                 mx, my
             ):
@@ -666,6 +803,7 @@ class ScreenSettingsState(State):
                     / self.buttons["brightness_slider"].width,
                 ),
             )
+            persist_user_settings(game_state)
 
     def draw(self, screen, mx, my, game_state):
         bg = game_state["images"]["menu_background"]
@@ -713,6 +851,28 @@ class ScreenSettingsState(State):
         screen.blit(fs_surf, fs_btn)
         self.buttons["res_fs_btn"] = fs_btn
 
+        is_fixed = game_state["pending_fixed_resolution"]
+        fr_txt = f"[{'x' if is_fixed else ' '}] {get_text(texts, 'fixed_render')}"
+        fr_surf, fr_btn = draw_text(
+            fr_txt, fonts["small_font"], (0, 150, 0) if is_fixed else (0, 0, 0)
+        )
+        fr_btn.topleft = (sx, r8_btn.bottom + 20)
+        if fr_btn.collidepoint(mx, my):
+            fr_surf, _ = draw_text(fr_txt, fonts["small_font"], (255, 200, 0))
+        screen.blit(fr_surf, fr_btn)
+        self.buttons["fixed_render_btn"] = fr_btn
+
+        cap = game_state["frame_cap"]
+        fc_txt = f"{get_text(texts, 'frame_cap')}: " + (
+            str(cap) if cap else get_text(texts, "frame_cap_unlimited")
+        )
+        fc_surf, fc_btn = draw_text(fc_txt, fonts["small_font"], (0, 0, 0))
+        fc_btn.topleft = (sx, fr_btn.bottom + 20)
+        if fc_btn.collidepoint(mx, my):
+            fc_surf, _ = draw_text(fc_txt, fonts["small_font"], (255, 200, 0))
+        screen.blit(fc_surf, fc_btn)
+        self.buttons["frame_cap_btn"] = fc_btn
+
         b_surf, b_btn = draw_text(
             get_text(texts, "back"), fonts["small_font"], (0, 0, 0)
         )
@@ -726,6 +886,8 @@ class ScreenSettingsState(State):
 
 
 class LanguageMenuState(State):
+    assets = MENU_IMAGES
+
     def __init__(self):
         self.buttons = {}
 
@@ -736,11 +898,15 @@ class LanguageMenuState(State):
             if self.buttons.get("ru_btn") and self.buttons["ru_btn"].collidepoint(
                 mx, my
             ):
-                game_state["language"], game_state["texts"] = "ru", LANGUAGES["ru"]
+                game_state["language"], game_state["texts"] = "ru", load_catalog("ru")
+                clear_layout_cache()
+                persist_user_settings(game_state)
             elif self.buttons.get("en_btn") and self.buttons["en_btn"].collidepoint(
                 mx, my
             ):
-                game_state["language"], game_state["texts"] = "en", LANGUAGES["en"]
+                game_state["language"], game_state["texts"] = "en", load_catalog("en")
+                clear_layout_cache()
+                persist_user_settings(game_state)
             elif self.buttons.get("back_btn") and self.buttons["back_btn"].collidepoint(
                 mx, my
             ):
@@ -787,6 +953,8 @@ class LanguageMenuState(State):
 
 
 class GameModeMenuState(State):
+    assets = MENU_IMAGES
+
     def __init__(self):
         self.buttons = {}
 
@@ -893,10 +1061,19 @@ class GameModeMenuState(State):
 
 
 class AchievementsMenuState(State):
+    assets = MENU_IMAGES
+
     def __init__(self):
         self.buttons, self.conf_buttons = {}, {}
+        self.profile_list = VirtualList(row_height=40)
+
+    def enter(self, game_state):
+        self.profile_list.set_items(game_state["all_profiles_data"])
+        self.profile_list.scroll_to(game_state.get("achievements_viewing_profile"))
 
     def handle_event(self, event, mx, my, game_state):
+        if self.profile_list.handle_event(event, mx, my):
+            return
         if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
             game_state["state_manager"].change_state("main_menu", game_state)
         elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -906,6 +1083,16 @@ class AchievementsMenuState(State):
                 ].collidepoint(mx, my):
                     ptr = game_state["achievements_viewing_profile"]
                     game_state["all_profiles_data"][ptr] = create_default_achievements()
+                    game_state["leaderboard"].set_profile(
+                        ptr, game_state["all_profiles_data"][ptr]
+                    )
+                    submit_write(
+                        game_state,
+                        f"profile:{ptr}",
+                        save_profile,
+                        ptr,
+                        dict(game_state["all_profiles_data"][ptr]),
+                    )
                     if ptr == game_state["current_profile"]:
                         game_state.update(game_state["all_profiles_data"][ptr])
                     game_state["show_achievements_reset_confirm"] = False
@@ -924,10 +1111,10 @@ class AchievementsMenuState(State):
             ].collidepoint(mx, my):
                 game_state["show_achievements_reset_confirm"] = True
             else:
-                for name, btn in self.buttons.get("profiles", {}).items():
-                    if btn.collidepoint(mx, my):
-                        game_state["achievements_viewing_profile"] = name
-                        return
+                name = self.profile_list.row_at(mx, my)
+                if name is not None:
+                    game_state["achievements_viewing_profile"] = name
+                    return
                 for diff, btn in self.buttons.get("diffs", {}).items():
                     if btn.collidepoint(mx, my):
                         game_state["achievements_viewing_difficulty"] = diff
@@ -937,24 +1124,26 @@ class AchievementsMenuState(State):
         bg = game_state["images"]["menu_background"]
         screen.blit(bg, bg.get_rect(center=screen.get_rect().center))
         fonts, texts = game_state["fonts"], game_state["texts"]
-        self.buttons = {"profiles": {}, "diffs": {}}
+        self.buttons = {"diffs": {}}
         yo = 120
         screen.blit(
             draw_text(get_text(texts, "profiles"), fonts["small_font"], (0, 0, 0))[0],
             (50, 150 + yo),
         )
-        yp = 200 + yo
-        for name in game_state["all_profiles_data"].keys():
-            iv = name == game_state.get("achievements_viewing_profile")
-            t_surf, t_btn = draw_text(
-                name, fonts["small_font"], (0, 150, 0) if iv else (0, 0, 0)
-            )
-            t_btn.topleft = (50, yp)
-            if not iv and t_btn.collidepoint(mx, my):
-                t_surf, _ = draw_text(name, fonts["small_font"], (255, 200, 0))
-            screen.blit(t_surf, t_btn)
-            self.buttons["profiles"][name] = t_btn
-            yp += 40
+        plist = self.profile_list
+        plist.set_style(fonts["small_font"])
+        plist.set_rect(50, 200 + yo, 280, game_state["HEIGHT"] - 200 - yo - 80)
+
+        def variant_for(name, row_rect):
+            if name == game_state.get("achievements_viewing_profile"):
+                return (0, 150, 0)
+            return (255, 200, 0) if row_rect.collidepoint(mx, my) else (0, 0, 0)
+
+        plist.draw(
+            screen,
+            variant_for,
+            lambda name, color: draw_text(name, fonts["small_font"], color)[0],
+        )
 
         vp_data = game_state["all_profiles_data"].get(
             game_state.get("achievements_viewing_profile", ""), {}
@@ -989,30 +1178,28 @@ class AchievementsMenuState(State):
             game_state.get("achievements_viewing_difficulty", "easy"),
             fonts["pedia_font"],
         )
-        screen.blit(
-            draw_text(
-                f"{get_text(texts, 'max_combo_classic')} {vp_data.get(f'max_combo_classic_{df}', 0)}",
-                sf,
-                (0, 0, 0),
-            )[0],
-            (350, 270 + yo),
-        )
-        screen.blit(
-            draw_text(
-                f"{get_text(texts, 'max_combo_sharpshooter')} {vp_data.get(f'max_combo_sharpshooter_{df}', 0)}",
-                sf,
-                (0, 0, 0),
-            )[0],
-            (350, 310 + yo),
-        )
-        screen.blit(
-            draw_text(
-                f"{get_text(texts, 'max_combo_obstacle')} {vp_data.get(f'max_combo_obstacle_{df}', 0)}",
-                sf,
-                (0, 0, 0),
-            )[0],
-            (350, 350 + yo),
-        )
+        vp = game_state.get("achievements_viewing_profile")
+        board = game_state["leaderboard"]
+        for i, mode in enumerate(("classic", "sharpshooter", "obstacle")):
+            line = f"{get_text(texts, f'max_combo_{mode}')} {vp_data.get(f'max_combo_{mode}_{df}', 0)}"
+            rank = board.rank(vp, mode, df)
+            if rank is not None:
+                info = [
+                    get_text(texts, "leaderboard_rank").format(
+                        rank=rank, total=board.size(mode, df)
+                    )
+                ]
+                percentile = board.percentile(vp, mode, df)
+                if percentile is not None:
+                    info.append(
+                        get_text(texts, "leaderboard_percentile").format(
+                            percent=round(percentile)
+                        )
+                    )
+                line += f" ({', '.join(info)})"
+            screen.blit(
+                draw_text(line, sf, (0, 0, 0))[0], (350, 270 + i * 40 + yo)
+            )
 
         r_surf, r_btn = draw_text(
             get_text(texts, "reset_profile"), fonts["small_font"], (180, 0, 0)
@@ -1075,9 +1262,14 @@ class AchievementsMenuState(State):
 
 
 class BirdpediaMenuState(State):
+    assets = MENU_IMAGES
+
     def __init__(self):
         self.buttons = {}
 
+    def preload_hints(self, game_state):
+        return PEDIA_DETAIL_IMAGES
+
     def handle_event(self, event, mx, my, game_state):
         if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
             game_state["state_manager"].change_state("main_menu", game_state)
@@ -1123,6 +1315,8 @@ class BirdpediaMenuState(State):
 
 
 class BirdpediaDetailState(State):
+    assets = PEDIA_DETAIL_IMAGES
+
     def __init__(self):
         self.buttons = {}
 
@@ -1154,18 +1348,13 @@ class BirdpediaDetailState(State):
             s_img = pygame.transform.scale(img, (120, 120))
             screen.blit(s_img, s_img.get_rect(center=bg_rect.center))
 
-        words = (
-            get_text(texts, "pedia_descriptions")
-            .get(item, get_text(texts, "pedia_not_found"))
-            .split(" ")
+        desc = get_text(texts, "pedia_descriptions").get(
+            item, get_text(texts, "pedia_not_found")
+        )
+        screen.blit(
+            render_paragraph(desc, fonts["pedia_font"], 450, (0, 0, 0), justify=True),
+            (300, 280),
         )
-        x, y, sp = 300, 280, fonts["pedia_font"].size(" ")[0]
-        for w in words:
-            ws = fonts["pedia_font"].render(w, True, (0, 0, 0))
-            if x + ws.get_width() >= 750:
-                x, y = 300, y + fonts["pedia_font"].get_linesize()
-            screen.blit(ws, (x, y))
-            x += ws.get_width() + sp
 
         b_surf, b_btn = draw_text(
             get_text(texts, "back"), fonts["small_font"], (0, 0, 0)
@@ -1180,9 +1369,14 @@ class BirdpediaDetailState(State):
 
 
 class LevelSelectionState(State):
+    assets = MENU_IMAGES
+
     def __init__(self):
         self.buttons = {}
 
+    def preload_hints(self, game_state):
+        return MATCH3_IMAGES
+
     def handle_event(self, event, mx, my, game_state):
         if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
             game_state["state_manager"].change_state("main_menu", game_state)
@@ -1194,6 +1388,7 @@ class LevelSelectionState(State):
             else:
                 for lvl, btn in self.buttons.get("levels", {}).items():
                     if btn.collidepoint(mx, my):
+                        game_state["campaign_level"] = lvl
                         reset_game(game_state)
                         game_state["state_manager"].change_state("match3", game_state)
                         break
@@ -1209,7 +1404,7 @@ class LevelSelectionState(State):
         )
         t_rect.centerx, t_rect.y = screen.get_width() // 2, 80
         screen.blit(t_surf, t_rect)
-        cols, total, sp, r = 5, 20, 100, 35
+        cols, total, sp, r = 5, CAMPAIGN_LEVEL_COUNT, 100, 35
         sx, sy = (screen.get_width() - (cols - 1) * sp) // 2, t_rect.bottom + 80
 
         for i in range(total):
@@ -0,0 +1,321 @@
+# layout_eval.py
+
+"""Пакетная оценка расстановок рогатки методом Монте-Карло.
+
+Для каждой расстановки симулируется много случайных выстрелов (включая
+способности птиц: ускорение, разделение и бумеранг) в безоконном
+пространстве pymunk. Расстановки раздаются по процессам через
+ProcessPoolExecutor, у каждого процесса свое пространство.
+"""
+
+import math
+import os
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pymunk
+
+from entities import BIRD_FILTER, TARGET_FILTER, DEBRIS_FILTER, create_space
+
+SIM_DT = 1.0 / 60.0
+MAX_FLIGHT_TIME = 4.0
+AIM_DELAY = 0.5  # прыжок птицы на рогатку и прицеливание до выстрела
+HIT_TOLERANCE = 2.0
+BIRD_TYPES = 5
+GAMES_PER_LAYOUT = 400
+
+# Пространство текущего процесса (и потока): world = (ключ геометрии, pymunk.Space)
+_worker_world = threading.local()
+
+
+def layout_from_game_state(game_state):
+    """Снимает текущую расстановку рогатки в словарь, пригодный для оценки."""
+    from settings import SPEED_MULTIPLIER
+
+    sm = SPEED_MULTIPLIER.get(game_state["difficulty"], 0)
+
+    def snapshot(sprite):
+        v = sprite.body.velocity
+        dx, dy = (v.x / 60 / sm, v.y / 60 / sm) if sm > 0 else (0, 0)
+        return (sprite.x, sprite.y, dx, dy)
+
+    return {
+        "mode": game_state["game_mode"],
+        "difficulty": game_state["difficulty"],
+        "width": game_state["WIDTH"],
+        "height": game_state["HEIGHT"],
+        "ground_level": game_state["GROUND_LEVEL"],
+        "sling": (game_state["sling_x"], game_state["sling_y"]),
+        "scale_factor": game_state["scale_factor"],
+        "object_size": game_state["object_size"],
+        "small_object_size": game_state["small_object_size"],
+        "explosion_radius": game_state["EXPLOSION_RADIUS"],
+        "targets": [snapshot(t) for t in game_state.get("targets", [])],
+        "obstacles": [snapshot(o) for o in game_state.get("obstacles", [])],
+    }
+
+
+def resolve_params(layout, params=None):
+    """Подставляет значения из settings.py для параметров, не заданных явно."""
+    from settings import SPEED_MULTIPLIER, TARGET_DURATION, LIVES
+
+    params = dict(params or {})
+    difficulty = layout["difficulty"]
+    params.setdefault("speed_multiplier", SPEED_MULTIPLIER.get(difficulty, 0))
+    params.setdefault("target_duration", TARGET_DURATION.get(difficulty, 2.5))
+    params.setdefault("lives", LIVES.get(difficulty, 5))
+    return params
+
+
+def sample_shot(rng):
+    """Случайный выстрел: угол, сила натяжения, тип птицы и момент способности."""
+    return {
+        "angle": math.radians(rng.uniform(-85.0, 20.0)),
+        "pull": rng.uniform(0.2, 1.0),
+        "bird_type": rng.randrange(BIRD_TYPES),
+        "ability_time": rng.uniform(0.15, 1.2),
+    }
+
+
+def _get_space(layout):
+    key = (layout["width"], layout["height"], layout["ground_level"])
+    world = getattr(_worker_world, "world", None)
+    if world is None or world[0] != key:
+        world = _worker_world.world = (key, create_space(*key))
+    return world[1]
+
+
+def _add_circle(space, x, y, velocity, mass, radius, elasticity, friction, shape_filter):
+    body = pymunk.Body(mass, pymunk.moment_for_circle(mass, 0, radius))
+    body.position = (x, y)
+    body.velocity = velocity
+    shape = pymunk.Circle(body, radius)
+    shape.elasticity, shape.friction, shape.filter = elasticity, friction, shape_filter
+    space.add(body, shape)
+    return shape
+
+
+def _add_box(space, x, y, velocity, mass, size, elasticity, friction, shape_filter):
+    body = pymunk.Body(mass, pymunk.moment_for_box(mass, (size, size)))
+    body.position = (x, y)
+    body.velocity = velocity
+    shape = pymunk.Poly.create_box(body, (size, size))
+    shape.elasticity, shape.friction, shape.filter = elasticity, friction, shape_filter
+    space.add(body, shape)
+    return shape
+
+
+def _remove(space, shape, removed):
+    if shape not in removed:
+        removed.add(shape)
+        space.remove(shape.body, shape)
+
+
+def simulate_shot(space, layout, shot, params):
+    """Симулирует один выстрел и возвращает число сбитых целей.
+
+    Параметры тел совпадают с entities.Target, Obstacle, MainBird и SmallBird,
+    правила попаданий повторяют SlingshotState.update.
+    """
+    size, small = layout["object_size"], layout["small_object_size"]
+    ground, width, height = layout["ground_level"], layout["width"], layout["height"]
+    sm = params["speed_multiplier"]
+    sharpshooter = layout["mode"] == "sharpshooter"
+    obstacle_mode = layout["mode"] == "obstacle"
+    created, removed = [], set()
+
+    targets = []
+    for x, y, dx, dy in layout["targets"]:
+        targets.append(_add_circle(space, x, y, (dx * sm * 60, dy * sm * 60), 1.0, size // 2, 0.4, 0.6, TARGET_FILTER))
+    obstacles = []
+    for x, y, dx, dy in layout["obstacles"]:
+        obstacles.append(_add_box(space, x, y, (dx * sm * 60, dy * sm * 60), 3.0, size, 0.2, 0.8, TARGET_FILTER))
+    created += targets + obstacles
+
+    for _ in range(int(AIM_DELAY / SIM_DT)):
+        space.step(SIM_DT)
+
+    sx, sy = layout["sling"]
+    angle, bird_type = shot["angle"], shot["bird_type"]
+    distance = shot["pull"] * int(150 * layout["scale_factor"])
+    power = distance / 7.0
+    bird = _add_circle(
+        space,
+        sx - math.cos(angle) * distance,
+        sy - math.sin(angle) * distance,
+        (power * math.cos(angle) * 60, power * math.sin(angle) * 60),
+        5.0, size // 2, 0.5, 0.8, BIRD_FILTER,
+    )
+    created.append(bird)
+
+    bird_state, tumble_timer, ability_ready = "flying", 0.0, bird_type in (2, 3, 4)
+    small_birds = []  # [shape, state, timer]
+    score, t = 0, 0.0
+
+    def alive(shape):
+        return shape not in removed
+
+    def touches_target(shape, radius, target):
+        return shape.body.position.get_distance(target.body.position) <= radius + size // 2 + HIT_TOLERANCE
+
+    def touches_obstacle(shape, radius, obstacle):
+        return obstacle.point_query(shape.body.position).distance <= radius + HIT_TOLERANCE
+
+    while t < MAX_FLIGHT_TIME:
+        if sharpshooter and AIM_DELAY + t > params["target_duration"]:
+            break  # цель исчезла по таймеру
+        if bird_state in ("flying", "tumbling") and ability_ready and t >= shot["ability_time"]:
+            ability_ready = False
+            v = bird.body.velocity
+            if bird_type == 2:
+                bird.body.velocity = (v.x * 2.0, v.y * 2.0)
+            elif bird_type == 3:
+                p = bird.body.position
+                for i in range(3):
+                    a = math.radians(120 * i)
+                    sb = _add_circle(space, p.x, p.y, (v.x + math.cos(a) * 300, v.y + math.sin(a) * 300), 0.5, small // 2, 0.5, 0.8, DEBRIS_FILTER)
+                    small_birds.append([sb, "flying", 0.0])
+                    created.append(sb)
+                _remove(space, bird, removed)
+                bird_state = "dead"
+            elif bird_type == 4:
+                bird.body.velocity = (-abs(v.x) - 400, v.y - 100)
+        if bird_type == 4 and bird_state == "flying":
+            bird.body.angular_velocity = -15.0
+
+        space.step(SIM_DT)
+        t += SIM_DT
+
+        if bird_state in ("flying", "tumbling"):
+            p = bird.body.position
+            if bird_state == "flying" and p.y >= ground - size:
+                bird_state, tumble_timer = "tumbling", 2.0
+            elif p.y > height + 50 or p.x < -50 or p.x > width + 50:
+                bird_state = "out_of_bounds"
+            if bird_state == "tumbling":
+                tumble_timer -= SIM_DT
+                if bird.body.velocity.length < 15 or tumble_timer <= 0:
+                    bird_state = "stopped"
+
+        if bird_state in ("flying", "tumbling"):
+            for tg in targets:
+                if alive(tg) and touches_target(bird, size // 2, tg):
+                    if bird_type == 1:
+                        center = tg.body.position
+                        hit = [x for x in targets if alive(x) and x.body.position.get_distance(center) <= layout["explosion_radius"]]
+                    else:
+                        hit = [tg]
+                    for x in hit:
+                        _remove(space, x, removed)
+                    score += len(hit)
+                    _remove(space, bird, removed)
+                    bird_state = "dead"
+                    break
+            if obstacle_mode and bird_state in ("flying", "tumbling"):
+                for ob in obstacles:
+                    if alive(ob) and touches_obstacle(bird, size // 2, ob):
+                        _remove(space, ob, removed)
+                        v = bird.body.velocity
+                        bird.body.velocity = (v.x * 0.5, v.y * 0.5)
+                        break
+
+        for entry in small_birds:
+            sb, state, timer = entry
+            if state == "dead":
+                continue
+            if state == "flying" and sb.body.position.y >= ground - small // 2:
+                state, timer = "tumbling", 1.0
+            elif state == "tumbling":
+                timer -= SIM_DT
+                if sb.body.velocity.length < 5 or timer <= 0:
+                    state = "dead"
+                    _remove(space, sb, removed)
+            if state != "dead":
+                for tg in targets:
+                    if alive(tg) and touches_target(sb, small // 2, tg):
+                        _remove(space, tg, removed)
+                        _remove(space, sb, removed)
+                        score += 1
+                        state = "dead"
+                        break
+            if obstacle_mode and state != "dead":
+                for ob in obstacles:
+                    if alive(ob) and touches_obstacle(sb, small // 2, ob):
+                        _remove(space, ob, removed)
+                        v = sb.body.velocity
+                        sb.body.velocity = (v.x * 0.5, v.y * 0.5)
+                        break
+            entry[1], entry[2] = state, timer
+
+        if bird_state not in ("flying", "tumbling") and all(e[1] == "dead" for e in small_birds):
+            break
+        if not any(alive(tg) for tg in targets):
+            break
+
+    for shape in created:
+        _remove(space, shape, removed)
+    return score
+
+
+def expected_game_score(outcomes, num_targets, lives, rng, games=GAMES_PER_LAYOUT):
+    """Средний счет за партию: выстрелы берутся из выборки, пока не кончатся попытки или цели."""
+    if not outcomes or num_targets == 0:
+        return 0.0
+    total = 0
+    for _ in range(games):
+        score, misses = 0, 0
+        while misses < lives and score < num_targets:
+            s = rng.choice(outcomes)
+            if s:
+                score = min(num_targets, score + s)
+            else:
+                misses += 1
+        total += score
+    return total / games
+
+
+def evaluate_layout(layout, shots=200, params=None, seed=0):
+    """Оценивает одну расстановку в текущем процессе."""
+    params = resolve_params(layout, params)
+    return _evaluate_task((layout, shots, params, seed))
+
+
+def _evaluate_task(task):
+    layout, shots, params, seed = task
+    rng = random.Random(seed)
+    space = _get_space(layout)
+    outcomes, best_shot, best_score = [], None, 0
+    for _ in range(shots):
+        shot = sample_shot(rng)
+        score = simulate_shot(space, layout, shot, params)
+        outcomes.append(score)
+        if score > best_score:
+            best_shot, best_score = shot, score
+    hits = sum(1 for s in outcomes if s > 0)
+    return {
+        "hit_probability": hits / shots if shots else 0.0,
+        "score_per_shot": sum(outcomes) / shots if shots else 0.0,
+        "expected_score": expected_game_score(outcomes, len(layout["targets"]), params["lives"], rng),
+        "best_shot": best_shot,
+        "best_shot_score": best_score,
+        "shots": shots,
+    }
+
+
+def evaluate_layouts(layouts, shots=200, params=None, workers=None, seed=0, mp_context=None):
+    """Оценивает список расстановок параллельно.
+
+    params может переопределять speed_multiplier, target_duration и lives для
+    подбора значений в settings.py. При workers=1 оценка идет в текущем
+    процессе, если не задан mp_context: с ним воркеры всегда запускаются
+    отдельно (например, через "spawn" из фонового потока игры).
+    Результаты возвращаются в порядке расстановок.
+    """
+    tasks = [(layout, shots, resolve_params(layout, params), seed + i) for i, layout in enumerate(layouts)]
+    workers = workers or os.cpu_count() or 1
+    if not tasks or (mp_context is None and (workers == 1 or len(tasks) == 1)):
+        return [_evaluate_task(task) for task in tasks]
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+        return list(executor.map(_evaluate_task, tasks, chunksize=chunksize))
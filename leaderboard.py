@@ -0,0 +1,96 @@
+# leaderboard.py
+
+"""Таблица рекордов по всем локальным профилям.
+
+Для каждой пары (режим, сложность) держится отсортированный индекс,
+который обновляется точечно при новом рекорде, поэтому топ, место
+профиля и процентиль считаются бинарным поиском, без обхода профилей.
+"""
+
+import bisect
+
+from achievements import create_default_achievements
+
+COMBO_PREFIX = "max_combo_"
+
+
+class ScoreIndex:
+    """Отсортированный индекс рекордов одной пары (режим, сложность)."""
+
+    def __init__(self):
+        self.entries = []  # (-рекорд, имя) по возрастанию: лучшие в начале
+        self.scores = []  # рекорды по возрастанию
+        self.by_name = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def set(self, name, score):
+        old = self.by_name.get(name)
+        if old == score:
+            return
+        if old is not None:
+            self.remove(name)
+        self.by_name[name] = score
+        bisect.insort(self.entries, (-score, name))
+        bisect.insort(self.scores, score)
+
+    def remove(self, name):
+        score = self.by_name.pop(name, None)
+        if score is None:
+            return
+        del self.entries[bisect.bisect_left(self.entries, (-score, name))]
+        del self.scores[bisect.bisect_left(self.scores, score)]
+
+    def top(self, n):
+        return [(name, -neg) for neg, name in self.entries[:n]]
+
+    def rank(self, name):
+        """Место профиля (1 — лучший), одинаковые рекорды делят место."""
+        score = self.by_name.get(name)
+        if score is None:
+            return None
+        return len(self.scores) - bisect.bisect_right(self.scores, score) + 1
+
+    def percentile(self, name):
+        """Доля профилей (в %), у которых рекорд ниже, чем у этого профиля."""
+        score = self.by_name.get(name)
+        if score is None or len(self.scores) < 2:
+            return None
+        return 100.0 * bisect.bisect_left(self.scores, score) / (len(self.scores) - 1)
+
+
+class Leaderboard:
+    def __init__(self, profiles_data=None):
+        self.indexes = {}
+        for name, data in (profiles_data or {}).items():
+            self.set_profile(name, data)
+
+    def index(self, mode, difficulty):
+        return self.indexes.setdefault(f"{COMBO_PREFIX}{mode}_{difficulty}", ScoreIndex())
+
+    def update(self, name, key, score):
+        """Обновляет один рекорд профиля (ключ вида max_combo_<режим>_<сложность>)."""
+        if key.startswith(COMBO_PREFIX):
+            self.indexes.setdefault(key, ScoreIndex()).set(name, score)
+
+    def set_profile(self, name, data):
+        """Заносит все рекорды профиля (создание или сброс профиля)."""
+        for key in create_default_achievements():
+            self.update(name, key, data.get(key, 0))
+
+    def remove_profile(self, name):
+        for index in self.indexes.values():
+            index.remove(name)
+
+    def top(self, mode, difficulty, n=10):
+        return self.index(mode, difficulty).top(n)
+
+    def rank(self, name, mode, difficulty):
+        return self.index(mode, difficulty).rank(name)
+
+    def percentile(self, name, mode, difficulty):
+        return self.index(mode, difficulty).percentile(name)
+
+    def size(self, mode, difficulty):
+        return len(self.index(mode, difficulty))
@@ -0,0 +1,272 @@
+# level_generator.py
+
+"""Генератор расстановок для режимов с рогаткой.
+
+Расстановки сэмплируются по ограничениям (режим, сложность, размер экрана),
+неразрешимые отбрасываются быстрой безоконной симуляцией из layout_eval,
+принятые раскладываются по корзинам оценочной сложности и кэшируются на
+диске, чтобы перезапуск уровня брал готовую расстановку без перебора.
+"""
+
+import json
+import multiprocessing
+import os
+import random
+import threading
+
+from game_objects import compute_screen_metrics
+from layout_eval import evaluate_layouts
+from utils import create_target, create_obstacle
+
+LEVEL_POOL_FILE = "level_pool.json"
+POOL_TARGET_SIZE = 12
+SOLVABILITY_SHOTS = 48
+MIN_HIT_PROBABILITY = 0.05
+MAX_PLACEMENT_ATTEMPTS = 100
+# Сколько расстановок на одну нужную сэмплируется, не больше: если
+# ограничения почти не дают разрешимых расстановок, генерация не зациклится
+MAX_SAMPLES_PER_LAYOUT = 8
+
+# Количество (целей, препятствий) для каждого режима
+MODE_OBJECTS = {
+    "classic": (3, 0),
+    "sharpshooter": (1, 0),
+    "obstacle": (3, 3),
+    "training": (3, 0),
+    "developer": (0, 0),
+}
+
+# Корзины сложности по вероятности попадания случайным выстрелом (rating):
+# чем она ниже, тем сложнее расстановка. Пороги (easy от, medium от)
+# абсолютные для режима — трети распределения rating по 80 расстановкам
+# 800x600 на легкой и сложной сложности
+DIFFICULTY_BUCKETS = ("easy", "medium", "hard")
+BUCKET_THRESHOLDS = {
+    "classic": (0.95, 0.875),
+    "training": (0.95, 0.875),
+    "sharpshooter": (0.65, 0.45),
+    "obstacle": (0.9, 0.75),
+}
+BUCKET_ORDER = {
+    "easy": ("easy", "medium", "hard"),
+    "medium": ("medium", "easy", "hard"),
+    "hard": ("hard", "medium", "easy"),
+}
+
+
+def level_constraints(game_state):
+    return {
+        "mode": game_state["game_mode"],
+        "difficulty": game_state["difficulty"],
+        "width": game_state["WIDTH"],
+        "height": game_state["HEIGHT"],
+    }
+
+
+def pool_key(constraints):
+    return f"{constraints['mode']}:{constraints['difficulty']}:{constraints['width']}x{constraints['height']}"
+
+
+def _direction(rng):
+    return rng.uniform(0.5, 2.0) * rng.choice([-1, 1])
+
+
+def sample_layout(constraints, rng=random):
+    """Случайная расстановка без проверки на разрешимость.
+
+    Число попыток размещения без перекрытий ограничено, поэтому функция
+    никогда не зацикливается.
+    """
+    width, height = constraints["width"], constraints["height"]
+    m = compute_screen_metrics(width, height)
+    size = m["object_size"]
+    num_targets, num_obstacles = MODE_OBJECTS.get(constraints["mode"], (3, 0))
+
+    placed, groups = [], {"targets": [], "obstacles": []}
+    for group, count, factory in (
+        ("targets", num_targets, create_target),
+        ("obstacles", num_obstacles, create_obstacle),
+    ):
+        for _ in range(count):
+            for _ in range(MAX_PLACEMENT_ATTEMPTS):
+                nr = factory(width, height, size, rng)
+                if not any(nr.inflate(10, 10).colliderect(r) for r in placed):
+                    break
+            placed.append(nr)
+            groups[group].append((nr.centerx, nr.centery, _direction(rng), _direction(rng)))
+
+    return {
+        "mode": constraints["mode"],
+        "difficulty": constraints["difficulty"],
+        "width": width,
+        "height": height,
+        "ground_level": m["GROUND_LEVEL"],
+        "sling": (m["sling_x"], m["sling_y"]),
+        "scale_factor": m["scale_factor"],
+        "object_size": size,
+        "small_object_size": m["small_object_size"],
+        "explosion_radius": m["EXPLOSION_RADIUS"],
+        "targets": groups["targets"],
+        "obstacles": groups["obstacles"],
+    }
+
+
+def is_solvable(result):
+    return result["hit_probability"] >= MIN_HIT_PROBABILITY
+
+
+def difficulty_bucket(mode, rating):
+    easy_min, medium_min = BUCKET_THRESHOLDS.get(mode, BUCKET_THRESHOLDS["classic"])
+    if rating >= easy_min:
+        return "easy"
+    return "medium" if rating >= medium_min else "hard"
+
+
+def generate_layouts(constraints, count, workers=None, seed=None, mp_context=None):
+    """Генерирует до count разрешимых расстановок, разложенных по корзинам
+    сложности; пробует не больше count * MAX_SAMPLES_PER_LAYOUT расстановок."""
+    rng = random.Random(seed)
+    accepted = []
+    if MODE_OBJECTS.get(constraints["mode"], (3, 0))[0] > 0:
+        limit = count * MAX_SAMPLES_PER_LAYOUT
+        sampled = 0
+        while len(accepted) < count and sampled < limit:
+            size = min((count - len(accepted)) * 2, limit - sampled)
+            batch = [sample_layout(constraints, rng) for _ in range(size)]
+            sampled += size
+            results = evaluate_layouts(
+                batch,
+                shots=SOLVABILITY_SHOTS,
+                workers=workers,
+                seed=rng.randrange(1 << 30),
+                mp_context=mp_context,
+            )
+            for layout, result in zip(batch, results):
+                if is_solvable(result) and len(accepted) < count:
+                    layout["rating"] = round(result["hit_probability"], 3)
+                    accepted.append(layout)
+
+    accepted.sort(key=lambda layout: -layout["rating"])
+    buckets = {name: [] for name in DIFFICULTY_BUCKETS}
+    for layout in accepted:
+        buckets[difficulty_bucket(constraints["mode"], layout["rating"])].append(layout)
+    return buckets
+
+
+class LevelPool:
+    """Дисковый кэш принятых расстановок с фоновым пополнением."""
+
+    def __init__(self, path=LEVEL_POOL_FILE, target_size=POOL_TARGET_SIZE):
+        self.path = path
+        self.target_size = target_size
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        self.refilling = set()
+        self.pools = self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    return json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Ошибка загрузки пула уровней: {e}")
+        return {}
+
+    def save(self):
+        with self.lock:
+            data = json.dumps(self.pools)
+        tmp_path = self.path + ".tmp"
+        with self.save_lock:
+            try:
+                with open(tmp_path, "w") as f:
+                    f.write(data)
+                os.replace(tmp_path, self.path)
+            except IOError as e:
+                print(f"Ошибка сохранения пула уровней: {e}")
+
+    def size(self, constraints):
+        with self.lock:
+            return sum(len(v) for v in self.pools.get(pool_key(constraints), {}).values())
+
+    def take(self, constraints, rng=random):
+        """Мгновенно выдает расстановку; при нехватке запускает фоновое пополнение."""
+        key = pool_key(constraints)
+        layout = None
+        with self.lock:
+            buckets = self.pools.get(key, {})
+            for bucket in BUCKET_ORDER.get(constraints["difficulty"], BUCKET_ORDER["medium"]):
+                if buckets.get(bucket):
+                    layout = buckets[bucket].pop(rng.randrange(len(buckets[bucket])))
+                    break
+            remaining = sum(len(v) for v in buckets.values())
+
+        if remaining < self.target_size // 2:
+            self.refill_async(constraints)
+        elif layout is not None:
+            threading.Thread(target=self.save, daemon=True).start()
+        return layout if layout is not None else sample_layout(constraints, rng)
+
+    def refill(self, constraints, count=None, workers=None, mp_context=None):
+        count = count if count is not None else self.target_size - self.size(constraints)
+        if count <= 0:
+            return
+        generated = generate_layouts(constraints, count, workers=workers, mp_context=mp_context)
+        with self.lock:
+            buckets = self.pools.setdefault(pool_key(constraints), {})
+            for bucket, layouts in generated.items():
+                buckets.setdefault(bucket, []).extend(layouts)
+        self.save()
+
+    def refill_async(self, constraints):
+        key = pool_key(constraints)
+        with self.lock:
+            if key in self.refilling:
+                return
+            self.refilling.add(key)
+
+        def run():
+            try:
+                # Воркеры запускаются через spawn: fork из потока процесса с SDL небезопасен
+                self.refill(
+                    constraints,
+                    workers=max(1, (os.cpu_count() or 2) - 1),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            except Exception as e:
+                # Пул остается как есть; take() берет случайную расстановку
+                print(f"Ошибка генерации пула уровней: {e}")
+            finally:
+                with self.lock:
+                    self.refilling.discard(key)
+
+        threading.Thread(target=run, daemon=True).start()
+
+
+def take_layout(game_state):
+    """Расстановка для reset_slingshot: из пула, если он есть, иначе случайная."""
+    constraints = level_constraints(game_state)
+    pool = game_state.get("level_pool")
+    if pool is None:
+        return sample_layout(constraints)
+    return pool.take(constraints)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Предварительная генерация пула расстановок.")
+    parser.add_argument("--count", type=int, default=POOL_TARGET_SIZE)
+    parser.add_argument("--width", type=int, default=800)
+    parser.add_argument("--height", type=int, default=600)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    pool = LevelPool()
+    for mode, (num_targets, _) in MODE_OBJECTS.items():
+        if num_targets == 0:
+            continue
+        for difficulty in ("easy", "medium", "hard"):
+            constraints = {"mode": mode, "difficulty": difficulty, "width": args.width, "height": args.height}
+            pool.refill(constraints, count=args.count - pool.size(constraints), workers=args.workers)
+            print(f"{pool_key(constraints)}: {pool.size(constraints)}")
@@ -1,3 +1,5 @@
+from types import MappingProxyType
+
 LANGUAGES = {
     "ru": {
         # Menu
@@ -25,6 +27,7 @@ LANGUAGES = {
         "music_volume": "Громкость музыки:",
         "sfx_volume": "Громкость эффектов:",
         "track_colon": "Трек:",
+        "track_switch_time": "Смена трека: {ms:.1f} мс",
         "prev_track": "<<",
         "next_track": ">>",
         # Screen Settings
@@ -32,6 +35,9 @@ LANGUAGES = {
         "contrast": "Контрастность:",
         "resolution": "Разрешение:",
         "fullscreen": "Полноэкранный",
+        "fixed_render": "Фиксированное разрешение рендера",
+        "frame_cap": "Частота кадров",
+        "frame_cap_unlimited": "без ограничения",
         # Modes & Difficulty
         "classic": "Классика",
         "sharpshooter": "Меткий глаз",
@@ -57,6 +63,8 @@ LANGUAGES = {
         "max_combo_classic": "Классика: макс. комбо -",
         "max_combo_sharpshooter": "Меткий глаз: макс. комбо -",
         "max_combo_obstacle": "С препятствиями: макс. комбо -",
+        "leaderboard_rank": "место {rank} из {total}",
+        "leaderboard_percentile": "лучше {percent}% профилей",
         "reset_profile": "Сброс профиля",
         "confirm_reset_stats": "Сбросить статистику для",
         # Birdpedia
@@ -101,6 +109,7 @@ LANGUAGES = {
         "training_exit_to_menu": "Выйти в меню",
         # Campaign
         "campaign_win": "Уровень пройден!",
+        "campaign_demo": "Демонстрация: играет бот (D — выключить)",
         "level_selection_title": "Выбор уровня",
         "level": "Уровень",
         "campaign_hint_title": "Правила режима 'Прохождение'",
@@ -144,6 +153,7 @@ LANGUAGES = {
         "music_volume": "Music Volume:",
         "sfx_volume": "Sound Effects Volume:",
         "track_colon": "Track:",
+        "track_switch_time": "Track switch: {ms:.1f} ms",
         "prev_track": "<<",
         "next_track": ">>",
         # Screen Settings
@@ -151,6 +161,9 @@ LANGUAGES = {
         "contrast": "Contrast:",
         "resolution": "Resolution:",
         "fullscreen": "Fullscreen",
+        "fixed_render": "Fixed render resolution",
+        "frame_cap": "Frame rate",
+        "frame_cap_unlimited": "unlimited",
         # Modes & Difficulty
         "classic": "Classic",
         "sharpshooter": "Sharpshooter",
@@ -176,6 +189,8 @@ LANGUAGES = {
         "max_combo_classic": "Classic: max combo -",
         "max_combo_sharpshooter": "Sharpshooter: max combo -",
         "max_combo_obstacle": "Obstacle Mode: max combo -",
+        "leaderboard_rank": "rank {rank} of {total}",
+        "leaderboard_percentile": "better than {percent}% of profiles",
         "reset_profile": "Reset Profile",
         "confirm_reset_stats": "Reset stats for",
         # Birdpedia
@@ -220,6 +235,7 @@ LANGUAGES = {
         "training_exit_to_menu": "Exit to Menu",
         # Campaign
         "campaign_win": "Level Complete!",
+        "campaign_demo": "Demo: the bot is playing (D to stop)",
         "level_selection_title": "Level Selection",
         "level": "Level",
         "campaign_hint_title": "'Campaign' Mode Rules",
@@ -237,4 +253,50 @@ LANGUAGES = {
         "lives_infinite": "Lives: ∞",
         "pause": "PAUSE",
     },
-}
\ No newline at end of file
+}
+
+# Скомпилированные каталоги: неизменяемые таблицы, в которых подстановка
+# из языка по умолчанию сделана заранее, поэтому get_text — одно обращение
+# к словарю. Каталог собирается только для выбранного языка.
+FALLBACK_LANGUAGE = "ru"
+
+_catalogs = {}
+
+
+class _Catalog(dict):
+    def __missing__(self, key):
+        # Ключа нет ни в одном языке: сообщаем один раз и запоминаем заглушку
+        print(f"Warning: Localization key '{key}' not found in any language.")
+        self[key] = f"[{key}]"
+        return self[key]
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def compile_catalog(language):
+    source = LANGUAGES.get(language, LANGUAGES[FALLBACK_LANGUAGE])
+    fallback = LANGUAGES[FALLBACK_LANGUAGE]
+    missing = [key for key in fallback if key not in source]
+    if missing:
+        print(
+            f"Warning: language '{language}' lacks keys {missing}, "
+            f"using '{FALLBACK_LANGUAGE}'."
+        )
+    catalog = _Catalog({key: _freeze(value) for key, value in fallback.items()})
+    catalog.update((key, _freeze(value)) for key, value in source.items())
+    return MappingProxyType(catalog)
+
+
+def load_catalog(language):
+    """Каталог языка; собирается при первом выборе языка."""
+    if language not in LANGUAGES:
+        language = FALLBACK_LANGUAGE
+    if language not in _catalogs:
+        _catalogs[language] = compile_catalog(language)
+    return _catalogs[language]
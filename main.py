@@ -14,16 +14,22 @@ from achievements import (
     load_all_profiles_data,
     save_all_profiles_data,
     load_last_profile_name,
-    save_last_profile_name,
     load_user_settings,
-    save_user_settings,
 )
 from game_objects import (
     update_all_volumes,
     play_music_track,
     reset_game,
-    CAMPAIGN_GRID_SIZE,
+    persist_user_settings,
+    persist_last_profile,
+    campaign_level_config,
+    update_campaign_layout,
     BASE_WIDTH,
+    LOGICAL_RESOLUTION,
+    update_viewport,
+    window_to_logical,
+    present_frame,
+    finish_screen_switch,
 )
 from game_states import (
     StateManager,
@@ -41,7 +47,17 @@ from game_states import (
 )
 from match3_game import Match3State
 from slingshot_game import SlingshotState
-from localization import LANGUAGES
+from localization import load_catalog
+from leaderboard import Leaderboard
+from level_generator import LevelPool
+from persistence import PersistenceService
+from telemetry import TelemetryWriter
+from music import MusicPlayer
+from sfx import SfxMixer
+from context import GameContext
+from frame_governor import FrameGovernor, DEFAULT_FRAME_CAP
+from tween import TweenScheduler
+from assets import AssetManager, RESIDENT_IMAGES, format_report
 
 MUSIC_END_EVENT = pygame.USEREVENT + 1
 
@@ -49,7 +65,15 @@ MUSIC_END_EVENT = pygame.USEREVENT + 1
 def init_game():
     pygame.init()
     INITIAL_WIDTH, INITIAL_HEIGHT = 800, 600
-    screen = pygame.display.set_mode((INITIAL_WIDTH, INITIAL_HEIGHT))
+    window = pygame.display.set_mode((INITIAL_WIDTH, INITIAL_HEIGHT))
+    user_settings = load_user_settings()
+    fixed_resolution = user_settings["display"].get("fixed_resolution", False)
+    if fixed_resolution:
+        # Раскладка считается от логического разрешения, а не от окна
+        INITIAL_WIDTH, INITIAL_HEIGHT = LOGICAL_RESOLUTION
+        screen = pygame.Surface(LOGICAL_RESOLUTION).convert()
+    else:
+        screen = window
     pygame.display.set_caption("Angry Birds Deluxe")
     clock = pygame.time.Clock()
     pygame.mouse.set_visible(False)
@@ -59,10 +83,11 @@ def init_game():
     object_size = int(50 * game_scale_factor)
     small_object_size = int(25 * game_scale_factor)
 
-    images = load_images(
-        INITIAL_WIDTH, INITIAL_HEIGHT, ui_scale_factor, game_scale_factor
-    )
+    # Сначала только постоянные ресурсы; остальные захватывают состояния
+    image_metrics = (INITIAL_WIDTH, INITIAL_HEIGHT, ui_scale_factor, game_scale_factor)
+    assets = AssetManager(load_images(*image_metrics, RESIDENT_IMAGES), image_metrics)
     sounds = load_sounds()
+    assets.track_sounds(sounds)
     fonts = load_fonts(ui_scale_factor)
 
     sling_x = int(INITIAL_WIDTH * 0.23)
@@ -73,31 +98,17 @@ def init_game():
     if last_profile not in all_profiles_data:
         last_profile = "Guest"
 
-    bird_names = [
-        "Красная Птица",
-        "Взрывная Птица",
-        "Ускоряющаяся Птица",
-        "Птица-Дробилка",
-        "Птица-Бумеранг",
-    ]
-    bird_image_to_name = {
-        img: name for img, name in zip(images["bird_imgs"], bird_names)
-    }
-    user_settings = load_user_settings()
     current_language = user_settings.get("language", "ru")
 
-    campaign_board_size = min(INITIAL_WIDTH * 0.6, INITIAL_HEIGHT * 0.8)
-    campaign_grid_rect = pygame.Rect(
-        (INITIAL_WIDTH - campaign_board_size) / 2,
-        (INITIAL_HEIGHT - campaign_board_size) / 2,
-        campaign_board_size,
-        campaign_board_size,
-    )
-
     game_state = {
         "screen": screen,
+        "window": window,
+        "fixed_resolution": fixed_resolution,
+        "pending_fixed_resolution": fixed_resolution,
+        "frame_cap": user_settings["display"].get("frame_cap", DEFAULT_FRAME_CAP),
         "clock": clock,
-        "images": images,
+        "images": assets.images,
+        "assets": assets,
         "sounds": sounds,
         "fonts": fonts,
         "WIDTH": INITIAL_WIDTH,
@@ -112,9 +123,7 @@ def init_game():
         "EXPLOSION_RADIUS": int(EXPLOSION_RADIUS * game_scale_factor),
         "MAX_EXPLOSION_FRAMES": MAX_EXPLOSION_FRAMES,
         "gravity": 0.5 * game_scale_factor,
-        "explosion_active": False,
-        "explosion_center": (0, 0),
-        "explosion_frames": 0,
+        "explosions": [],
         "boost_trail_start_time": None,
         "paused": False,
         "combo": 0,
@@ -125,7 +134,7 @@ def init_game():
         "score": 0,
         "lives": 5,
         "game_over": False,
-        "current_bird_img": None,
+        "current_bird_type": None,
         "bird_queue": [],
         "target_timer_start": None,
         "target_duration": 5,
@@ -140,13 +149,14 @@ def init_game():
         "sfx_volume": user_settings["audio"]["sfx_volume"],
         "brightness_slider_pos": user_settings["display"]["brightness"],
         "language": current_language,
-        "texts": LANGUAGES.get(current_language, LANGUAGES["ru"]),
+        "texts": load_catalog(current_language),
         "current_shot_hit": False,
         "screen_shake": 0,
         "current_music_track_index": random.randint(0, 4),
         "last_shot_path": [],
         "path_display_timer": 0,
         "all_profiles_data": all_profiles_data,
+        "leaderboard": Leaderboard(all_profiles_data),
         "current_profile": last_profile,
         "achievements_viewing_profile": last_profile,
         "achievements_viewing_difficulty": "easy",
@@ -162,29 +172,37 @@ def init_game():
         "is_dragging_sfx_volume": False,
         "is_dragging_difficulty": False,
         "is_dragging_brightness": False,
-        "bird_image_to_name": bird_image_to_name,
+        "pending_images": None,
+        "show_memory_overlay": False,
         "show_training_popup": False,
-        "screen_mode": (INITIAL_WIDTH, INITIAL_HEIGHT),
-        "pending_screen_mode": (INITIAL_WIDTH, INITIAL_HEIGHT),
+        "screen_mode": window.get_size(),
+        "pending_screen_mode": window.get_size(),
         "campaign_board": None,
+        "campaign_level": 1,
+        "campaign_grid_size": campaign_level_config(1)[0],
         "campaign_score": 0,
-        "campaign_target_score": 10000,
+        "campaign_target_score": campaign_level_config(1)[1],
         "campaign_level_complete": False,
         "campaign_selected_tile": None,
         "campaign_is_processing": False,
-        "campaign_grid_rect": campaign_grid_rect,
-        "campaign_cell_size": campaign_board_size / CAMPAIGN_GRID_SIZE,
         "campaign_board_state": "idle",
         "campaign_matched_tiles": [],
         "campaign_falling_tiles": [],
         "campaign_refilling_tiles": [],
-        "campaign_clear_progress": 0.0,
+        "campaign_clear_tween": None,
+        "campaign_dirty_cells": set(),
+        "campaign_tweens": TweenScheduler(),
         "campaign_is_swapping": False,
         "campaign_swap_anim": None,
         "campaign_drag_start_pos": None,
         "campaign_drag_start_tile": None,
         "campaign_is_dragging_tile": False,
+        "campaign_demo": False,
+        "campaign_demo_wait": 0.0,
+        "campaign_bot": None,
     }
+    # Ключи раскладываются по разделам контекста; доступ по ключу сохраняется
+    game_state = GameContext(game_state)
 
     state_manager = StateManager()
     state_manager.add_state("profile_menu", ProfileMenuState())
@@ -203,6 +221,13 @@ def init_game():
     state_manager.add_state("slingshot", SlingshotState())
 
     game_state["state_manager"] = state_manager
+    update_viewport(game_state)
+    update_campaign_layout(game_state)
+    game_state["level_pool"] = LevelPool()
+    game_state["persistence"] = PersistenceService()
+    game_state["telemetry"] = TelemetryWriter()
+    game_state["music"] = MusicPlayer(sounds.get("music_playlist", []))
+    game_state["sfx"] = SfxMixer(sounds)
     state_manager.change_state("profile_menu", game_state)
 
     reset_game(game_state)
@@ -215,25 +240,37 @@ def init_game():
 def main():
     game_state = init_game()
     sm = game_state["state_manager"]
-    clock = game_state["clock"]
+    governor = FrameGovernor(game_state["clock"])
+    had_events = False
 
     while sm.running:
-        dt = clock.tick(60) / 1000.0
+        dt = governor.tick(
+            had_events or sm.current_state.is_animating(game_state),
+            game_state["frame_cap"],
+        )
         # Ограничение delta time предотвращает "взрывы" физики PyMunk при лагах или перемещении окна
         dt = min(dt, 0.05)
-        mx, my = pygame.mouse.get_pos()
+        mx, my = window_to_logical(game_state, pygame.mouse.get_pos())
 
-        for event in pygame.event.get():
+        events = governor.events()
+        had_events = bool(events)
+        for event in events:
             if event.type == pygame.QUIT:
                 sm.running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                game_state["show_memory_overlay"] = not game_state[
+                    "show_memory_overlay"
+                ]
             elif event.type == MUSIC_END_EVENT:
-                new_track_index = (game_state["current_music_track_index"] + 1) % len(
-                    game_state["sounds"]["music_playlist"]
-                )
-                play_music_track(game_state, new_track_index)
+                game_state["current_music_track_index"] = game_state[
+                    "music"
+                ].on_track_end()
             else:
                 sm.current_state.handle_event(event, mx, my, game_state)
 
+        game_state["music"].update()
+        finish_screen_switch(game_state)
+        game_state["assets"].poll()
         sm.current_state.update(dt, mx, my, game_state)
         sm.current_state.draw(game_state["screen"], mx, my, game_state)
 
@@ -262,22 +299,29 @@ def main():
         elif game_state.get("achievement_text"):
             game_state["achievement_text"] = ""
 
+        if game_state["show_memory_overlay"]:
+            report = game_state["assets"].report()
+            font = game_state["fonts"]["info_font"]
+            for i, line in enumerate(format_report(report)):
+                text_surf, text_rect = draw_text(line, font, (255, 255, 0))
+                text_rect.topleft = (10, 10 + i * font.get_linesize())
+                game_state["screen"].blit(text_surf, text_rect)
+
         if game_state["images"].get("cursor_img"):
             game_state["screen"].blit(game_state["images"]["cursor_img"], (mx, my))
 
-        pygame.display.flip()
+        present_frame(game_state)
 
-    user_settings = {
-        "audio": {
-            "music_volume": game_state["music_volume"],
-            "sfx_volume": game_state["sfx_volume"],
-        },
-        "display": {"brightness": game_state["brightness_slider_pos"]},
-        "language": game_state["language"],
-    }
-    save_user_settings(user_settings)
-    save_last_profile_name(game_state["current_profile"])
-    save_all_profiles_data(game_state["all_profiles_data"])
+    persist_user_settings(game_state)
+    persist_last_profile(game_state)
+    game_state["persistence"].submit(
+        "all_profiles", save_all_profiles_data, game_state["all_profiles_data"]
+    )
+    game_state["persistence"].shutdown()
+    game_state["telemetry"].close()
+    game_state["music"].close()
+    if game_state["campaign_bot"] is not None:
+        game_state["campaign_bot"].close()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,202 @@
+# match3_board.py
+
+"""Логика доски режима 'Прохождение' без зависимости от pygame.
+
+Доска — список строк, в клетке номер типа птицы или None. Поиск
+совпадений принимает набор измененных ("грязных") клеток и проверяет
+только линии и квадраты 2x2, которые их касаются, поэтому цена шага
+каскада зависит от числа изменений, а не от площади доски. Это верно,
+пока доска между шагами стабильна: совпадение, в котором нет ни одной
+измененной клетки, было бы найдено еще на прошлом шаге.
+"""
+
+import random
+
+SCORE_MAP = {3: 30, 4: 50, 5: 100, 6: 300, 7: 1000}
+SQUARE_SCORE = 50
+
+
+def all_cells(board):
+    return [(r, c) for r in range(len(board)) for c in range(len(board[0]))]
+
+
+def generate_board(rows, cols, types_count, rng=random):
+    """Случайная доска без готовых совпадений; строится за один проход."""
+    board = [[None] * cols for _ in range(rows)]
+    for r in range(rows):
+        for c in range(cols):
+            banned = set()
+            if c >= 2 and board[r][c - 1] == board[r][c - 2]:
+                banned.add(board[r][c - 1])
+            if r >= 2 and board[r - 1][c] == board[r - 2][c]:
+                banned.add(board[r - 1][c])
+            if (
+                r >= 1
+                and c >= 1
+                and board[r][c - 1] == board[r - 1][c] == board[r - 1][c - 1]
+            ):
+                banned.add(board[r][c - 1])
+            choices = [t for t in range(types_count) if t not in banned]
+            board[r][c] = rng.choice(choices or range(types_count))
+    return board
+
+
+def find_matches(board, cells=None, squares=True):
+    """Очки и совпавшие клетки среди линий и квадратов, касающихся cells.
+
+    cells=None — проверка всей доски. Линия считается целиком (от края до
+    края одинаковых плиток), квадрат 2x2 засчитывается, только если не
+    пересекается с уже найденными совпадениями.
+    """
+    rows, cols = len(board), len(board[0])
+    if cells is None:
+        cells = all_cells(board)
+    score, matched = 0, set()
+    # Клетки уже проверенных линий: повторно от них линия не ищется
+    seen_rows, seen_cols = set(), set()
+
+    for r, c in cells:
+        tile = board[r][c]
+        if tile is None:
+            continue
+        if (r, c) not in seen_rows:
+            row = board[r]
+            c0 = c
+            while c0 > 0 and row[c0 - 1] == tile:
+                c0 -= 1
+            c1 = c
+            while c1 < cols - 1 and row[c1 + 1] == tile:
+                c1 += 1
+            if c1 > c0:
+                run = [(r, i) for i in range(c0, c1 + 1)]
+                seen_rows.update(run)
+                if c1 - c0 >= 2:
+                    score += SCORE_MAP.get(c1 - c0 + 1, 1000)
+                    matched.update(run)
+
+        if (r, c) not in seen_cols:
+            r0 = r
+            while r0 > 0 and board[r0 - 1][c] == tile:
+                r0 -= 1
+            r1 = r
+            while r1 < rows - 1 and board[r1 + 1][c] == tile:
+                r1 += 1
+            if r1 > r0:
+                run = [(i, c) for i in range(r0, r1 + 1)]
+                seen_cols.update(run)
+                if r1 - r0 >= 2:
+                    score += SCORE_MAP.get(r1 - r0 + 1, 1000)
+                    matched.update(run)
+
+    if squares:
+        # Левые верхние углы квадратов 2x2 из одинаковых плиток, в которые
+        # входит хотя бы одна из клеток
+        corners = set()
+        for r, c in cells:
+            tile = board[r][c]
+            if tile is None:
+                continue
+            for r2 in (r - 1, r + 1):
+                if not 0 <= r2 < rows or board[r2][c] != tile:
+                    continue
+                for c2 in (c - 1, c + 1):
+                    if 0 <= c2 < cols and board[r][c2] == tile == board[r2][c2]:
+                        corners.add((min(r, r2), min(c, c2)))
+        for r, c in sorted(corners):
+            sq = {(r, c), (r + 1, c), (r, c + 1), (r + 1, c + 1)}
+            if not sq & matched:
+                score += SQUARE_SCORE
+                matched |= sq
+
+    return score, list(matched)
+
+
+def has_line_at(board, r, c):
+    """Проходит ли через клетку линия из 3+ одинаковых плиток."""
+    tile = board[r][c]
+    if tile is None:
+        return False
+    row = board[r]
+    cols = len(row)
+    left = c
+    while left > 0 and row[left - 1] == tile:
+        left -= 1
+    right = c
+    while right < cols - 1 and row[right + 1] == tile:
+        right += 1
+    if right - left >= 2:
+        return True
+    top = r
+    while top > 0 and board[top - 1][c] == tile:
+        top -= 1
+    bottom = r
+    while bottom < len(board) - 1 and board[bottom + 1][c] == tile:
+        bottom += 1
+    return bottom - top >= 2
+
+
+def swap_makes_match(board, pos1, pos2):
+    """Дает ли обмен двух клеток линию из 3+ (квадраты обмен не засчитывают)."""
+    (r1, c1), (r2, c2) = pos1, pos2
+    board[r1][c1], board[r2][c2] = board[r2][c2], board[r1][c1]
+    matched = has_line_at(board, r1, c1) or has_line_at(board, r2, c2)
+    board[r1][c1], board[r2][c2] = board[r2][c2], board[r1][c1]
+    return matched
+
+
+def collapse(board, matched, types_count, rng=random):
+    """Убирает совпавшие плитки, роняет оставшиеся и досыпает новые сверху.
+
+    Возвращает набор измененных клеток для следующего find_matches.
+    """
+    for r, c in matched:
+        board[r][c] = None
+    dirty = set()
+    for c in {c for _, c in matched}:
+        # Столбец уплотняется снизу вверх, пустоты остаются сверху
+        write = len(board) - 1
+        for r in range(len(board) - 1, -1, -1):
+            tile = board[r][c]
+            if tile is not None:
+                if write != r:
+                    board[write][c] = tile
+                    board[r][c] = None
+                    dirty.add((write, c))
+                write -= 1
+        rand = rng.random
+        for r in range(write + 1):
+            # int(random() * n) заметно быстрее randrange в горячем цикле симуляции
+            board[r][c] = int(rand() * types_count)
+            dirty.add((r, c))
+    return dirty
+
+
+def resolve_cascade(board, dirty, types_count, rng=random):
+    """Разыгрывает каскад до стабильной доски; возвращает (очки, число шагов)."""
+    total, steps = 0, 0
+    while True:
+        score, matched = find_matches(board, dirty)
+        if not matched:
+            return total, steps
+        total += score
+        steps += 1
+        dirty = collapse(board, matched, types_count, rng)
+
+
+def legal_swaps(board):
+    """Все обмены соседних плиток, которые дают линию."""
+    rows, cols = len(board), len(board[0])
+    moves = []
+    for r in range(rows):
+        for c in range(cols):
+            for r2, c2 in ((r, c + 1), (r + 1, c)):
+                if (
+                    r2 < rows
+                    and c2 < cols
+                    and board[r][c] is not None
+                    and board[r2][c2] is not None
+                    and board[r][c] != board[r2][c2]
+                    and swap_makes_match(board, (r, c), (r2, c2))
+                ):
+                    moves.append(((r, c), (r2, c2)))
+    return moves
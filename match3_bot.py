@@ -0,0 +1,225 @@
+# match3_bot.py
+
+"""Бот для режима 'Прохождение': перебор ходов с ожиданием (expectimax).
+
+Для каждого допустимого обмена каскад разыгрывается несколько раз с
+разными случайными досыпаниями, и на глубину depth рекурсивно берется
+лучший следующий ход. Ходы первого уровня оцениваются параллельно в пуле
+процессов. Бот не зависит от pygame: его можно запускать из игры (режим
+демонстрации) и из консоли:
+
+    python match3_bot.py --size 9 --moves 30 --depth 2
+"""
+
+import argparse
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from match3_board import generate_board, legal_swaps, resolve_cascade
+
+DEFAULT_DEPTH = 2
+DEFAULT_SAMPLES = 3
+# Поиск демонстрации по размеру доски: (до размера, глубина, выборки).
+# Число ходов растет с площадью, а глубина 2 перебирает пары ходов: на 11x11
+# оценка занимает ~0.5 с процессора, на 16x16 — ~4 с, на 24x24 — больше 20 с
+DEMO_SEARCH = ((11, 2, 2), (20, 1, 4))
+DEMO_SEARCH_LARGE = (1, 2)
+
+
+def apply_swap(board, move, types_count, rng=random):
+    """Делает ход на доске и разыгрывает каскад; возвращает (очки, шаги)."""
+    (r1, c1), (r2, c2) = move
+    board[r1][c1], board[r2][c2] = board[r2][c2], board[r1][c1]
+    return resolve_cascade(board, {move[0], move[1]}, types_count, rng)
+
+
+def expected_score(board, move, depth, samples, types_count, rng):
+    """Средние очки хода с учетом лучших ответов на depth - 1 ходов вперед."""
+    total = 0.0
+    for _ in range(samples):
+        sample = [row[:] for row in board]
+        score, _ = apply_swap(sample, move, types_count, rng)
+        if depth > 1:
+            replies = legal_swaps(sample)
+            if replies:
+                score += max(
+                    expected_score(sample, m, depth - 1, samples, types_count, rng)
+                    for m in replies
+                )
+        total += score
+    return total / samples
+
+
+def demo_search(size):
+    """(глубина, выборки) бота демонстрации для доски size x size."""
+    for max_size, depth, samples in DEMO_SEARCH:
+        if size <= max_size:
+            return depth, samples
+    return DEMO_SEARCH_LARGE
+
+
+def _evaluate_root(board, move, depth, samples, types_count, seed):
+    # Точка входа для процессов пула: функция уровня модуля и свой генератор
+    return expected_score(board, move, depth, samples, types_count, random.Random(seed))
+
+
+class Match3Bot:
+    def __init__(
+        self, depth=DEFAULT_DEPTH, samples=DEFAULT_SAMPLES, workers=None, seed=None
+    ):
+        self.depth = depth
+        self.samples = samples
+        self.workers = workers
+        self.rng = random.Random(seed)
+        self.pool = None
+        self.pending = None  # [(ход, future)] текущего асинхронного запроса
+
+    def _pool(self):
+        if self.pool is None:
+            # Воркеры запускаются через spawn, как в level_generator.py: бот
+            # работает внутри игры, а fork из процесса с SDL и потоками небезопасен
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self.pool
+
+    def _drop_pool(self):
+        self.pending = None
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def _results(self, pending):
+        """Оценки ходов; если воркер умер, пул сбрасывается и BrokenProcessPool
+        уходит вызывающему."""
+        try:
+            return [(move, future.result()) for move, future in pending]
+        except BrokenProcessPool:
+            self._drop_pool()
+            raise
+
+    def _submit(self, board, types_count):
+        try:
+            return self._submit_to(self._pool(), board, types_count)
+        except BrokenProcessPool:
+            self._drop_pool()
+            raise
+
+    def _submit_to(self, pool, board, types_count):
+        return [
+            (
+                move,
+                pool.submit(
+                    _evaluate_root,
+                    board,
+                    move,
+                    self.depth,
+                    self.samples,
+                    types_count,
+                    self.rng.getrandbits(32),
+                ),
+            )
+            for move in legal_swaps(board)
+        ]
+
+    @staticmethod
+    def _best(results):
+        best_move, best_value = None, None
+        for move, value in results:
+            if best_value is None or value > best_value:
+                best_move, best_value = move, value
+        return best_move
+
+    def choose_move(self, board, types_count):
+        """Лучший ход или None, если ходов нет; блокирует до конца оценки."""
+        return self._best(self._results(self._submit(board, types_count)))
+
+    def request_move(self, board, types_count):
+        """Запускает оценку в фоне; результат забирается через poll()."""
+        self.cancel()
+        self.pending = self._submit([row[:] for row in board], types_count)
+
+    def poll(self):
+        """(готово, ход): ход None при готовом результате значит, что ходов нет."""
+        if self.pending is None or not all(f.done() for _, f in self.pending):
+            return False, None
+        move = self._best(self._results(self.pending))
+        self.pending = None
+        return True, move
+
+    def cancel(self):
+        if self.pending:
+            for _, future in self.pending:
+                future.cancel()
+        self.pending = None
+
+    def close(self):
+        self.cancel()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+
+def play_game(
+    size,
+    types_count,
+    moves,
+    target_score=None,
+    depth=DEFAULT_DEPTH,
+    samples=DEFAULT_SAMPLES,
+    seed=None,
+    bot=None,
+):
+    """Партия бота без графики; возвращает очки после каждого хода."""
+    rng = random.Random(seed)
+    own_bot = bot is None
+    if own_bot:
+        bot = Match3Bot(depth, samples, seed=rng.getrandbits(32))
+    board = generate_board(size, size, types_count, rng)
+    history, score = [], 0
+    try:
+        for _ in range(moves):
+            move = bot.choose_move(board, types_count)
+            if move is None:
+                break
+            gained, _ = apply_swap(board, move, types_count, rng)
+            score += gained
+            history.append(score)
+            if target_score is not None and score >= target_score:
+                break
+    finally:
+        if own_bot:
+            bot.close()
+    return history
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Партия бота в режиме 'Прохождение' без графики."
+    )
+    parser.add_argument("--size", type=int, default=7, help="размер доски")
+    parser.add_argument("--types", type=int, default=5, help="число типов плиток")
+    parser.add_argument("--moves", type=int, default=30, help="лимит ходов")
+    parser.add_argument("--target", type=int, help="остановиться на этих очках")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    history = play_game(
+        args.size,
+        args.types,
+        args.moves,
+        args.target,
+        args.depth,
+        args.samples,
+        args.seed,
+    )
+    print(f"ходов: {len(history)}, очки: {history[-1] if history else 0}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# match3_render.py
+
+"""Отрисовка доски режима 'Прохождение' слоями.
+
+Неподвижные плитки запечены в постоянную поверхность доски; за кадр в ней
+перерисовываются только клетки, содержимое которых изменилось с прошлого
+кадра. Анимированные плитки (обмен, перетаскивание, исчезновение, падение и
+досыпание) рисуются поверх слоя каждый кадр из заранее масштабированных
+изображений.
+"""
+
+import pygame
+
+BOARD_FILL = (0, 0, 0, 100)
+TILE_SCALE = 0.9
+CLEAR_STEPS = 12  # кадров уменьшения исчезающей плитки
+SELECTION_COLOR = (255, 255, 0, 200)
+
+
+class BoardRenderer:
+    def __init__(self):
+        self.layer = None
+        self.board = None  # доска, с которой снят слепок
+        self.baked = []  # слепок: что нарисовано в каждой клетке слоя
+        self.source = None  # список исходных изображений птиц
+        self.cell_size = None
+        self.tiles = {}  # (тип, прозрачность) -> масштабированная плитка
+        self.shrinking = {}  # (тип, шаг) -> уменьшенная полупрозрачная плитка
+        self.selection = None  # рамка выбранной клетки
+        self.texts = {}  # (текст, шрифт, цвет) -> поверхность
+
+    def _reset(self, board, bird_imgs, cell_size, size):
+        self.board, self.source, self.cell_size = board, bird_imgs, cell_size
+        self.tiles.clear()
+        self.shrinking.clear()
+        self.selection = None
+        self.layer = pygame.Surface(size, pygame.SRCALPHA)
+        self.layer.fill(BOARD_FILL)
+        self.baked = [[None] * len(board[0]) for _ in board]
+
+    def tile(self, tile_type, alpha=255):
+        key = (tile_type, alpha)
+        img = self.tiles.get(key)
+        if img is None:
+            side = int(self.cell_size * TILE_SCALE)
+            img = pygame.transform.scale(self.source[tile_type], (side, side))
+            if alpha < 255:
+                img.set_alpha(alpha)
+            self.tiles[key] = img
+        return img
+
+    def clearing_tile(self, tile_type, progress):
+        """Исчезающая плитка на доле анимации progress (0..1); кадры
+        уменьшения масштабируются один раз на CLEAR_STEPS шагов."""
+        step = min(CLEAR_STEPS - 1, int(progress * CLEAR_STEPS))
+        key = (tile_type, step)
+        img = self.shrinking.get(key)
+        if img is None:
+            k = 1.0 - step / CLEAR_STEPS
+            side = max(1, int(self.cell_size * TILE_SCALE * k))
+            img = pygame.transform.scale(self.source[tile_type], (side, side))
+            img.set_alpha(int(255 * k))
+            self.shrinking[key] = img
+        return img
+
+    def selection_frame(self):
+        """Полупрозрачная рамка выбранной клетки, как раньше на слое доски."""
+        if self.selection is None:
+            side = int(self.cell_size)
+            self.selection = pygame.Surface((side, side), pygame.SRCALPHA)
+            pygame.draw.rect(
+                self.selection,
+                SELECTION_COLOR,
+                (0, 0, side, side),
+                4,
+                border_radius=5,
+            )
+        return self.selection
+
+    def _cell_rect(self, r, c):
+        cs = self.cell_size
+        x, y = int(c * cs), int(r * cs)
+        return pygame.Rect(x, y, int((c + 1) * cs) - x, int((r + 1) * cs) - y)
+
+    def sync(self, board, hidden, bird_imgs, cell_size, size):
+        """Приводит слой к доске; клетки из hidden остаются пустыми (их рисуют поверх)."""
+        if (
+            board is not self.board
+            or bird_imgs is not self.source
+            or cell_size != self.cell_size
+            or self.layer.get_size() != size
+        ):
+            self._reset(board, bird_imgs, cell_size, size)
+        cs = self.cell_size
+        hidden_rows = {r for r, _ in hidden}
+        for r, row in enumerate(board):
+            baked = self.baked[r]
+            if r not in hidden_rows and baked == row:
+                continue
+            for c, tile_type in enumerate(row):
+                if (r, c) in hidden:
+                    tile_type = None
+                if baked[c] == tile_type:
+                    continue
+                baked[c] = tile_type
+                self.layer.fill(BOARD_FILL, self._cell_rect(r, c))
+                if tile_type is not None:
+                    img = self.tile(tile_type)
+                    self.layer.blit(
+                        img, img.get_rect(center=(c * cs + cs / 2, r * cs + cs / 2))
+                    )
+
+    def text(self, text, font, color):
+        key = (text, font, color)
+        surf = self.texts.get(key)
+        if surf is None:
+            if len(self.texts) > 32:
+                self.texts.clear()
+            surf = self.texts[key] = font.render(text, True, color)
+        return surf
@@ -0,0 +1,228 @@
+# match3_sim.py
+
+"""Пакетный симулятор режима 'Прохождение' для балансировки уровней.
+
+Партии играются без pygame по тем же правилам, что и в игре (поиск
+совпадений, падение и досыпание из match3_board), каждая со своим seed,
+поэтому результаты воспроизводимы. Партии раздаются пачками в пул
+процессов:
+
+    python match3_sim.py --size 7 9 12 --games 2000 --moves 30 --target 10000
+"""
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from match3_board import (
+    find_matches,
+    generate_board,
+    legal_swaps,
+    resolve_cascade,
+    swap_makes_match,
+)
+
+GAMES_PER_TASK = 50
+
+
+def random_move(board, rng):
+    """Первый допустимый обмен при обходе с случайной позиции; None — ходов нет."""
+    rows, cols = len(board), len(board[0])
+    horizontal = rows * (cols - 1)
+    total = horizontal + (rows - 1) * cols
+    start = rng.randrange(total)
+    for k in range(total):
+        i = (start + k) % total
+        if i < horizontal:
+            r, c = divmod(i, cols - 1)
+            r2, c2 = r, c + 1
+        else:
+            r, c = divmod(i - horizontal, cols)
+            r2, c2 = r + 1, c
+        if board[r][c] != board[r2][c2] and swap_makes_match(board, (r, c), (r2, c2)):
+            return (r, c), (r2, c2)
+    return None
+
+
+def greedy_move(board, rng):
+    """Обмен с наибольшими очками за первый шаг каскада."""
+    best, best_score = None, -1
+    for move in legal_swaps(board):
+        (r1, c1), (r2, c2) = move
+        board[r1][c1], board[r2][c2] = board[r2][c2], board[r1][c1]
+        score, _ = find_matches(board, move)
+        board[r1][c1], board[r2][c2] = board[r2][c2], board[r1][c1]
+        if score > best_score:
+            best, best_score = move, score
+    return best
+
+
+POLICIES = {"random": random_move, "greedy": greedy_move}
+
+
+def simulate_game(size, types_count, target_score, move_limit, policy, seed):
+    """Одна партия; словарь с очками, числом ходов и длинами каскадов."""
+    rng = random.Random(seed)
+    choose = POLICIES[policy]
+    board = generate_board(size, size, types_count, rng)
+    score, moves_to_target, shuffles = 0, None, 0
+    cascades = {}  # длина каскада (шагов) -> число ходов
+    for move_no in range(1, move_limit + 1):
+        move = choose(board, rng)
+        if move is None:
+            # Тупиковая доска: как и в демонстрации, берется новая
+            board = generate_board(size, size, types_count, rng)
+            shuffles += 1
+            move = choose(board, rng)
+            if move is None:
+                break
+        (r1, c1), (r2, c2) = move
+        board[r1][c1], board[r2][c2] = board[r2][c2], board[r1][c1]
+        gained, steps = resolve_cascade(board, set(move), types_count, rng)
+        score += gained
+        cascades[steps] = cascades.get(steps, 0) + 1
+        if moves_to_target is None and score >= target_score:
+            moves_to_target = move_no
+    return {
+        "score": score,
+        "moves_to_target": moves_to_target,
+        "cascades": cascades,
+        "shuffles": shuffles,
+    }
+
+
+def _run_games(config, seeds):
+    # Точка входа для процессов пула: пачка партий и затраченное время CPU
+    started = time.process_time()
+    results = [simulate_game(*config, seed) for seed in seeds]
+    return results, time.process_time() - started
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+class SimStats:
+    def __init__(self, size, types_count, target_score, move_limit, policy):
+        self.config = (size, types_count, target_score, move_limit, policy)
+        self.scores = []
+        self.moves_to_target = []  # только для партий, дошедших до цели
+        self.cascades = {}
+        self.moves = 0
+        self.shuffles = 0
+        self.cpu_time = 0.0
+
+    def add(self, result):
+        self.scores.append(result["score"])
+        if result["moves_to_target"] is not None:
+            self.moves_to_target.append(result["moves_to_target"])
+        for steps, count in result["cascades"].items():
+            self.cascades[steps] = self.cascades.get(steps, 0) + count
+            self.moves += count
+        self.shuffles += result["shuffles"]
+
+    def report(self):
+        size, types_count, target, limit, policy = self.config
+        games = len(self.scores)
+        scores, to_target = sorted(self.scores), sorted(self.moves_to_target)
+        lines = [
+            f"Доска {size}x{size}, типов {types_count}, цель {target}, "
+            f"ходов {limit}, стратегия {policy}: партий {games}"
+        ]
+        if not games:
+            return "\n".join(lines)
+        lines.append(
+            "  Очки: мин {} / p10 {} / медиана {} / p90 {} / макс {}, среднее {:.0f}".format(
+                scores[0],
+                _percentile(scores, 0.1),
+                _percentile(scores, 0.5),
+                _percentile(scores, 0.9),
+                scores[-1],
+                sum(scores) / games,
+            )
+        )
+        lines.append(f"  Цель достигнута: {len(to_target) / games:.1%}")
+        if to_target:
+            lines.append(
+                "  Ходов до цели: p10 {} / медиана {} / p90 {}".format(
+                    _percentile(to_target, 0.1),
+                    _percentile(to_target, 0.5),
+                    _percentile(to_target, 0.9),
+                )
+            )
+        lines.append("  Длина каскада (шагов за ход):")
+        peak = max(self.cascades.values(), default=1)
+        for steps in sorted(self.cascades):
+            count = self.cascades[steps]
+            bar = "#" * int(40 * count / peak)
+            lines.append(f"    {steps:>3} {count:>9} {count / self.moves:6.1%} {bar}")
+        if self.shuffles:
+            lines.append(f"  Тупиковых досок: {self.shuffles}")
+        if self.cpu_time > 0:
+            lines.append(
+                f"  Скорость: {self.moves / self.cpu_time:.0f} ходов/с на ядро"
+            )
+        return "\n".join(lines)
+
+
+def run_batch(configs, games, seed=0, workers=None):
+    """Прогоняет games партий для каждой конфигурации; список SimStats.
+
+    Конфигурация — (размер, типов, цель, лимит ходов, стратегия).
+    """
+    all_stats = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = []
+        for n, config in enumerate(configs):
+            stats = SimStats(*config)
+            all_stats.append(stats)
+            # Seed партии зависит только от общего seed, номера конфигурации и партии
+            seeds = [(seed, n, i) for i in range(games)]
+            for start in range(0, games, GAMES_PER_TASK):
+                chunk = [hash(s) for s in seeds[start : start + GAMES_PER_TASK]]
+                jobs.append((stats, pool.submit(_run_games, config, chunk)))
+        for stats, job in jobs:
+            results, cpu_time = job.result()
+            for result in results:
+                stats.add(result)
+            stats.cpu_time += cpu_time
+    return all_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Пакетная симуляция режима 'Прохождение' без графики."
+    )
+    parser.add_argument(
+        "--size", type=int, nargs="+", default=[7], help="размеры доски"
+    )
+    parser.add_argument("--types", type=int, default=5, help="число типов плиток")
+    parser.add_argument("--target", type=int, default=10000, help="цель по очкам")
+    parser.add_argument("--moves", type=int, default=30, help="лимит ходов")
+    parser.add_argument(
+        "--games", type=int, default=1000, help="партий на конфигурацию"
+    )
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    configs = [
+        (size, args.types, args.target, args.moves, args.policy) for size in args.size
+    ]
+    started = time.perf_counter()
+    all_stats = run_batch(configs, args.games, args.seed, args.workers)
+    elapsed = time.perf_counter() - started
+    for stats in all_stats:
+        print(stats.report())
+        print()
+    total = sum(stats.moves for stats in all_stats)
+    print(f"Всего ходов: {total} за {elapsed:.1f} с ({total / elapsed:.0f} ходов/с)")
+
+
+if __name__ == "__main__":
+    main()
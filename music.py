@@ -0,0 +1,156 @@
+# music.py
+
+"""Фоновая музыка без подвисаний при смене трека.
+
+Соседние треки плейлиста заранее читаются в память фоновым потоком, а
+следующий трек ставится в mixer.music.queue, поэтому по окончании трека
+SDL_mixer переключается сам, без паузы и без работы в игровом цикле.
+"""
+
+import io
+import os
+import queue
+import threading
+import time
+
+import pygame
+
+SWITCH_HISTORY = 20
+
+
+class MusicPlayer:
+    def __init__(self, playlist):
+        self.playlist = list(playlist)
+        self.index = None
+        self.stream = None  # BytesIO играющего трека: SDL читает его по ходу
+        self.queued = None  # (индекс, BytesIO, начало, конец постановки в очередь)
+        self.data = {}  # индекс -> содержимое файла
+        self.unavailable = set()
+        self.lock = threading.Lock()
+        self.requests = queue.Queue()
+        self.switch_times = []  # последние переключения, мс
+        self.thread = threading.Thread(target=self._run, name="music", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            index = self.requests.get()
+            if index is None:
+                return
+            with self.lock:
+                if index in self.data or index in self.unavailable:
+                    continue
+            try:
+                with open(self.playlist[index], "rb") as f:
+                    data = f.read()
+            except (IOError, OSError):
+                with self.lock:
+                    self.unavailable.add(index)
+                continue
+            with self.lock:
+                self.data[index] = data
+
+    def _neighbours(self, index):
+        n = len(self.playlist)
+        return (index + 1) % n, (index - 1) % n
+
+    def _prefetch_around(self, index):
+        keep = {index, *self._neighbours(index)}
+        with self.lock:
+            for i in [i for i in self.data if i not in keep]:
+                del self.data[i]
+        for i in self._neighbours(index):
+            self.requests.put(i)
+
+    def _namehint(self, index):
+        # Формат для SDL_mixer: при загрузке из памяти имени файла нет
+        return os.path.splitext(self.playlist[index])[1].lstrip(".")
+
+    def _open(self, index):
+        """Поток трека из памяти; если предзагрузка не успела — читает файл сразу."""
+        with self.lock:
+            data = self.data.get(index)
+            if index in self.unavailable:
+                return None
+        if data is None:
+            try:
+                with open(self.playlist[index], "rb") as f:
+                    data = f.read()
+            except (IOError, OSError):
+                with self.lock:
+                    self.unavailable.add(index)
+                return None
+        return io.BytesIO(data)
+
+    def _record_switch(self, started, finished):
+        self.switch_times.append((finished - started) * 1000.0)
+        del self.switch_times[:-SWITCH_HISTORY]
+
+    def play(self, index, step=1):
+        """Запускает трек index (или ближайший доступный в направлении step)."""
+        if not self.playlist:
+            return index
+        started = time.perf_counter()
+        for attempt in range(len(self.playlist)):
+            candidate = (index + attempt * step) % len(self.playlist)
+            stream = self._open(candidate)
+            if stream is None:
+                continue
+            try:
+                pygame.mixer.music.load(stream, self._namehint(candidate))
+                pygame.mixer.music.play()
+            except pygame.error:
+                with self.lock:
+                    self.unavailable.add(candidate)
+                continue
+            self.index, self.stream, self.queued = candidate, stream, None
+            self._record_switch(started, time.perf_counter())
+            self._prefetch_around(candidate)
+            return candidate
+        return index
+
+    def update(self):
+        """Ставит следующий трек в очередь микшера, как только он прочитан."""
+        if self.index is None or self.queued is not None or len(self.playlist) < 2:
+            return
+        nxt = self._neighbours(self.index)[0]
+        with self.lock:
+            ready = nxt in self.data
+            skip = nxt in self.unavailable
+        if skip:
+            # Недоступный трек не ставится в очередь, он пропустится в on_track_end
+            return
+        if ready:
+            started = time.perf_counter()
+            stream = self._open(nxt)
+            try:
+                pygame.mixer.music.queue(stream, self._namehint(nxt))
+            except pygame.error:
+                with self.lock:
+                    self.unavailable.add(nxt)
+                return
+            self.queued = (nxt, stream, started, time.perf_counter())
+
+    def on_track_end(self):
+        """Обработка MUSIC_END_EVENT; возвращает индекс играющего трека."""
+        if self.index is None:
+            return self.play(0)
+        if self.queued is not None:
+            # Микшер уже переключился на трек из очереди без паузы; время
+            # переключения — это работа главного потока при постановке в очередь
+            self.index, self.stream, started, finished = self.queued
+            self.queued = None
+            self._record_switch(started, finished)
+            self._prefetch_around(self.index)
+            return self.index
+        if pygame.mixer.music.get_busy():
+            # Событие от остановки прежнего трека при ручном переключении
+            return self.index
+        return self.play(self._neighbours(self.index)[0])
+
+    def last_switch_ms(self):
+        return self.switch_times[-1] if self.switch_times else None
+
+    def close(self):
+        self.requests.put(None)
+        self.thread.join()
@@ -0,0 +1,91 @@
+# parallax.py
+
+"""Фон рогатки из двух слоев с параллаксом.
+
+Дальний слой (небо, облака, холмы) склеивается в горизонтальную ленту из
+двух плиток, поэтому любой сдвиг — это один blit участка ленты; выше ленты
+фон заливается цветом неба. Ближний
+слой (рогатка) обрезается до непрозрачной части. Слои сдвигаются камерой и
+тряской экрана с разной скоростью. Пока сдвиги не меняются, кадр фона
+собирается один раз и рисуется одним blit, как прежний цельный фон.
+"""
+
+import pygame
+
+FAR_RATE = 0.5  # доля сдвига камеры и тряски для дальнего слоя
+NEAR_RATE = 1.0
+# Сдвиг дальнего слоя от левого края кадра в долях ширины кадра: холмы
+# относительно рогатки стоят там же, где в собранном background.jpg
+FAR_PHASE = -0.32
+
+
+class ParallaxBackground:
+    def __init__(self):
+        self.far = None  # исходные (масштабированные) изображения слоев
+        self.near = None
+        self.size = None
+        self.strip = None
+        self.tile_width = 0
+        self.sky = (0, 0, 0)
+        self.near_crop = None
+        self.near_pos = (0, 0)
+        self.far_left = 0
+        self.far_top = 0
+        self.cache = None
+        self.cache_key = None
+        self.last_key = None
+
+    def _reset(self, far, near, size):
+        self.far, self.near, self.size = far, near, size
+        width, height = size
+        # Кадр фона покрывает экран по центру, как "cover" в settings.py
+        frame = near.get_rect(center=(width // 2, height // 2))
+        self.tile_width = far.get_width()
+        self.strip = pygame.Surface((self.tile_width * 2, far.get_height())).convert()
+        self.strip.blit(far, (0, 0))
+        self.strip.blit(far, (self.tile_width, 0))
+        self.sky = far.get_at((0, 0))[:3]
+        self.far_left = frame.left + int(frame.width * FAR_PHASE)
+        self.far_top = frame.top
+        crop = near.get_bounding_rect()
+        self.near_crop = near.subsurface(crop)
+        self.near_pos = (frame.left + crop.x, frame.top + crop.y)
+        self.cache = None
+        self.cache_key = None
+
+    def _compose(self, surface, key):
+        (far_x, far_y), (near_x, near_y) = key
+        top = self.far_top + far_y
+        if top > 0:
+            surface.fill(self.sky, (0, 0, self.size[0], top))
+        phase = (-(self.far_left + far_x)) % self.tile_width
+        surface.blit(
+            self.strip,
+            (0, top),
+            pygame.Rect(phase, 0, self.size[0], self.strip.get_height()),
+        )
+        surface.blit(
+            self.near_crop, (self.near_pos[0] + near_x, self.near_pos[1] + near_y)
+        )
+
+    def draw(self, screen, far, near, camera=(0, 0), shake=(0, 0)):
+        """Рисует фон; camera — смещение камеры, shake — тряска экрана."""
+        size = screen.get_size()
+        if far is not self.far or near is not self.near or size != self.size:
+            self._reset(far, near, size)
+        dx, dy = shake[0] - camera[0], shake[1] - camera[1]
+        key = (
+            (round(dx * FAR_RATE), round(dy * FAR_RATE)),
+            (round(dx * NEAR_RATE), round(dy * NEAR_RATE)),
+        )
+        if key != self.cache_key and key == self.last_key:
+            # Сдвиг держится второй кадр подряд: кадр фона кэшируется
+            if self.cache is None:
+                self.cache = pygame.Surface(size).convert()
+            self._compose(self.cache, key)
+            self.cache_key = key
+        self.last_key = key
+        if key == self.cache_key:
+            screen.blit(self.cache, (0, 0))
+        else:
+            self._compose(screen, key)
@@ -0,0 +1,95 @@
+# persistence.py
+
+"""Фоновая запись настроек и профилей.
+
+Записи ставятся в очередь по ключу: повторная запись с тем же ключом в
+пределах окна debounce заменяет предыдущую, поэтому перетаскивание
+ползунка громкости дает одну запись на диск, а не запись на каждый кадр.
+"""
+
+import threading
+import time
+
+DEBOUNCE_SECONDS = 0.5
+
+
+class PersistenceService:
+    def __init__(self, debounce=DEBOUNCE_SECONDS):
+        self.debounce = debounce
+        self.pending = {}  # ключ -> (время записи, функция, аргументы)
+        self.active = 0
+        self.flushing = 0
+        self.running = True
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="persistence", daemon=True)
+        self.thread.start()
+
+    def submit(self, key, fn, *args):
+        """Ставит запись в очередь, заменяя еще не выполненную запись с тем же ключом."""
+        with self.cond:
+            if not self.running:
+                fn(*args)
+                return
+            self.pending[key] = (time.monotonic() + self.debounce, fn, args)
+            self.cond.notify_all()
+
+    def _take_due(self):
+        now = time.monotonic()
+        hurry = self.flushing or not self.running
+        due = sorted(
+            (item for item in self.pending.items() if hurry or item[1][0] <= now),
+            key=lambda item: item[1][0],
+        )
+        for key, _ in due:
+            del self.pending[key]
+        return [(fn, args) for _, (_, fn, args) in due]
+
+    def _run(self):
+        while True:
+            with self.cond:
+                jobs = self._take_due()
+                while not jobs:
+                    if not self.running and not self.pending:
+                        return
+                    timeout = None
+                    if self.pending:
+                        timeout = max(0.0, min(t for t, _, _ in self.pending.values()) - time.monotonic())
+                    self.cond.wait(timeout)
+                    jobs = self._take_due()
+                self.active += len(jobs)
+
+            for fn, args in jobs:
+                try:
+                    fn(*args)
+                except Exception as e:
+                    print(f"Ошибка фоновой записи: {e}")
+
+            with self.cond:
+                self.active -= len(jobs)
+                self.cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Немедленно выполняет все отложенные записи и ждет их завершения."""
+        with self.cond:
+            self.flushing += 1
+            self.cond.notify_all()
+            try:
+                return self.cond.wait_for(lambda: not self.pending and self.active == 0, timeout)
+            finally:
+                self.flushing -= 1
+
+    def shutdown(self):
+        self.flush()
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        self.thread.join()
+
+
+def submit_write(game_state, key, fn, *args):
+    """Записывает через сервис из game_state или сразу, если сервиса нет."""
+    service = game_state.get("persistence")
+    if service is None:
+        fn(*args)
+    else:
+        service.submit(key, fn, *args)
@@ -0,0 +1,127 @@
+# profile_store.py
+
+"""Хранилище профилей на sqlite3 в режиме WAL.
+
+Каждое достижение хранится отдельной строкой, поэтому обновление одного
+рекорда — это один UPSERT в транзакции, а не перезапись всего файла.
+При первом запуске данные один раз переносятся из profiles.json.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+PROFILES_DB_FILE = "profiles.db"
+
+
+class ProfileStore:
+    def __init__(self, path=PROFILES_DB_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        # isolation_level=None: транзакции открываются явно через BEGIN
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS profiles (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS achievements (
+                profile TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value,
+                PRIMARY KEY (profile, key)
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            """
+        )
+
+    def _transaction(self, fn, *args):
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                fn(*args)
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def _upsert_profile(self, name, data):
+        self.conn.execute("INSERT OR IGNORE INTO profiles (name) VALUES (?)", (name,))
+        self.conn.executemany(
+            "INSERT INTO achievements (profile, key, value) VALUES (?, ?, ?) "
+            "ON CONFLICT (profile, key) DO UPDATE SET value = excluded.value",
+            [(name, key, value) for key, value in data.items()],
+        )
+
+    def _delete_profile(self, name):
+        self.conn.execute("DELETE FROM achievements WHERE profile = ?", (name,))
+        self.conn.execute("DELETE FROM profiles WHERE name = ?", (name,))
+
+    def migrate_from_json(self, json_path):
+        """Однократно переносит профили из JSON-файла, если он есть."""
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+        if row is not None:
+            return False
+        data = {}
+        if os.path.exists(json_path):
+            try:
+                with open(json_path, "r") as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Ошибка чтения {json_path} при переносе профилей: {e}")
+
+        def migrate():
+            for name, achievements in data.items():
+                self._upsert_profile(name, achievements)
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', ?)", (json_path,))
+
+        self._transaction(migrate)
+        return True
+
+    def load_all(self):
+        with self.lock:
+            profiles = {name: {} for (name,) in self.conn.execute("SELECT name FROM profiles ORDER BY id")}
+            for name, key, value in self.conn.execute("SELECT profile, key, value FROM achievements"):
+                if name in profiles:
+                    profiles[name][key] = value
+        return profiles
+
+    def set_value(self, name, key, value):
+        self._transaction(self._upsert_profile, name, {key: value})
+
+    def save_profile(self, name, data):
+        """Полностью заменяет данные профиля."""
+
+        def save():
+            self.conn.execute("DELETE FROM achievements WHERE profile = ?", (name,))
+            self._upsert_profile(name, data)
+
+        self._transaction(save)
+
+    def delete_profile(self, name):
+        self._transaction(self._delete_profile, name)
+
+    def replace_all(self, profiles_data):
+        """Синхронизирует хранилище со словарем профилей одной транзакцией."""
+
+        def replace():
+            stored = [name for (name,) in self.conn.execute("SELECT name FROM profiles")]
+            for name in stored:
+                if name not in profiles_data:
+                    self._delete_profile(name)
+            for name, data in profiles_data.items():
+                self._upsert_profile(name, data)
+
+        self._transaction(replace)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
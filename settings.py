@@ -1,6 +1,9 @@
 import pygame
 import os
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 
 pygame.init()
 
@@ -27,102 +30,192 @@ def scale_to_cover(image, screen_width, screen_height):
     return pygame.transform.scale(image, (new_width, new_height))
 
 
-def load_images(width, height, ui_scale, game_scale):
-    try:
-        bird_size = int(50 * game_scale)
-        small_bird_size = int(25 * game_scale)
-        icon_size = int(40 * ui_scale)
-        lightbulb_w, lightbulb_h = int(60 * ui_scale), int(40 * ui_scale)
+# Общий бюджет ресурсов (изображения, их исходники и звуки), см. assets.py.
+# Все декодированные исходники занимают около 157 МБ (значки и птицы — до
+# 2636x1672), масштабированные ресурсы и звуки — около 45 МБ на 1920x1080
+ASSET_MEMORY_BUDGET = 256 * 1024 * 1024
+# Исходники — часть общего бюджета; остаток под масштабированные ресурсы и звуки
+IMAGE_SOURCE_BUDGET = ASSET_MEMORY_BUDGET - 64 * 1024 * 1024
 
-        orig_menu_background = pygame.image.load("menu_background.jpg")
-        orig_background = pygame.image.load("background.jpg")
 
-        menu_background = scale_to_cover(orig_menu_background, width, height)
-        background = scale_to_cover(orig_background, width, height)
+class SourceImageCache:
+    """Декодированные исходные изображения с LRU-вытеснением по объему памяти.
 
-        cursor_img = pygame.image.load("cursor.png").convert_alpha()
+    При смене разрешения ресурсы пересчитываются из этих исходников без
+    повторного чтения и декодирования файлов.
+    """
 
-        bird_imgs = [
-            pygame.transform.scale(
-                pygame.image.load(f"bird{i}.png").convert_alpha(),
-                (bird_size, bird_size),
-            )
-            for i in range(1, 6)
-        ]
+    def __init__(self, budget=IMAGE_SOURCE_BUDGET):
+        self.budget = budget
+        self.entries = OrderedDict()  # (файл, alpha) -> (поверхность, байты)
+        self.total = 0
+        self.pinned = frozenset()  # файлы, которые trim не вытесняет
+        self.lock = threading.Lock()
 
-        feather_imgs = [
-            pygame.transform.scale(
-                pygame.image.load(f"feather{i}.png").convert_alpha(),
-                (int(20 * game_scale), int(20 * game_scale)),
-            )
-            for i in range(1, 6)
-        ]
+    def get(self, filename, alpha=True):
+        key = (filename, alpha)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry[0]
+        image = pygame.image.load(filename)
+        if alpha:
+            image = image.convert_alpha()
+        nbytes = image.get_pitch() * image.get_height()
+        with self.lock:
+            if key not in self.entries:
+                self.entries[key] = (image, nbytes)
+                self.total += nbytes
+        self.trim(self.budget, keep=1)
+        return image
 
-        small_bird_img = pygame.transform.scale(
-            pygame.image.load("bird4_small.png").convert_alpha(),
-            (small_bird_size, small_bird_size),
-        )
-        target_img = pygame.transform.scale(
-            pygame.image.load("target.png").convert_alpha(), (bird_size, bird_size)
-        )
+    def pin(self, filenames):
+        """Исходники загруженных ресурсов: без них смена разрешения снова
+        декодирует файлы."""
+        with self.lock:
+            self.pinned = frozenset(filenames)
 
-        target_defeated_img = pygame.transform.scale(
-            pygame.image.load("target_defeated.png").convert_alpha(),
-            (bird_size, bird_size),
-        )
+    def trim(self, budget, keep=0):
+        """Вытесняет давние незакрепленные исходники, пока объем больше budget."""
+        with self.lock:
+            for key in list(self.entries):
+                if self.total <= budget or len(self.entries) <= keep:
+                    break
+                if key[0] not in self.pinned:
+                    self.total -= self.entries.pop(key)[1]
 
-        brick_img = pygame.transform.scale(
-            pygame.image.load("brick.png").convert_alpha(), (bird_size, bird_size)
-        )
+    def discard(self, filename):
+        with self.lock:
+            for key in [k for k in self.entries if k[0] == filename]:
+                self.total -= self.entries.pop(key)[1]
 
-        speaker_on_img = pygame.transform.scale(
-            pygame.image.load("speaker_on.png").convert_alpha(), (icon_size, icon_size)
-        )
-        speaker_off_img = pygame.transform.scale(
-            pygame.image.load("speaker_off.png").convert_alpha(), (icon_size, icon_size)
-        )
-        pause_img = pygame.transform.scale(
-            pygame.image.load("pause.png").convert_alpha(), (icon_size, icon_size)
-        )
-        resume_img = pygame.transform.scale(
-            pygame.image.load("play.png").convert_alpha(), (icon_size, icon_size)
-        )
-        lightbulb_img = pygame.transform.scale(
-            pygame.image.load("lightbulb.png").convert_alpha(),
-            (lightbulb_w, lightbulb_h),
-        )
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total = 0
 
-        smoke_img = pygame.transform.scale(
-            pygame.image.load("smoke.png").convert_alpha(),
+
+source_images = SourceImageCache()
+_rescale_pool = ThreadPoolExecutor(
+    max_workers=max(2, min(4, os.cpu_count() or 1)), thread_name_prefix="rescale"
+)
+
+
+def image_specs(width, height, ui_scale, game_scale):
+    """(ключ, файл, alpha, размер): размер None — без масштабирования,
+    ("cover", w, h) — покрыть экран с сохранением пропорций, ("width", w) —
+    ширина w с сохранением пропорций."""
+    bird_size = int(50 * game_scale)
+    small_bird_size = int(25 * game_scale)
+    feather_size = int(20 * game_scale)
+    icon_size = int(40 * ui_scale)
+    smoke_size = int(EXPLOSION_RADIUS * 2 * game_scale)
+    # Кадр фона 4:3 (background.jpg, background_near.png) в режиме "cover";
+    # дальний слой в нем крупнее кадра, как в собранном background.jpg
+    frame_width = max(width, int(height * 4 / 3))
+    specs = [
+        ("menu_background", "menu_background.jpg", False, ("cover", width, height)),
+        ("background", "background.jpg", False, ("cover", width, height)),
+        (
+            "background_far",
+            "background_far.png",
+            False,
+            ("width", int(frame_width * 1.32)),
+        ),
+        ("background_near", "background_near.png", True, ("cover", width, height)),
+        ("cursor_img", "cursor.png", True, None),
+        ("small_bird_img", "bird4_small.png", True, (small_bird_size, small_bird_size)),
+        ("target_img", "target.png", True, (bird_size, bird_size)),
+        ("target_defeated_img", "target_defeated.png", True, (bird_size, bird_size)),
+        ("brick_img", "brick.png", True, (bird_size, bird_size)),
+        ("speaker_on_img", "speaker_on.png", True, (icon_size, icon_size)),
+        ("speaker_off_img", "speaker_off.png", True, (icon_size, icon_size)),
+        ("pause_img", "pause.png", True, (icon_size, icon_size)),
+        ("resume_img", "play.png", True, (icon_size, icon_size)),
+        ("smoke_img", "smoke.png", True, (smoke_size, smoke_size)),
+        (
+            "lightbulb_img",
+            "lightbulb.png",
+            True,
+            (int(60 * ui_scale), int(40 * ui_scale)),
+        ),
+    ]
+    for i in range(5):
+        specs.append(
+            (("bird_imgs", i), f"bird{i + 1}.png", True, (bird_size, bird_size))
+        )
+        specs.append(
             (
-                int(EXPLOSION_RADIUS * 2 * game_scale),
-                int(EXPLOSION_RADIUS * 2 * game_scale),
-            ),
+                ("feather_imgs", i),
+                f"feather{i + 1}.png",
+                True,
+                (feather_size, feather_size),
+            )
         )
+    return specs
 
-        return {
-            "menu_background": menu_background,
-            "background": background,
-            "cursor_img": cursor_img,
-            "bird_imgs": bird_imgs,
-            "small_bird_img": small_bird_img,
-            "target_img": target_img,
-            "target_defeated_img": target_defeated_img,
-            "brick_img": brick_img,
-            "speaker_on_img": speaker_on_img,
-            "speaker_off_img": speaker_off_img,
-            "pause_img": pause_img,
-            "resume_img": resume_img,
-            "smoke_img": smoke_img,
-            "feather_imgs": feather_imgs,
-            "lightbulb_img": lightbulb_img,
-        }
+
+def _rescale(job):
+    image, size = job
+    if size is None:
+        return image
+    if size[0] == "cover":
+        return scale_to_cover(image, size[1], size[2])
+    if size[0] == "width":
+        height = round(image.get_height() * size[1] / image.get_width())
+        return pygame.transform.scale(image, (size[1], height))
+    return pygame.transform.scale(image, size)
+
+
+def spec_name(key):
+    """Имя ресурса в словаре images: для списков — имя списка."""
+    return key[0] if isinstance(key, tuple) else key
+
+
+def build_images(width, height, ui_scale, game_scale, names=None):
+    """Собирает словарь ресурсов (только names, если задано); масштабирование
+    идет параллельно в пуле потоков."""
+    specs = image_specs(width, height, ui_scale, game_scale)
+    if names is not None:
+        specs = [spec for spec in specs if spec_name(spec[0]) in names]
+    sources = [source_images.get(filename, alpha) for _, filename, alpha, _ in specs]
+    scaled = _rescale_pool.map(_rescale, zip(sources, [size for *_, size in specs]))
+    images = {}
+    for key, *_ in specs:
+        if isinstance(key, tuple):
+            images.setdefault(key[0], [None] * 5)
+    for (key, *_), image in zip(specs, scaled):
+        if isinstance(key, tuple):
+            images[key[0]][key[1]] = image
+        else:
+            images[key] = image
+    return images
+
+
+def load_images(width, height, ui_scale, game_scale, names=None):
+    try:
+        return build_images(width, height, ui_scale, game_scale, names)
     except Exception as e:
         print(f"Ошибка загрузки изображений: {e}")
         pygame.quit()
         sys.exit()
 
 
+def load_images_async(width, height, ui_scale, game_scale, names=None):
+    """Future со словарем ресурсов; игровой цикл подменяет словарь целиком."""
+    future = Future()
+
+    def run():
+        try:
+            future.set_result(build_images(width, height, ui_scale, game_scale, names))
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="load-images", daemon=True).start()
+    return future
+
+
 def load_sounds():
     try:
         pygame.mixer.init()
@@ -0,0 +1,115 @@
+# sfx.py
+
+"""Микшер звуковых эффектов с бюджетом каналов.
+
+Каждой категории звуков выделена своя группа каналов. При переполнении
+группы вытесняется голос с наименьшим приоритетом, у каждого звука есть
+пауза между повторами, а одинаковые звуки в пределах короткого окна
+сливаются в один голос погромче вместо наложения копий.
+"""
+
+import time
+
+import pygame
+
+COALESCE_WINDOW = 0.03
+COALESCE_BOOST = 0.25
+
+# Категория -> (число каналов, громкость относительно общей громкости эффектов)
+SFX_CATEGORIES = {
+    "impact": (4, 1.0),
+    "ability": (2, 0.9),
+    "flight": (1, 0.7),
+}
+
+# Звук -> (категория, приоритет, пауза между повторами в секундах)
+SFX_SPECS = {
+    "explosion_sound": ("impact", 3, 0.08),
+    "hit_sound": ("impact", 2, 0.05),
+    "brick_sound": ("impact", 1, 0.05),
+    "boost_sound": ("ability", 2, 0.2),
+    "split_sound": ("ability", 2, 0.2),
+    "boomerang_sound": ("ability", 2, 0.2),
+    "fly_sound": ("flight", 1, 0.1),
+}
+
+
+class SfxMixer:
+    def __init__(self, sounds):
+        self.sounds = {name: sounds[name] for name in SFX_SPECS if sounds.get(name)}
+        self.volume = 1.0
+        self.channels = {}  # номер канала -> pygame.mixer.Channel
+        self.groups = {}  # категория -> номера каналов
+        self.voices = {}  # номер канала -> (звук, приоритет, время запуска, усиление)
+        self.last_played = {}  # звук -> (время, номер канала)
+        if not pygame.mixer.get_init():
+            return
+        total = sum(count for count, _ in SFX_CATEGORIES.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), total))
+        # Зарезервированные каналы не занимаются автоматическим Sound.play()
+        pygame.mixer.set_reserved(total)
+        first = 0
+        for category, (count, _) in SFX_CATEGORIES.items():
+            self.groups[category] = list(range(first, first + count))
+            for i in self.groups[category]:
+                self.channels[i] = pygame.mixer.Channel(i)
+            first += count
+
+    def set_volume(self, volume):
+        self.volume = volume
+        for channel_id, (name, _, _, boost) in self.voices.items():
+            self.channels[channel_id].set_volume(self._voice_volume(name, boost))
+
+    def _voice_volume(self, name, boost=1.0):
+        category = SFX_SPECS[name][0]
+        return min(1.0, self.volume * SFX_CATEGORIES[category][1] * boost)
+
+    def _pick_channel(self, category, priority):
+        """Свободный канал группы или самый слабый голос, который можно вытеснить."""
+        victim, victim_key = None, None
+        for channel_id in self.groups.get(category, []):
+            voice = self.voices.get(channel_id)
+            if voice is None or not self.channels[channel_id].get_busy():
+                self.voices.pop(channel_id, None)
+                return channel_id
+            # Вытесняется голос с меньшим приоритетом, при равенстве — самый старый
+            key = (voice[1], voice[2])
+            if voice[1] <= priority and (victim_key is None or key < victim_key):
+                victim, victim_key = channel_id, key
+        return victim
+
+    def play(self, name):
+        sound = self.sounds.get(name)
+        if sound is None or self.volume <= 0 or not self.groups:
+            return
+        category, priority, cooldown = SFX_SPECS[name]
+        now = time.monotonic()
+
+        last = self.last_played.get(name)
+        if last is not None and now - last[0] < cooldown:
+            played_at, channel_id = last
+            voice = self.voices.get(channel_id)
+            if now - played_at <= COALESCE_WINDOW and voice and voice[0] == name:
+                # Одинаковый звук в том же окне: громче тот же голос, без новой копии
+                boost = voice[3] + COALESCE_BOOST
+                self.voices[channel_id] = (name, voice[1], voice[2], boost)
+                self.channels[channel_id].set_volume(
+                    self._voice_volume(name, boost)
+                )
+            return
+
+        channel_id = self._pick_channel(category, priority)
+        if channel_id is None:
+            return
+        channel = self.channels[channel_id]
+        channel.stop()
+        channel.set_volume(self._voice_volume(name))
+        channel.play(sound)
+        self.voices[channel_id] = (name, priority, now, 1.0)
+        self.last_played[name] = (now, channel_id)
+
+
+def play_sfx(game_state, name):
+    mixer = game_state.get("sfx")
+    if mixer is not None:
+        mixer.play(name)
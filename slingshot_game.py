@@ -2,18 +2,23 @@ import pygame
 import math
 import random
 import time
-import pymunk
 from utils import (
     draw_text, get_text, create_trail_particle, create_dust_particle,
     create_spark_particle, update_particles, draw_particles,
-    create_feather_explosion, update_feathers, draw_feathers, create_brick_shatter, create_target, create_obstacle
+    create_feather_explosion, update_feathers, draw_feathers, create_brick_shatter
 )
-from entities import MainBird, Target, Obstacle, SmallBird, DefeatedPig
+from entities import MainBird, Target, Obstacle, SmallBird, DefeatedPig, EntityGroup, create_space
 from settings import SPEED_MULTIPLIER, LIVES, TARGET_DURATION
 from game_states import State
 from game_objects import update_all_volumes, reset_game
-
-WALL_FILTER = pymunk.ShapeFilter(categories=0b1000, mask=0b0111)
+from level_generator import take_layout
+from achievements import save_profile_value
+from persistence import submit_write
+from text_layout import render_paragraph
+from sfx import play_sfx
+from assets import SLINGSHOT_IMAGES
+from parallax import ParallaxBackground
+from effects import EffectRenderer, spawn_explosion, update_explosions
 
 def get_next_bird(game_state):
     mb = game_state.get("main_bird")
@@ -25,35 +30,31 @@ def get_next_bird(game_state):
             game_state["training_shots_fired"] = 0
             game_state["training_bird_index"] += 1
             if game_state["training_bird_index"] >= len(game_state["images"]["bird_imgs"]):
-                game_state["training_complete"] = True; game_state["current_bird_img"] = None
+                game_state["training_complete"] = True; game_state["current_bird_type"] = None
                 if mb: mb.die()
                 return
             else:
                 game_state["show_training_popup"] = True
                 game_state["training_popup_text"] = game_state["texts"]["training_descriptions"][game_state["training_bird_index"]]
-                game_state["current_bird_img"] = None
+                game_state["current_bird_type"] = None
                 if mb: mb.die()
                 return
-        idx = game_state["training_bird_index"]
-        game_state["current_bird_img"] = game_state["images"]["bird_imgs"][idx]
+        idx = game_state["current_bird_type"] = game_state["training_bird_index"]
     else:
         if game_state["lives"] <= 0 or not game_state["bird_queue"]:
-            game_state["game_over"] = True; game_state["current_bird_img"] = None
+            game_state["game_over"] = True; game_state["current_bird_type"] = None
             if mb: mb.die()
             return
         game_state["current_shot_hit"] = False
-        bird_img = game_state["bird_queue"].pop(0)
-        game_state["current_bird_img"] = bird_img
-        game_state["bird_queue"].append(random.choice(game_state["images"]["bird_imgs"]))
-        try: idx = game_state["images"]["bird_imgs"].index(bird_img)
-        except: idx = 0
+        idx = game_state["current_bird_type"] = game_state["bird_queue"].pop(0)
+        game_state["bird_queue"].append(random.randrange(len(game_state["images"]["bird_imgs"])))
 
     if mb: mb.die()
     
     new_mb = MainBird(game_state["sling_x"], game_state["sling_y"], game_state["object_size"], game_state["space"])
-    new_mb.set_image(game_state["current_bird_img"], idx)
+    new_mb.set_image(game_state["images"]["bird_imgs"][idx], idx)
     new_mb.jump_start_pos = (int(40 * game_state["scale_factor"]), game_state["GROUND_LEVEL"] - game_state["object_size"] * 0.9)
-    new_mb.jump_image = game_state["current_bird_img"]
+    new_mb.jump_image = game_state["images"]["bird_imgs"][idx]
     new_mb.state = "jumping"
     game_state["main_bird"] = new_mb
 
@@ -63,8 +64,17 @@ def update_max_combo(game_state, profile_name):
     cp_data = game_state["all_profiles_data"][profile_name]
     if game_state["combo"] > cp_data.get(key, 0):
         cp_data[key] = game_state["combo"]
+        game_state["leaderboard"].update(profile_name, key, game_state["combo"])
+        submit_write(game_state, f"profile:{profile_name}:{key}", save_profile_value, profile_name, key, game_state["combo"])
         if profile_name == game_state["current_profile"]: game_state[key] = game_state["combo"]
 
+def record_shot(game_state, mb):
+    """Отправляет завершенный выстрел в телеметрию (один раз на выстрел)."""
+    telemetry = game_state.get("telemetry")
+    if telemetry is None or mb.shot is None: return
+    shot, mb.shot = mb.shot, None
+    telemetry.emit({**shot, "time": time.time(), "hit": game_state["current_shot_hit"], "mode": game_state["game_mode"], "difficulty": game_state["difficulty"], "combo": game_state["combo"], "frame_time_ms": 1000.0 * mb.flight_time / max(1, mb.flight_frames)})
+
 def split_bird(game_state):
     bird = game_state["main_bird"]; sz = game_state["small_object_size"]
     img = game_state["images"]["small_bird_img"]
@@ -73,87 +83,70 @@ def split_bird(game_state):
         vx = bird.body.velocity.x + math.cos(angle) * 300
         vy = bird.body.velocity.y + math.sin(angle) * 300
         game_state["small_birds"].add(SmallBird(bird.x, bird.y, vx, vy, sz, game_state["space"], img))
-    if game_state["sound_on"] and game_state["sounds"].get("split_sound"):
-        try: game_state["sounds"]["split_sound"].play()
-        except: pass
+    play_sfx(game_state, "split_sound")
     bird.split_available = False
+    if bird.shot: bird.shot["ability_used"] = True
     bird.die()
 
 def activate_boomerang(game_state):
     bird = game_state["main_bird"]
     bird.body.velocity = (-abs(bird.body.velocity.x) - 400, bird.body.velocity.y - 100)
     bird.boomerang_available = False
-    if game_state["sound_on"] and game_state["sounds"].get("boomerang_sound"):
-        try: game_state["sounds"]["boomerang_sound"].play()
-        except: pass
+    if bird.shot: bird.shot["ability_used"] = True
+    play_sfx(game_state, "boomerang_sound")
 
 def reset_slingshot(game_state):
     from achievements import get_achievements_for_profile
     game_state.update(get_achievements_for_profile(game_state["all_profiles_data"], game_state["current_profile"]))
     
-    game_state["bird_queue"] = []; num_targets = 0; num_obstacles = 0
+    game_state["bird_queue"] = []
 
     if game_state["game_mode"] == "training":
-        game_state.update({"training_complete": False, "show_training_popup": True, "training_bird_index": 0, "training_shots_fired": 0, "training_popup_text": game_state["texts"]["training_descriptions"][0], "current_bird_img": None, "lives": float("inf")})
-        num_targets = 3
+        game_state.update({"training_complete": False, "show_training_popup": True, "training_bird_index": 0, "training_shots_fired": 0, "training_popup_text": game_state["texts"]["training_descriptions"][0], "current_bird_type": None, "lives": float("inf")})
     else:
-        game_state["bird_queue"] = [random.choice(game_state["images"]["bird_imgs"]) for _ in range(3)]
-        game_state["current_bird_img"] = game_state["bird_queue"].pop(0)
+        # В очереди хранятся номера типов птиц, а не поверхности: номера не меняются при перезагрузке ресурсов
+        game_state["bird_queue"] = [random.randrange(len(game_state["images"]["bird_imgs"])) for _ in range(3)]
+        game_state["current_bird_type"] = game_state["bird_queue"].pop(0)
         if game_state["game_mode"] == "developer": game_state["lives"] = float("inf")
-        elif game_state["game_mode"] == "sharpshooter": game_state["lives"] = LIVES.get(game_state["difficulty"], 5); num_targets = 1; game_state["target_duration"] = TARGET_DURATION.get(game_state["difficulty"], 2.5)
-        elif game_state["game_mode"] == "obstacle": game_state["lives"] = LIVES.get(game_state["difficulty"], 5); num_targets = 3; num_obstacles = 3; game_state["target_duration"] = 5
-        else: game_state["lives"] = LIVES.get(game_state["difficulty"], 5); num_targets = 3; game_state["target_duration"] = 5
+        elif game_state["game_mode"] == "sharpshooter": game_state["lives"] = LIVES.get(game_state["difficulty"], 5); game_state["target_duration"] = TARGET_DURATION.get(game_state["difficulty"], 2.5)
+        elif game_state["game_mode"] == "obstacle": game_state["lives"] = LIVES.get(game_state["difficulty"], 5); game_state["target_duration"] = 5
+        else: game_state["lives"] = LIVES.get(game_state["difficulty"], 5); game_state["target_duration"] = 5
 
-    game_state["space"] = pymunk.Space()
-    game_state["space"].gravity = (0, 1800)
-    
-    floor = pymunk.Segment(game_state["space"].static_body, (-2000, game_state["GROUND_LEVEL"]), (game_state["WIDTH"] + 2000, game_state["GROUND_LEVEL"]), 50)
-    floor.friction = 1.0
-    floor.elasticity = 0.5
-    floor.filter = WALL_FILTER
-    game_state["space"].add(floor)
-    
-    walls = [
-        pymunk.Segment(game_state["space"].static_body, (0, -2000), (0, game_state["HEIGHT"]), 50),
-        pymunk.Segment(game_state["space"].static_body, (game_state["WIDTH"], -2000), (game_state["WIDTH"], game_state["HEIGHT"]), 50),
-        pymunk.Segment(game_state["space"].static_body, (-2000, -2000), (game_state["WIDTH"] + 2000, -2000), 50)
-    ]
-    for w in walls:
-        w.elasticity = 0.8; w.friction = 0.5; w.filter = WALL_FILTER
-        game_state["space"].add(w)
+    game_state["space"] = create_space(game_state["WIDTH"], game_state["HEIGHT"], game_state["GROUND_LEVEL"])
 
     game_state["main_bird"] = MainBird(game_state["sling_x"], game_state["sling_y"], game_state["object_size"], game_state["space"])
-    if game_state.get("current_bird_img"):
-        try: t_idx = game_state["images"]["bird_imgs"].index(game_state["current_bird_img"])
-        except: t_idx = 0
-        game_state["main_bird"].set_image(game_state["current_bird_img"], t_idx)
+    if game_state.get("current_bird_type") is not None:
+        t_idx = game_state["current_bird_type"]
+        game_state["main_bird"].set_image(game_state["images"]["bird_imgs"][t_idx], t_idx)
 
-    game_state["targets"] = pygame.sprite.Group()
-    game_state["obstacles"] = pygame.sprite.Group()
-    game_state["small_birds"] = pygame.sprite.Group()
-    game_state["defeated_pigs"] = pygame.sprite.Group()
+    game_state["targets"] = EntityGroup()
+    game_state["obstacles"] = EntityGroup()
+    game_state["small_birds"] = EntityGroup()
+    game_state["defeated_pigs"] = EntityGroup()
 
-    game_state.update({"score": 0, "game_over": False, "explosion_active": False, "explosion_frames": 0, "combo": 0, "trail_particles": [], "dust_particles": [], "spark_particles": [], "feather_particles": [], "last_shot_path": [], "path_display_timer": 0, "target_timer_start": time.time(), "paused": False})
+    game_state.update({"score": 0, "game_over": False, "explosions": [], "combo": 0, "trail_particles": [], "dust_particles": [], "spark_particles": [], "feather_particles": [], "last_shot_path": [], "path_display_timer": 0, "target_timer_start": time.time(), "show_rope": False, "shake_offset": (0, 0), "paused": False})
 
     sm = SPEED_MULTIPLIER.get(game_state["difficulty"], 0)
     target_img = game_state["images"]["target_img"]
     obs_img = game_state["images"]["brick_img"]
 
-    for _ in range(num_targets):
-        while True:
-            nr = create_target(game_state["WIDTH"], game_state["HEIGHT"], game_state["object_size"])
-            if not any(nr.inflate(10, 10).colliderect(t.rect) for t in game_state["targets"]) and not any(nr.inflate(10, 10).colliderect(o.rect) for o in game_state["obstacles"]):
-                game_state["targets"].add(Target(nr.centerx, nr.centery, random.uniform(0.5, 2.0)*sm*random.choice([-1, 1]) if sm>0 else 0, random.uniform(0.5, 2.0)*sm*random.choice([-1, 1]) if sm>0 else 0, game_state["object_size"], game_state["space"], target_img)); break
-    for _ in range(num_obstacles):
-        while True:
-            nr = create_obstacle(game_state["WIDTH"], game_state["HEIGHT"], game_state["object_size"])
-            if not any(nr.inflate(10, 10).colliderect(t.rect) for t in game_state["targets"]) and not any(nr.inflate(10, 10).colliderect(o.rect) for o in game_state["obstacles"]):
-                game_state["obstacles"].add(Obstacle(nr.centerx, nr.centery, random.uniform(0.5, 2.0)*sm*random.choice([-1, 1]) if sm>0 else 0, random.uniform(0.5, 2.0)*sm*random.choice([-1, 1]) if sm>0 else 0, game_state["object_size"], game_state["space"], obs_img)); break
-
+    layout = take_layout(game_state)
+    for x, y, dx, dy in layout["targets"]:
+        game_state["targets"].add(Target(x, y, dx * sm, dy * sm, game_state["object_size"], game_state["space"], target_img))
+    for x, y, dx, dy in layout["obstacles"]:
+        game_state["obstacles"].add(Obstacle(x, y, dx * sm, dy * sm, game_state["object_size"], game_state["space"], obs_img))
 
 class SlingshotState(State):
+    assets = SLINGSHOT_IMAGES
+
     def __init__(self):
         self.ui_buttons = {}
+        self.background = ParallaxBackground()
+        self.effects = EffectRenderer()
+
+    def enter(self, game_state):
+        # Кадры взрыва строятся при входе, а не на первом взрыве
+        self.effects.prepare(game_state["images"]["smoke_img"], game_state["MAX_EXPLOSION_FRAMES"])
     
     def handle_event(self, event, mx, my, game_state):
         mb = game_state.get("main_bird")
@@ -197,9 +190,10 @@ class SlingshotState(State):
                     mb.start_drag()
                     game_state["show_rope"] = True
                 elif mb.state == "flying" and mb.type_index == 2 and mb.boost_available and not mb.is_boosted:
-                    if game_state["sound_on"]: game_state["sounds"]["boost_sound"].play()
+                    play_sfx(game_state, "boost_sound")
                     mb.body.velocity = (mb.body.velocity.x * 2.0, mb.body.velocity.y * 2.0)
                     mb.is_boosted = True; game_state["boost_trail_start_time"] = time.time()
+                    if mb.shot: mb.shot["ability_used"] = True
                     create_spark_particle(game_state["spark_particles"], mb.x, mb.y)
                 elif mb.state == "flying" and mb.type_index == 3 and mb.split_available:
                     split_bird(game_state)
@@ -210,163 +204,168 @@ class SlingshotState(State):
             if mb and mb.state == "dragging":
                 mb.launch(game_state["sling_x"], game_state["sling_y"], game_state["scale_factor"])
                 game_state["show_rope"], game_state["current_shot_hit"], game_state["last_shot_path"] = False, False, []
-                if game_state["sound_on"]: game_state["sounds"]["fly_sound"].play()
+                play_sfx(game_state, "fly_sound")
+
+    def is_animating(self, game_state):
+        # Физика и эффекты идут каждый кадр, кроме паузы
+        return not game_state.get("paused", False)
 
     def update(self, dt, mx, my, game_state):
-        mb = game_state.get("main_bird")
+        # Кадр читает разделы контекста напрямую, без поиска ключа на каждом обращении
+        ss, disp, res = game_state.slingshot, game_state.display, game_state.resources
+        mb = ss.main_bird
         dt_factor = dt * 60.0
         is_paused = game_state.get("paused", False)
         
-        if game_state.get("screen_shake", 0) > 0:
-            game_state["screen_shake"] -= 1 * dt_factor
-            game_state["shake_offset"] = (random.randint(-5, 5), random.randint(-5, 5))
+        if ss.screen_shake > 0:
+            ss.screen_shake -= 1 * dt_factor
+            ss.shake_offset = (random.randint(-5, 5), random.randint(-5, 5))
         else:
-            game_state["shake_offset"] = (0, 0)
+            ss.shake_offset = (0, 0)
             
         if mb and mb.state == "dragging" and not is_paused:
-            mb.drag_to(mx, my, game_state["WIDTH"], game_state["HEIGHT"])
+            mb.drag_to(mx, my, disp.WIDTH, disp.HEIGHT)
 
         if is_paused: return
 
-        game_state["space"].step(dt)
+        ss.space.step(dt)
+        # Положения тел снимаются один раз за шаг; дальше кадр читает только их
+        if mb: mb.pull()
+        for group in (ss.targets, ss.obstacles, ss.small_birds, ss.defeated_pigs): group.sync()
 
-        update_particles(game_state["trail_particles"], dt)
-        update_particles(game_state["dust_particles"], dt)
-        update_particles(game_state["spark_particles"], dt)
+        update_particles(ss.trail_particles, dt)
+        update_particles(ss.dust_particles, dt)
+        update_particles(ss.spark_particles, dt)
 
-        if game_state["explosion_active"]:
-            game_state["explosion_frames"] -= 1 * dt_factor
-            if game_state["explosion_frames"] <= 0:
-                game_state["explosion_active"] = False
+        update_explosions(ss.explosions, dt_factor)
 
-        if not game_state.get("game_over") and not game_state.get("training_complete"):
+        if not ss.game_over and not ss.training_complete:
             if mb and mb.state == "jumping":
-                mb.update(dt, game_state["gravity"], game_state["GROUND_LEVEL"], game_state["WIDTH"], game_state["HEIGHT"])
+                mb.update(dt, disp.gravity, disp.GROUND_LEVEL, disp.WIDTH, disp.HEIGHT)
             elif mb and mb.state in ["flying", "tumbling"]:
-                if len(game_state["last_shot_path"]) == 0 or math.hypot(game_state["last_shot_path"][-1][0] - mb.x, game_state["last_shot_path"][-1][1] - mb.y) > 20:
-                    game_state["last_shot_path"].append((mb.x, mb.y))
-                if random.random() < 0.5: create_trail_particle(game_state["trail_particles"], mb.x, mb.y)
-                if mb.update(dt, game_state["gravity"], game_state["GROUND_LEVEL"], game_state["WIDTH"], game_state["HEIGHT"]) == "hit_ground":
-                    create_dust_particle(game_state["dust_particles"], mb.x, game_state["GROUND_LEVEL"], count=20)
-
-            if "targets" in game_state: game_state["targets"].update(dt, game_state["WIDTH"], game_state["HEIGHT"])
-            if "obstacles" in game_state: game_state["obstacles"].update(dt, game_state["WIDTH"], game_state["HEIGHT"])
-            for sb in game_state.get("small_birds", []):
-                if sb.update(dt, game_state["gravity"], game_state["GROUND_LEVEL"]) == "hit_ground":
-                    create_dust_particle(game_state["dust_particles"], sb.x, game_state["GROUND_LEVEL"], count=10)
-            for dp in game_state.get("defeated_pigs", []):
-                if dp.update(dt, game_state["gravity"], game_state["GROUND_LEVEL"]) == "hit_ground":
-                    create_dust_particle(game_state["dust_particles"], dp.x, dp.y + dp.size//2, count=30)
+                if len(ss.last_shot_path) == 0 or math.hypot(ss.last_shot_path[-1][0] - mb.x, ss.last_shot_path[-1][1] - mb.y) > 20:
+                    ss.last_shot_path.append((mb.x, mb.y))
+                if random.random() < 0.5: create_trail_particle(ss.trail_particles, mb.x, mb.y)
+                if mb.update(dt, disp.gravity, disp.GROUND_LEVEL, disp.WIDTH, disp.HEIGHT) == "hit_ground":
+                    create_dust_particle(ss.dust_particles, mb.x, disp.GROUND_LEVEL, count=20)
+
+            ss.targets.update(dt, disp.WIDTH, disp.HEIGHT)
+            ss.obstacles.update(dt, disp.WIDTH, disp.HEIGHT)
+            for sb in ss.small_birds:
+                if sb.update(dt, disp.gravity, disp.GROUND_LEVEL) == "hit_ground":
+                    create_dust_particle(ss.dust_particles, sb.x, disp.GROUND_LEVEL, count=10)
+            for dp in ss.defeated_pigs:
+                if dp.update(dt, disp.gravity, disp.GROUND_LEVEL) == "hit_ground":
+                    create_dust_particle(ss.dust_particles, dp.x, dp.y + dp.size//2, count=30)
             
-            update_feathers(game_state["feather_particles"], dt)
-            td_img = game_state["images"]["target_defeated_img"]
+            update_feathers(ss.feather_particles, dt)
+            td_img = res.images["target_defeated_img"]
 
             if mb and mb.state in ["flying", "tumbling"]:
-                for t in pygame.sprite.spritecollide(mb, game_state.get("targets", []), False, pygame.sprite.collide_mask):
-                    game_state["current_shot_hit"] = True
+                for t in ss.targets.collide(mb):
+                    ss.current_shot_hit = True
                     if mb.type_index == 1:
-                        game_state["screen_shake"] = 15; game_state["explosion_center"] = t.rect.center; game_state["explosion_active"] = True; game_state["explosion_frames"] = game_state["MAX_EXPLOSION_FRAMES"]
-                        if game_state["sound_on"]: game_state["sounds"]["explosion_sound"].play()
+                        ss.screen_shake = 15; spawn_explosion(ss.explosions, *t.rect.center, ss.MAX_EXPLOSION_FRAMES)
+                        play_sfx(game_state, "explosion_sound")
                         
-                        rem = [x for x in game_state["targets"] if math.hypot(x.rect.centerx - t.rect.centerx, x.rect.centery - t.rect.centery) <= game_state["EXPLOSION_RADIUS"]]
+                        rem = [x for x in ss.targets if math.hypot(x.rect.centerx - t.rect.centerx, x.rect.centery - t.rect.centery) <= disp.EXPLOSION_RADIUS]
                         for x in rem:
-                            game_state["defeated_pigs"].add(DefeatedPig(x.rect.centerx, x.rect.centery, random.uniform(-120, 0), game_state["object_size"], game_state["space"], td_img)); x.kill()
-                        if rem: game_state["score"] += len(rem); game_state["combo"] += len(rem); update_max_combo(game_state, game_state["current_profile"])
+                            ss.defeated_pigs.add(DefeatedPig(x.rect.centerx, x.rect.centery, random.uniform(-120, 0), disp.object_size, ss.space, td_img)); x.kill()
+                        if rem: ss.score += len(rem); ss.combo += len(rem); update_max_combo(game_state, game_state["current_profile"])
                     else:
-                        create_feather_explosion(game_state["feather_particles"], t.rect.centerx, t.rect.centery, mb.type_index)
-                        game_state["score"] += 1; game_state["combo"] += 1; update_max_combo(game_state, game_state["current_profile"])
-                        if game_state["sound_on"]: game_state["sounds"]["hit_sound"].play()
-                        game_state["defeated_pigs"].add(DefeatedPig(t.rect.centerx, t.rect.centery, -abs(mb.body.velocity.y * 0.05), game_state["object_size"], game_state["space"], td_img))
+                        create_feather_explosion(ss.feather_particles, t.rect.centerx, t.rect.centery, mb.type_index)
+                        ss.score += 1; ss.combo += 1; update_max_combo(game_state, game_state["current_profile"])
+                        play_sfx(game_state, "hit_sound")
+                        ss.defeated_pigs.add(DefeatedPig(t.rect.centerx, t.rect.centery, -abs(mb.body.velocity.y * 0.05), disp.object_size, ss.space, td_img))
                         t.kill()
                     mb.die()
                     break
 
                 if game_state["game_mode"] == "obstacle" and mb and mb.state in ["flying", "tumbling"]:
-                    for o in pygame.sprite.spritecollide(mb, game_state.get("obstacles", []), False, pygame.sprite.collide_mask):
-                        create_brick_shatter(game_state["dust_particles"], o.rect.centerx, o.rect.centery)
+                    for o in ss.obstacles.collide(mb):
+                        create_brick_shatter(ss.dust_particles, o.rect.centerx, o.rect.centery)
                         o.kill() 
                         mb.body.velocity = (mb.body.velocity.x * 0.5, mb.body.velocity.y * 0.5) 
-                        if game_state["sound_on"]: game_state["sounds"]["brick_sound"].play()
+                        play_sfx(game_state, "brick_sound")
                         break
 
-            for sb in game_state.get("small_birds", []):
+            for sb in ss.small_birds:
                 if sb.state in ["flying", "tumbling"]:
-                    for t in pygame.sprite.spritecollide(sb, game_state.get("targets", []), False, pygame.sprite.collide_mask):
-                        create_feather_explosion(game_state["feather_particles"], t.rect.centerx, t.rect.centery, 3)
-                        game_state["current_shot_hit"] = True; game_state["score"] += 1; game_state["combo"] += 1; update_max_combo(game_state, game_state["current_profile"])
-                        game_state["defeated_pigs"].add(DefeatedPig(t.rect.centerx, t.rect.centery, 0, game_state["object_size"], game_state["space"], td_img))
+                    for t in ss.targets.collide(sb):
+                        create_feather_explosion(ss.feather_particles, t.rect.centerx, t.rect.centery, 3)
+                        ss.current_shot_hit = True; ss.score += 1; ss.combo += 1; update_max_combo(game_state, game_state["current_profile"])
+                        ss.defeated_pigs.add(DefeatedPig(t.rect.centerx, t.rect.centery, 0, disp.object_size, ss.space, td_img))
                         t.kill(); sb.kill(); sb.state = "dead"
                         break
                     if game_state["game_mode"] == "obstacle" and sb.state != "dead":
-                        for o in pygame.sprite.spritecollide(sb, game_state.get("obstacles", []), False, pygame.sprite.collide_mask):
-                            create_brick_shatter(game_state["dust_particles"], o.rect.centerx, o.rect.centery)
+                        for o in ss.obstacles.collide(sb):
+                            create_brick_shatter(ss.dust_particles, o.rect.centerx, o.rect.centery)
                             o.kill(); sb.body.velocity = (sb.body.velocity.x * 0.5, sb.body.velocity.y * 0.5)
-                            if game_state["sound_on"]: game_state["sounds"]["brick_sound"].play()
+                            play_sfx(game_state, "brick_sound")
                             break
 
-            if mb and mb.state in ["stopped", "out_of_bounds", "dead"] and len(game_state.get("small_birds", [])) == 0:
+            if mb and mb.state in ["stopped", "out_of_bounds", "dead"] and len(ss.small_birds) == 0:
                 if mb.state in ["stopped", "out_of_bounds"]:
-                    if not game_state["current_shot_hit"] and game_state["game_mode"] not in ["developer", "training", "campaign"]:
-                        game_state["lives"] -= 1; game_state["combo"] = 0
+                    if not ss.current_shot_hit and game_state["game_mode"] not in ["developer", "training", "campaign"]:
+                        ss.lives -= 1; ss.combo = 0
                     mb.die()
+                record_shot(game_state, mb)
                 get_next_bird(game_state)
 
-            if game_state["game_mode"] == "sharpshooter" and len(game_state.get("targets", [])) > 0:
-                if game_state["target_duration"] - (time.time() - game_state["target_timer_start"]) <= 0:
-                    for t in game_state["targets"]: t.kill()
-                    game_state["lives"] -= 1; game_state["combo"] = 0
-                    if game_state["lives"] > 0:
+            if game_state["game_mode"] == "sharpshooter" and len(ss.targets) > 0:
+                if ss.target_duration - (time.time() - ss.target_timer_start) <= 0:
+                    for t in ss.targets: t.kill()
+                    ss.lives -= 1; ss.combo = 0
+                    if ss.lives > 0:
                         sm = SPEED_MULTIPLIER.get(game_state["difficulty"], 0)
-                        t_img = game_state["images"]["target_img"]
-                        game_state["targets"].add(Target(game_state["WIDTH"]//2, game_state["HEIGHT"]//2, random.uniform(0.5, 2.0)*sm*random.choice([-1, 1]) if sm>0 else 0, random.uniform(0.5, 2.0)*sm*random.choice([-1, 1]) if sm>0 else 0, game_state["object_size"], game_state["space"], t_img))
-                        game_state["target_timer_start"] = time.time()
-                    else: game_state["game_over"] = True
+                        t_img = res.images["target_img"]
+                        ss.targets.add(Target(disp.WIDTH//2, disp.HEIGHT//2, random.uniform(0.5, 2.0)*sm*random.choice([-1, 1]) if sm>0 else 0, random.uniform(0.5, 2.0)*sm*random.choice([-1, 1]) if sm>0 else 0, disp.object_size, ss.space, t_img))
+                        ss.target_timer_start = time.time()
+                    else: ss.game_over = True
 
     def draw(self, screen, mx, my, game_state):
-        shake = game_state.get("shake_offset", (0, 0))
-        bg = game_state["images"]["background"]
-        screen.blit(bg, (bg.get_rect(center=screen.get_rect().center).left + shake[0], bg.get_rect(center=screen.get_rect().center).top + shake[1]))
+        ss, disp, res = game_state.slingshot, game_state.display, game_state.resources
+        shake = ss.shake_offset
+        # Камеры в рогатке нет: слои сдвигает только тряска, дальний — вдвое слабее
+        self.background.draw(screen, res.images["background_far"], res.images["background_near"], shake=shake)
         self.ui_buttons = {}
 
-        if not game_state.get("training_complete"): self._draw_normal(screen, mx, my, game_state)
+        if not ss.training_complete: self._draw_normal(screen, mx, my, game_state)
         else: self._draw_tc(screen, mx, my, game_state)
 
         if game_state["paused"]:
-            s = pygame.Surface((game_state["WIDTH"], game_state["HEIGHT"]), pygame.SRCALPHA); s.fill((0, 0, 0, 128)); screen.blit(s, (0, 0))
-            if not game_state.get("show_hint_popup") and not game_state.get("show_training_popup"):
-                p_surf, rect = draw_text(game_state["texts"]["pause"], game_state["fonts"]["large_font"], (255, 255, 255))
-                screen.blit(p_surf, p_surf.get_rect(center=(game_state["WIDTH"] // 2, game_state["HEIGHT"] // 2)))
-
-        draw_particles(screen, game_state["trail_particles"])
-        draw_particles(screen, game_state["dust_particles"])
-        draw_particles(screen, game_state["spark_particles"])
-        draw_feathers(screen, game_state["feather_particles"], game_state["images"]["feather_imgs"])
+            s = pygame.Surface((disp.WIDTH, disp.HEIGHT), pygame.SRCALPHA); s.fill((0, 0, 0, 128)); screen.blit(s, (0, 0))
+            if not ss.show_hint_popup and not ss.show_training_popup:
+                p_surf, rect = draw_text(res.texts["pause"], res.fonts["large_font"], (255, 255, 255))
+                screen.blit(p_surf, p_surf.get_rect(center=(disp.WIDTH // 2, disp.HEIGHT // 2)))
+
+        draw_particles(screen, ss.trail_particles)
+        draw_particles(screen, ss.dust_particles)
+        draw_particles(screen, ss.spark_particles)
+        draw_feathers(screen, ss.feather_particles, res.images["feather_imgs"])
         
-        if game_state["explosion_active"]:
-            er, mx_f = game_state["EXPLOSION_RADIUS"], game_state["MAX_EXPLOSION_FRAMES"]
-            sm_copy = game_state["images"]["smoke_img"].copy()
-            sm_copy.set_alpha(max(0, min(255, int(255 * (max(0, game_state["explosion_frames"]) / mx_f)))))
-            screen.blit(sm_copy, (game_state["explosion_center"][0] - er, game_state["explosion_center"][1] - er))
+        self.effects.draw_explosions(screen, ss.explosions, res.images["smoke_img"], ss.MAX_EXPLOSION_FRAMES)
 
-        if game_state.get("show_training_popup"): self._draw_tp(screen, mx, my, game_state)
-        elif game_state.get("show_hint_popup"): self._draw_hp(screen, mx, my, game_state)
+        if ss.show_training_popup: self._draw_tp(screen, mx, my, game_state)
+        elif ss.show_hint_popup: self._draw_hp(screen, mx, my, game_state)
 
     def _draw_normal(self, screen, mx, my, game_state):
-        gl, sc, qx, qg, bs = game_state["GROUND_LEVEL"], game_state["scale_factor"], int(40 * game_state["scale_factor"]), int(60 * game_state["scale_factor"]), game_state["object_size"]
-        for i, b in enumerate(game_state["bird_queue"]): screen.blit(b, (qx + i * qg, gl - bs * 0.9))
-        pygame.draw.circle(screen, (139, 69, 19), (game_state["sling_x"], game_state["sling_y"]), int(5 * sc))
+        ss, disp, res = game_state.slingshot, game_state.display, game_state.resources
+        gl, sc, qx, qg, bs = disp.GROUND_LEVEL, disp.scale_factor, int(40 * disp.scale_factor), int(60 * disp.scale_factor), disp.object_size
+        for i, b in enumerate(ss.bird_queue): screen.blit(res.images["bird_imgs"][b], (qx + i * qg, gl - bs * 0.9))
+        pygame.draw.circle(screen, (139, 69, 19), (disp.sling_x, disp.sling_y), int(5 * sc))
         
-        mb = game_state.get("main_bird")
+        mb = ss.main_bird
         if mb and mb.state == "dragging" and not game_state.get("paused"):
-            dx, dy = game_state["sling_x"] - mb.x, game_state["sling_y"] - mb.y
+            dx, dy = disp.sling_x - mb.x, disp.sling_y - mb.y
             bw, bh, md = int(150 * sc), int(15 * sc), int(150 * sc)
             pp = min(math.hypot(dx, dy), md) / md
-            bx, by = game_state["sling_x"] - bw // 2, game_state["sling_y"] + int(30 * sc)
+            bx, by = disp.sling_x - bw // 2, disp.sling_y + int(30 * sc)
             pygame.draw.rect(screen, (100, 100, 100), (bx, by, bw, bh))
             pygame.draw.rect(screen, (int(255 * pp), int(255 * (1 - pp)), 0), (bx, by, int(bw * pp), bh))
-            pts, _ = draw_text(f"{get_text(game_state['texts'], 'power_colon')} {int(pp * 100)}%", game_state["fonts"]["small_font"], (0, 0, 0))
-            screen.blit(pts, (game_state["sling_x"] - pts.get_width() // 2, by + bh + 5))
-            if game_state.get("show_rope"): pygame.draw.line(screen, (139, 69, 19), (game_state["sling_x"], game_state["sling_y"]), (int(mb.x), int(mb.y)), int(3 * sc))
+            pts, _ = draw_text(f"{get_text(res.texts, 'power_colon')} {int(pp * 100)}%", res.fonts["small_font"], (0, 0, 0))
+            screen.blit(pts, (disp.sling_x - pts.get_width() // 2, by + bh + 5))
+            if ss.show_rope: pygame.draw.line(screen, (139, 69, 19), (disp.sling_x, disp.sling_y), (int(mb.x), int(mb.y)), int(3 * sc))
 
         if mb and mb.state != "dead":
             if mb.state == "jumping" and mb.jump_image:
@@ -374,31 +373,31 @@ class SlingshotState(State):
             elif mb.image:
                 screen.blit(mb.image, mb.rect)
 
-        game_state.get("targets", pygame.sprite.Group()).draw(screen)
-        game_state.get("obstacles", pygame.sprite.Group()).draw(screen)
-        game_state.get("defeated_pigs", pygame.sprite.Group()).draw(screen)
-        game_state.get("small_birds", pygame.sprite.Group()).draw(screen)
+        ss.targets.draw(screen)
+        ss.obstacles.draw(screen)
+        ss.defeated_pigs.draw(screen)
+        ss.small_birds.draw(screen)
 
-        if game_state["sound_on"]: screen.blit(game_state["images"]["speaker_on_img"], (game_state["WIDTH"] - 50, 10))
-        else: screen.blit(game_state["images"]["speaker_off_img"], (game_state["WIDTH"] - 50, 10))
-        if game_state["paused"]: screen.blit(game_state["images"]["resume_img"], (game_state["WIDTH"] - 100, 10))
-        else: screen.blit(game_state["images"]["pause_img"], (game_state["WIDTH"] - 100, 10))
-        screen.blit(game_state["images"]["lightbulb_img"], (game_state["WIDTH"] // 2 - int(30 * game_state["scale_factor"]), int(10 * game_state["scale_factor"])))
+        if game_state.audio.sound_on: screen.blit(res.images["speaker_on_img"], (disp.WIDTH - 50, 10))
+        else: screen.blit(res.images["speaker_off_img"], (disp.WIDTH - 50, 10))
+        if game_state["paused"]: screen.blit(res.images["resume_img"], (disp.WIDTH - 100, 10))
+        else: screen.blit(res.images["pause_img"], (disp.WIDTH - 100, 10))
+        screen.blit(res.images["lightbulb_img"], (disp.WIDTH // 2 - int(30 * disp.scale_factor), int(10 * disp.scale_factor)))
 
-        if game_state.get("game_over"):
-            go, gr = draw_text(get_text(game_state["texts"], "game_over"), game_state["fonts"]["font"], (255, 0, 0))
-            screen.blit(go, go.get_rect(center=(game_state["WIDTH"] // 2, game_state["HEIGHT"] // 2)))
+        if ss.game_over:
+            go, gr = draw_text(get_text(res.texts, "game_over"), res.fonts["font"], (255, 0, 0))
+            screen.blit(go, go.get_rect(center=(disp.WIDTH // 2, disp.HEIGHT // 2)))
 
         if game_state["game_mode"] != "sharpshooter":
-            screen.blit(draw_text(f"{game_state['texts']['score_colon']} {game_state['score']}", game_state["fonts"]["small_font"], (0, 0, 0))[0], (10, 10))
-            screen.blit(draw_text(game_state["texts"]["lives_infinite"] if game_state["lives"] == float("inf") else f"{game_state['texts']['lives_colon']} {game_state['lives']}", game_state["fonts"]["small_font"], (0, 0, 0))[0], (10, 50))
-            screen.blit(draw_text(f"{game_state['texts']['combo_colon']} {game_state['combo']}", game_state["fonts"]["small_font"], (0, 0, 0))[0], (10, 90))
+            screen.blit(draw_text(f"{res.texts['score_colon']} {ss.score}", res.fonts["small_font"], (0, 0, 0))[0], (10, 10))
+            screen.blit(draw_text(res.texts["lives_infinite"] if ss.lives == float("inf") else f"{res.texts['lives_colon']} {ss.lives}", res.fonts["small_font"], (0, 0, 0))[0], (10, 50))
+            screen.blit(draw_text(f"{res.texts['combo_colon']} {ss.combo}", res.fonts["small_font"], (0, 0, 0))[0], (10, 90))
         else:
-            tl = max(0, game_state["target_duration"] - (time.time() - game_state["target_timer_start"])) if not game_state.get("paused") and not game_state.get("game_over") and len(game_state.get("targets", [])) > 0 else 0
-            screen.blit(draw_text(f"{game_state['texts']['time_colon']} {tl:.1f}s", game_state["fonts"]["small_font"], (255, 0, 0))[0], (10, 10))
-            screen.blit(draw_text(f"{game_state['texts']['score_colon']} {game_state['score']}", game_state["fonts"]["small_font"], (0, 0, 0))[0], (10, 50))
-            screen.blit(draw_text(f"{game_state['texts']['combo_colon']} {game_state['combo']}", game_state["fonts"]["small_font"], (0, 0, 0))[0], (10, 90))
-            screen.blit(draw_text(game_state["texts"]["lives_infinite"] if game_state["lives"] == float("inf") else f"{game_state['texts']['lives_colon']} {game_state['lives']}", game_state["fonts"]["small_font"], (0, 0, 0))[0], (10, 130))
+            tl = max(0, ss.target_duration - (time.time() - ss.target_timer_start)) if not game_state.get("paused") and not ss.game_over and len(ss.targets) > 0 else 0
+            screen.blit(draw_text(f"{res.texts['time_colon']} {tl:.1f}s", res.fonts["small_font"], (255, 0, 0))[0], (10, 10))
+            screen.blit(draw_text(f"{res.texts['score_colon']} {ss.score}", res.fonts["small_font"], (0, 0, 0))[0], (10, 50))
+            screen.blit(draw_text(f"{res.texts['combo_colon']} {ss.combo}", res.fonts["small_font"], (0, 0, 0))[0], (10, 90))
+            screen.blit(draw_text(res.texts["lives_infinite"] if ss.lives == float("inf") else f"{res.texts['lives_colon']} {ss.lives}", res.fonts["small_font"], (0, 0, 0))[0], (10, 130))
 
     def _draw_tc(self, screen, mx, my, game_state):
         ov = pygame.Surface((game_state["WIDTH"], game_state["HEIGHT"]), pygame.SRCALPHA); ov.fill((0, 0, 0, 180)); screen.blit(ov, (0, 0))
@@ -415,11 +414,7 @@ class SlingshotState(State):
         dr = pygame.Rect(0, 0, 700, 250); dr.center = (game_state["WIDTH"] // 2, game_state["HEIGHT"] // 2)
         pygame.draw.rect(screen, (50, 70, 50), dr); pygame.draw.rect(screen, (200, 220, 200), dr, 3)
         
-        f, x, y, sp = game_state["fonts"]["small_font"], dr.left + 20, dr.y + 20, game_state["fonts"]["small_font"].size(" ")[0]
-        for w in game_state.get("training_popup_text", "").split(" "):
-            ws = f.render(w, True, (255, 255, 255))
-            if x + ws.get_width() >= dr.right - 20: x, y = dr.left + 20, y + f.get_linesize()
-            screen.blit(ws, (x, y)); x += ws.get_width() + sp
+        screen.blit(render_paragraph(game_state.get("training_popup_text", ""), game_state["fonts"]["small_font"], dr.width - 40, (255, 255, 255)), (dr.left + 20, dr.y + 20))
             
         cs, cb = draw_text(get_text(game_state["texts"], "training_popup_continue"), game_state["fonts"]["small_font"], (255, 255, 255)); cb.center = (dr.centerx, dr.bottom - 40)
         if cb.collidepoint(mx, my): cs, _ = draw_text(get_text(game_state["texts"], "training_popup_continue"), game_state["fonts"]["small_font"], (120, 255, 120))
@@ -430,17 +425,13 @@ class SlingshotState(State):
         dr = pygame.Rect(0, 0, 600, 250); dr.center = (game_state["WIDTH"] // 2, game_state["HEIGHT"] // 2)
         pygame.draw.rect(screen, (60, 60, 80), dr); pygame.draw.rect(screen, (210, 210, 230), dr, 3)
         
-        bn_ru = game_state.get("bird_image_to_name", {}).get(game_state.get("current_bird_img"), "Неизвестная птица")
-        try: bn = get_text(game_state["texts"], "pedia_items")[list(game_state.get("bird_image_to_name", {}).values()).index(bn_ru)]
-        except: bn = get_text(game_state["texts"], "unknown_bird")
+        bird_type = game_state.get("current_bird_type")
+        bn = get_text(game_state["texts"], "pedia_items")[bird_type] if bird_type is not None else get_text(game_state["texts"], "unknown_bird")
 
         ts, tr = draw_text(bn, game_state["fonts"]["small_font"], (255, 215, 0)); screen.blit(ts, ts.get_rect(centerx=dr.centerx, y=dr.y + 20))
         
-        f, x, y, sp = game_state["fonts"]["pedia_font"], dr.left + 20, dr.y + 70, game_state["fonts"]["pedia_font"].size(" ")[0]
-        for w in get_text(game_state["texts"], "pedia_descriptions").get(bn, get_text(game_state["texts"], "no_bird_on_slingshot")).split(" "):
-            ws = f.render(w, True, (255, 255, 255))
-            if x + ws.get_width() >= dr.right - 20: x, y = dr.left + 20, y + f.get_linesize()
-            screen.blit(ws, (x, y)); x += ws.get_width() + sp
+        desc = get_text(game_state["texts"], "pedia_descriptions").get(bn, get_text(game_state["texts"], "no_bird_on_slingshot"))
+        screen.blit(render_paragraph(desc, game_state["fonts"]["pedia_font"], dr.width - 40, (255, 255, 255)), (dr.left + 20, dr.y + 70))
             
         cs, cb = draw_text(get_text(game_state["texts"], "hint_popup_close"), game_state["fonts"]["small_font"], (255, 255, 255)); cb.center = (dr.centerx, dr.bottom - 30)
         if cb.collidepoint(mx, my): cs, _ = draw_text(get_text(game_state["texts"], "hint_popup_close"), game_state["fonts"]["small_font"], (120, 255, 120))
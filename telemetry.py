@@ -0,0 +1,150 @@
+# telemetry.py
+
+"""Телеметрия выстрелов: append-only бинарный лог со сжатием zlib.
+
+Файл начинается с сигнатуры, затем идут блоки: заголовок (длина сжатых
+данных, число записей) и zlib-сжатая пачка записей фиксированного размера.
+Запись ведет фоновый поток, игровой цикл только кладет событие в очередь.
+"""
+
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+
+TELEMETRY_DIR = "telemetry"
+MAX_FILE_BYTES = 1024 * 1024
+BLOCK_RECORDS = 256
+FLUSH_INTERVAL = 2.0
+
+MAGIC = b"SHT1"
+BLOCK_HEADER = struct.Struct("<II")
+# время, угол (рад), сила (0..1), тип птицы, способность, попадание, режим,
+# сложность, комбо, среднее время кадра в полете (мс)
+RECORD = struct.Struct("<dffBBBBBHf")
+
+MODES = ("classic", "sharpshooter", "obstacle", "training", "developer", "campaign")
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+def pack_event(event):
+    return RECORD.pack(
+        event["time"],
+        event["angle"],
+        event["power"],
+        event["bird_type"],
+        1 if event["ability_used"] else 0,
+        1 if event["hit"] else 0,
+        MODES.index(event["mode"]) if event["mode"] in MODES else 255,
+        DIFFICULTIES.index(event["difficulty"]) if event["difficulty"] in DIFFICULTIES else 255,
+        min(event["combo"], 0xFFFF),
+        event["frame_time_ms"],
+    )
+
+
+def unpack_record(data, offset=0):
+    t, angle, power, bird, ability, hit, mode, diff, combo, frame_ms = RECORD.unpack_from(data, offset)
+    return {
+        "time": t,
+        "angle": angle,
+        "power": power,
+        "bird_type": bird,
+        "ability_used": bool(ability),
+        "hit": bool(hit),
+        "mode": MODES[mode] if mode < len(MODES) else "unknown",
+        "difficulty": DIFFICULTIES[diff] if diff < len(DIFFICULTIES) else "unknown",
+        "combo": combo,
+        "frame_time_ms": frame_ms,
+    }
+
+
+def iter_records(paths):
+    """Потоково читает записи из лог-файлов, держа в памяти один блок."""
+    for path in paths:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                continue
+            while True:
+                header = f.read(BLOCK_HEADER.size)
+                if len(header) < BLOCK_HEADER.size:
+                    break
+                length, count = BLOCK_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length:
+                    break  # недописанный блок после аварийного завершения
+                data = zlib.decompress(payload)
+                for i in range(count):
+                    yield unpack_record(data, i * RECORD.size)
+
+
+def log_files(directory=TELEMETRY_DIR):
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.startswith("shots_") and name.endswith(".bin")
+    )
+
+
+class TelemetryWriter:
+    def __init__(self, directory=TELEMETRY_DIR, max_file_bytes=MAX_FILE_BYTES):
+        self.directory = directory
+        self.max_file_bytes = max_file_bytes
+        self.queue = queue.Queue()
+        self.file = None
+        self.thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def emit(self, event):
+        """Не блокирует игровой цикл: событие только ставится в очередь."""
+        self.queue.put_nowait(event)
+
+    def _open_file(self):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        n = 0
+        while True:
+            path = os.path.join(self.directory, f"shots_{stamp}_{n}.bin")
+            if not os.path.exists(path):
+                break
+            n += 1
+        self.file = open(path, "ab")
+        self.file.write(MAGIC)
+
+    def _write_block(self, records):
+        payload = zlib.compress(b"".join(records))
+        block = BLOCK_HEADER.pack(len(payload), len(records)) + payload
+        if self.file is None or self.file.tell() + len(block) > self.max_file_bytes:
+            if self.file is not None:
+                self.file.close()
+            self._open_file()
+        self.file.write(block)
+        self.file.flush()
+
+    def _run(self):
+        records, last_flush, closing = [], time.monotonic(), False
+        while not closing:
+            try:
+                event = self.queue.get(timeout=FLUSH_INTERVAL)
+                if event is None:
+                    closing = True
+                else:
+                    records.append(pack_event(event))
+            except queue.Empty:
+                pass
+            now = time.monotonic()
+            if records and (closing or len(records) >= BLOCK_RECORDS or now - last_flush >= FLUSH_INTERVAL):
+                try:
+                    self._write_block(records)
+                except (IOError, OSError) as e:
+                    print(f"Ошибка записи телеметрии: {e}")
+                records, last_flush = [], now
+        if self.file is not None:
+            self.file.close()
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
@@ -0,0 +1,114 @@
+# telemetry_stats.py
+
+"""Офлайн-анализ телеметрии выстрелов.
+
+Логи читаются потоково, все показатели считаются накопительными суммами,
+поэтому память не зависит от размера логов:
+
+    python telemetry_stats.py [файлы или каталоги ...]
+"""
+
+import argparse
+import math
+import os
+
+from telemetry import TELEMETRY_DIR, iter_records, log_files
+
+POWER_BINS = 10
+
+
+class ShotStats:
+    def __init__(self):
+        self.shots = 0
+        self.modes = {}  # режим -> [выстрелы, попадания]
+        self.power_hist = [0] * POWER_BINS
+        self.power_hits = [0] * POWER_BINS
+        self.abilities = [0, 0]  # [со способностью, из них попаданий]
+        # Суммы для корреляции Пирсона между временем кадра и попаданием
+        self.sx = self.sy = self.sxx = self.syy = self.sxy = 0.0
+
+    def add(self, record):
+        self.shots += 1
+        hit = 1.0 if record["hit"] else 0.0
+        mode = self.modes.setdefault(record["mode"], [0, 0])
+        mode[0] += 1
+        mode[1] += int(hit)
+
+        b = min(POWER_BINS - 1, max(0, int(record["power"] * POWER_BINS)))
+        self.power_hist[b] += 1
+        self.power_hits[b] += int(hit)
+
+        if record["ability_used"]:
+            self.abilities[0] += 1
+            self.abilities[1] += int(hit)
+
+        x = record["frame_time_ms"]
+        self.sx += x
+        self.sy += hit
+        self.sxx += x * x
+        self.syy += hit * hit
+        self.sxy += x * hit
+
+    def frame_time_correlation(self):
+        n = self.shots
+        if n < 2:
+            return None
+        cov = self.sxy - self.sx * self.sy / n
+        vx = self.sxx - self.sx * self.sx / n
+        vy = self.syy - self.sy * self.sy / n
+        if vx <= 0 or vy <= 0:
+            return None
+        return cov / math.sqrt(vx * vy)
+
+    def report(self):
+        lines = [f"Выстрелов: {self.shots}", "", "Попадания по режимам:"]
+        for mode, (shots, hits) in sorted(self.modes.items()):
+            lines.append(f"  {mode:<14} {hits:>6}/{shots:<6} {hits / shots:6.1%}")
+
+        lines += ["", "Распределение силы натяжения:"]
+        peak = max(self.power_hist) or 1
+        for i, count in enumerate(self.power_hist):
+            rate = self.power_hits[i] / count if count else 0.0
+            bar = "#" * int(40 * count / peak)
+            lines.append(f"  {i * 100 // POWER_BINS:>3}-{(i + 1) * 100 // POWER_BINS:<3}% {count:>6} попад. {rate:6.1%} {bar}")
+
+        if self.abilities[0]:
+            lines += ["", f"Со способностью: {self.abilities[0]}, попаданий {self.abilities[1] / self.abilities[0]:.1%}"]
+
+        corr = self.frame_time_correlation()
+        if self.shots:
+            lines += ["", f"Среднее время кадра в полете: {self.sx / self.shots:.2f} мс"]
+        lines.append(
+            "Корреляция времени кадра и попадания: "
+            + ("недостаточно данных" if corr is None else f"{corr:+.3f}")
+        )
+        return "\n".join(lines)
+
+
+def collect_paths(args):
+    paths = []
+    for arg in args or [TELEMETRY_DIR]:
+        paths.extend(log_files(arg) if os.path.isdir(arg) else [arg])
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Статистика выстрелов по логам телеметрии.")
+    parser.add_argument("paths", nargs="*", help=f"файлы логов или каталоги (по умолчанию {TELEMETRY_DIR}/)")
+    parser.add_argument("--mode", help="учитывать только этот режим")
+    parser.add_argument("--difficulty", help="учитывать только эту сложность")
+    args = parser.parse_args()
+
+    stats = ShotStats()
+    records = iter_records(collect_paths(args.paths))
+    if args.mode:
+        records = (r for r in records if r["mode"] == args.mode)
+    if args.difficulty:
+        records = (r for r in records if r["difficulty"] == args.difficulty)
+    for record in records:
+        stats.add(record)
+    print(stats.report())
+
+
+if __name__ == "__main__":
+    main()
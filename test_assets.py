@@ -0,0 +1,138 @@
+# test_assets.py
+
+"""Объем ресурсов по сценариям в пределах бюджета, выгрузка при маленьком
+бюджете и смена разрешения без повторного декодирования исходников.
+
+Запуск без окна: python -m pytest -q test_assets.py
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from assets import RESIDENT_IMAGES, AssetManager
+from game_objects import compute_screen_metrics
+from game_states import LevelSelectionState, MainMenuState, StateManager
+from match3_game import Match3State
+from settings import MAX_EXPLOSION_FRAMES, load_images, source_images
+from slingshot_game import SlingshotState
+
+
+def image_metrics(width, height):
+    metrics = compute_screen_metrics(width, height)
+    return (width, height, metrics["scale_factor"], metrics["game_scale_factor"])
+
+
+@pytest.fixture
+def game(monkeypatch):
+    # Игра читает ресурсы по относительным путям из папки проекта
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
+    pygame.display.init()
+    pygame.display.set_mode((800, 600))
+    source_images.clear()
+    metrics = image_metrics(800, 600)
+    assets = AssetManager(load_images(*metrics, RESIDENT_IMAGES), metrics)
+    sm = StateManager()
+    sm.add_state("main_menu", MainMenuState())
+    sm.add_state("level_selection", LevelSelectionState())
+    sm.add_state("slingshot", SlingshotState())
+    sm.add_state("match3", Match3State())
+    game_state = {
+        "state_manager": sm,
+        "assets": assets,
+        "images": assets.images,
+        "game_mode": "classic",
+        "MAX_EXPLOSION_FRAMES": MAX_EXPLOSION_FRAMES,
+    }
+    yield sm, game_state
+    settle(assets)
+    source_images.clear()
+    pygame.display.quit()
+
+
+def settle(assets):
+    # Фоновая предзагрузка доводится до конца и забирается, как в главном
+    # цикле: замер не зависит от потоков
+    for future in {future for _, future in assets.pending.values()}:
+        future.result()
+    assets.poll()
+
+
+def switch_resolution(game_state, width, height):
+    # Как apply_screen_settings + finish_screen_switch, без окна и сброса игры
+    assets = game_state["assets"]
+    metrics = image_metrics(width, height)
+    assets.replace(load_images(*metrics, names=assets.loaded_names()), metrics)
+
+
+SCENARIOS = {
+    "menu": ["main_menu"],
+    "slingshot": ["main_menu", "slingshot"],
+    "match3": ["main_menu", "level_selection", "match3"],
+    "resolution_switch": ["main_menu", "slingshot", (1280, 720), "main_menu"],
+}
+
+
+@pytest.mark.parametrize("scenario", sorted(SCENARIOS))
+def test_memory_stays_within_budget(game, scenario):
+    sm, game_state = game
+    for step in SCENARIOS[scenario]:
+        if isinstance(step, tuple):
+            switch_resolution(game_state, *step)
+        else:
+            sm.change_state(step, game_state)
+        settle(game_state["assets"])
+        report = game_state["assets"].report()
+        assert report["total"] <= report["budget"], (step, report["categories"])
+    assert report["peak"] <= report["budget"], report["categories"]
+
+
+def test_resolution_switch_reuses_decoded_sources(game, monkeypatch):
+    sm, game_state = game
+    sm.change_state("main_menu", game_state)
+    sm.change_state("slingshot", game_state)
+    settle(game_state["assets"])
+    loads = []
+    image_load = pygame.image.load
+    monkeypatch.setattr(
+        pygame.image, "load", lambda *args: loads.append(args) or image_load(*args)
+    )
+    switch_resolution(game_state, 1280, 720)
+    assert loads == []
+
+
+def test_finished_preload_is_trimmed_to_budget(game):
+    sm, game_state = game
+    assets = game_state["assets"]
+    assets.budget = 130 * 1024 * 1024
+    # Меню предзагружает ресурсы рогатки; их исходники не влезают в бюджет
+    sm.change_state("main_menu", game_state)
+    for future in {future for _, future in assets.pending.values()}:
+        future.result()
+    assert assets.total_bytes() > assets.budget
+    assets.poll()
+    assert assets.total_bytes() <= assets.budget
+    assert not assets.pending
+
+
+def test_small_budget_evicts_unreferenced_assets(game):
+    sm, game_state = game
+    images = game_state["images"]
+    sm.change_state("main_menu", game_state)
+    sm.change_state("slingshot", game_state)
+    assert "target_img" in images
+    game_state["assets"].budget = 1
+    sm.change_state("main_menu", game_state)
+    sm.change_state("level_selection", game_state)
+    # Ресурсы рогатки без ссылок выгружены, фон меню держит выбор уровня
+    assert "menu_background" in images
+    assert "target_img" not in images
+    sm.change_state("match3", game_state)
+    assert "menu_background" not in images
+    assert "background" in images
+    # Постоянные ресурсы не выгружаются при любом бюджете
+    assert all(name in images for name in RESIDENT_IMAGES)
@@ -0,0 +1,52 @@
+# test_context.py
+
+"""GameContext ведет себя как прежний словарь game_state: ключ раздела,
+которому ничего не присвоено, отсутствует для get, in, [] и del.
+"""
+
+import pytest
+
+from context import GameContext
+
+
+def test_unset_section_key_is_missing():
+    game_state = GameContext({"score": 0})
+    assert "main_bird" not in game_state
+    assert game_state.get("main_bird") is None
+    assert game_state.get("main_bird", "нет") == "нет"
+    with pytest.raises(KeyError):
+        game_state["main_bird"]
+    with pytest.raises(KeyError):
+        del game_state["main_bird"]
+    assert list(game_state) == ["score"]
+    assert len(game_state) == 1
+
+
+def test_set_and_delete_section_key():
+    game_state = GameContext()
+    game_state["space"] = None
+    assert "space" in game_state
+    assert game_state.get("space", "нет") is None
+    assert game_state.slingshot.space is None
+
+    del game_state["space"]
+    assert "space" not in game_state
+    assert game_state.get("space", "нет") == "нет"
+    with pytest.raises(KeyError):
+        game_state["space"]
+    with pytest.raises(AttributeError):
+        game_state.slingshot.space
+
+
+def test_extra_keys_and_update_match_dict():
+    values = {"score": 3, "WIDTH": 800, "paused": False, "current_profile": "a"}
+    game_state = GameContext(values)
+    assert dict(game_state) == values
+    assert game_state.extra == {"paused": False, "current_profile": "a"}
+
+    game_state.update(score=5, menu="main")
+    values.update(score=5, menu="main")
+    assert dict(game_state) == values
+    assert game_state.pop("menu") == "main"
+    assert "menu" not in game_state
+    assert game_state.get("menu", 1) == 1
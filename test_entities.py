@@ -0,0 +1,96 @@
+# test_entities.py
+
+"""Повтор 20 выстрелов: EntityGroup.collide находит те же попадания, что
+попиксельная проверка pygame.sprite.collide_mask по всем мишеням, и журнал
+попаданий совпадает с журналом спрайтов pygame.sprite.Group до EntityGroup.
+
+Запуск без окна: python -m pytest -q test_entities.py
+"""
+
+import os
+import random
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+import entities
+
+WIDTH, HEIGHT, GROUND = 1280, 720, 700
+SHOTS = 20
+FRAMES = 240
+# (выстрел, кадр, номер мишени), снято с pygame.sprite.Group до EntityGroup
+EXPECTED_HITS = [
+    (0, 23, 28),
+    (1, 27, 14),
+    (2, 37, 6),
+    (3, 30, 0),
+    (4, 46, 26),
+    (5, 38, 16),
+    (6, 25, 24),
+    (7, 26, 14),
+    (13, 35, 26),
+    (16, 32, 5),
+    (17, 23, 10),
+]
+
+
+@pytest.fixture
+def images(monkeypatch):
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
+    pygame.display.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+    yield tuple(
+        pygame.transform.scale(pygame.image.load(name).convert_alpha(), (50, 50))
+        for name in ("target.png", "bird1.png")
+    )
+    pygame.display.quit()
+
+
+def replay_shot(seed, target_img, bird_img):
+    """Журнал попаданий выстрела: (кадр, номер мишени)."""
+    rng = random.Random(seed)
+    space = entities.create_space(WIDTH, HEIGHT, GROUND)
+    group = entities.EntityGroup()
+    targets = []
+    for _ in range(30):
+        target = entities.Target(
+            rng.uniform(500, 1200),
+            rng.uniform(100, 650),
+            rng.uniform(-2, 2),
+            rng.uniform(-2, 2),
+            50,
+            space,
+            target_img,
+        )
+        group.add(target)
+        targets.append(target)
+    bird = entities.MainBird(200, 500, 50, space)
+    bird.set_image(bird_img, 0)
+    bird.drag_to(100 - rng.uniform(0, 60), 560 + rng.uniform(-80, 40), WIDTH, HEIGHT)
+    bird.launch(200, 500, 1.0)
+
+    hits = []
+    for frame in range(FRAMES):
+        space.step(1 / 60)
+        group.sync()
+        bird.pull()
+        group.update(1 / 60, WIDTH, HEIGHT)
+        bird.update(1 / 60, 0, GROUND, WIDTH, HEIGHT)
+        found = group.collide(bird)
+        expected = [t for t in group if pygame.sprite.collide_mask(bird, t)]
+        assert set(found) == set(expected), (seed, frame)
+        for target in found:
+            hits.append((frame, targets.index(target)))
+            target.kill()
+    return hits
+
+
+def test_replay_matches_sprite_group_hits(images):
+    log = [
+        (seed, frame, index)
+        for seed in range(SHOTS)
+        for frame, index in replay_shot(seed, *images)
+    ]
+    assert log == EXPECTED_HITS
@@ -0,0 +1,46 @@
+# test_level_generator.py
+
+"""Ограничение перебора и абсолютные корзины сложности generate_layouts.
+
+Оценка расстановок подменяется, поэтому тест не запускает симуляцию.
+"""
+
+import level_generator
+from level_generator import (
+    BUCKET_THRESHOLDS,
+    MAX_SAMPLES_PER_LAYOUT,
+    difficulty_bucket,
+    generate_layouts,
+)
+
+CONSTRAINTS = {"mode": "classic", "difficulty": "easy", "width": 800, "height": 600}
+
+
+def fake_evaluate(probabilities, sampled):
+    def evaluate_layouts(layouts, **kwargs):
+        sampled.append(len(layouts))
+        return [{"hit_probability": p} for p, _ in zip(probabilities, layouts)]
+
+    return evaluate_layouts
+
+
+def test_unsolvable_constraints_stop_after_sample_limit(monkeypatch):
+    sampled = []
+    monkeypatch.setattr(
+        level_generator, "evaluate_layouts", fake_evaluate([0.0] * 1000, sampled)
+    )
+    buckets = generate_layouts(CONSTRAINTS, 5, seed=1)
+    assert sum(sampled) == 5 * MAX_SAMPLES_PER_LAYOUT
+    assert all(layouts == [] for layouts in buckets.values())
+
+
+def test_buckets_use_absolute_ratings(monkeypatch):
+    easy_min, medium_min = BUCKET_THRESHOLDS["classic"]
+    monkeypatch.setattr(
+        level_generator, "evaluate_layouts", fake_evaluate([easy_min], [])
+    )
+    # Одна легкая расстановка — в "easy", а не в последнюю треть "hard"
+    buckets = generate_layouts(CONSTRAINTS, 1, seed=1)
+    assert [len(buckets[name]) for name in ("easy", "medium", "hard")] == [1, 0, 0]
+    assert difficulty_bucket("classic", medium_min) == "medium"
+    assert difficulty_bucket("classic", medium_min - 0.01) == "hard"
@@ -0,0 +1,29 @@
+# test_match3_bot.py
+
+"""Поиск бота демонстрации уменьшается с размером доски: на каждом уровне
+кампании один запрос хода разыгрывает ограниченное число каскадов.
+"""
+
+import random
+
+from game_objects import CAMPAIGN_LEVEL_COUNT, campaign_level_config
+from match3_board import generate_board, legal_swaps
+from match3_bot import demo_search
+
+TYPES_COUNT = 5
+# Каскадов на запрос: глубина 2 на доске 11x11 — около 8500
+MAX_CASCADES = 10_000
+
+
+def test_demo_search_is_bounded_on_every_campaign_board():
+    for level in range(1, CAMPAIGN_LEVEL_COUNT + 1):
+        size, _ = campaign_level_config(level)
+        depth, samples = demo_search(size)
+        board = generate_board(size, size, TYPES_COUNT, random.Random(level))
+        moves = len(legal_swaps(board))
+        assert (moves * samples) ** depth <= MAX_CASCADES, (size, depth, samples)
+
+
+def test_small_boards_keep_two_ply_search():
+    assert demo_search(7) == (2, 2)
+    assert demo_search(32)[0] == 1
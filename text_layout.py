@@ -0,0 +1,80 @@
+# text_layout.py
+
+"""Перенос абзацев по словам с кэшированием готовых поверхностей.
+
+Абзац раскладывается и рендерится один раз для сочетания (текст, шрифт,
+ширина, цвет, выравнивание), после чего кадр всплывающего окна — это один
+blit. Кэш сбрасывается при смене языка и разрешения (шрифты при этом
+пересоздаются).
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+MAX_CACHED_PARAGRAPHS = 64
+
+
+def wrap_words(text, font, width):
+    """Разбивает текст на строки, каждая строка — список (слово, ширина)."""
+    lines, line, line_w = [], [], 0
+    space_w = font.size(" ")[0]
+    for word in text.split():
+        word_w = font.size(word)[0]
+        x = line_w + space_w if line else 0
+        if line and x + word_w >= width:
+            lines.append(line)
+            line, x = [], 0
+        line.append((word, word_w))
+        line_w = x + word_w
+    if line:
+        lines.append(line)
+    return lines
+
+
+class TextLayoutCache:
+    def __init__(self, max_entries=MAX_CACHED_PARAGRAPHS):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+
+    def render(self, text, font, width, color, justify=False):
+        key = (text, font, width, color, justify)
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.entries.move_to_end(key)
+            return surf
+        surf = self._layout(text, font, width, color, justify)
+        self.entries[key] = surf
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surf
+
+    def _layout(self, text, font, width, color, justify):
+        lines = wrap_words(text, font, width)
+        line_h, space_w = font.get_linesize(), font.size(" ")[0]
+        surf = pygame.Surface((width, max(1, len(lines)) * line_h), pygame.SRCALPHA)
+        for row, line in enumerate(lines):
+            gap = space_w
+            # Последняя строка абзаца не растягивается
+            if justify and len(line) > 1 and row < len(lines) - 1:
+                gap = (width - sum(w for _, w in line)) / (len(line) - 1)
+            x = 0.0
+            for word, word_w in line:
+                surf.blit(font.render(word, True, color), (round(x), row * line_h))
+                x += word_w + gap
+        return surf
+
+    def clear(self):
+        self.entries.clear()
+
+
+_layout_cache = TextLayoutCache()
+
+
+def render_paragraph(text, font, width, color, justify=False):
+    """Поверхность абзаца шириной width с переносом по словам."""
+    return _layout_cache.render(text, font, width, color, justify)
+
+
+def clear_layout_cache():
+    _layout_cache.clear()
@@ -0,0 +1,121 @@
+# tween.py
+
+"""Планировщик анимаций (твинов) на плоских массивах.
+
+Все активные твины лежат в параллельных массивах array (начало, конец,
+прогресс, скорость, функция сглаживания), за кадр они продвигаются одним
+проходом. Завершенные твины удаляются перестановкой с последним
+элементом, а их колбэки вызываются после прохода, поэтому колбэк может
+сразу запускать новые твины.
+"""
+
+from array import array
+
+EASE_LINEAR = 0
+EASE_OUT_QUAD = 1
+EASE_IN_OUT_QUAD = 2
+
+
+def ease(easing, t):
+    if easing == EASE_OUT_QUAD:
+        return t * (2.0 - t)
+    if easing == EASE_IN_OUT_QUAD:
+        return 2.0 * t * t if t < 0.5 else 1.0 - 2.0 * (1.0 - t) * (1.0 - t)
+    return t
+
+
+class TweenScheduler:
+    def __init__(self):
+        self.start = array("d")
+        self.end = array("d")
+        self.progress = array("d")
+        self.speed = array("d")  # доля пути в секунду
+        self.easing = array("B")
+        self.ids = []  # номер позиции -> id твина
+        self.callbacks = []
+        self.index = {}  # id твина -> номер позиции в массивах
+        self.next_id = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, start, end, duration, easing=EASE_LINEAR, on_complete=None):
+        tween_id = self.next_id
+        self.next_id += 1
+        self.index[tween_id] = len(self.ids)
+        self.start.append(start)
+        self.end.append(end)
+        self.progress.append(0.0)
+        self.speed.append(1.0 / duration if duration > 0 else float("inf"))
+        self.easing.append(easing)
+        self.ids.append(tween_id)
+        self.callbacks.append(on_complete)
+        return tween_id
+
+    def join(self, tween_ids, on_complete):
+        """Вызывает on_complete, когда завершатся все твины из tween_ids."""
+        pending = set(tween_ids)
+        if not pending:
+            on_complete()
+            return
+
+        def done(tween_id):
+            pending.discard(tween_id)
+            if not pending:
+                on_complete()
+
+        for tween_id in tween_ids:
+            i = self.index[tween_id]
+            own = self.callbacks[i]
+            if own is None:
+                self.callbacks[i] = done
+            else:
+                self.callbacks[i] = lambda tid, own=own: (own(tid), done(tid))
+
+    def active(self, tween_id):
+        return tween_id in self.index
+
+    def value(self, tween_id):
+        """Текущее значение твина или None, если он уже завершен."""
+        i = self.index.get(tween_id)
+        if i is None:
+            return None
+        t = ease(self.easing[i], self.progress[i])
+        return self.start[i] + (self.end[i] - self.start[i]) * t
+
+    def _remove(self, i):
+        last = len(self.ids) - 1
+        del self.index[self.ids[i]]
+        if i != last:
+            for arr in (self.start, self.end, self.progress, self.speed, self.easing):
+                arr[i] = arr[last]
+            self.ids[i] = self.ids[last]
+            self.callbacks[i] = self.callbacks[last]
+            self.index[self.ids[i]] = i
+        for arr in (self.start, self.end, self.progress, self.speed, self.easing):
+            arr.pop()
+        self.ids.pop()
+        self.callbacks.pop()
+
+    def step(self, dt):
+        progress, speed = self.progress, self.speed
+        finished = []
+        for i in range(len(progress)):
+            p = progress[i] + speed[i] * dt
+            if p >= 1.0:
+                p = 1.0
+                finished.append(i)
+            progress[i] = p
+        if not finished:
+            return
+        completed = []
+        # Удаление с конца, чтобы перестановка не сдвигала еще не удаленные позиции
+        for i in reversed(finished):
+            completed.append((self.ids[i], self.callbacks[i]))
+            self._remove(i)
+        for tween_id, callback in reversed(completed):
+            if callback is not None:
+                callback(tween_id)
+
+    def clear(self):
+        self.__init__()
@@ -1,7 +1,6 @@
 import pygame
 import math
 import random
-from localization import LANGUAGES
 
 
 def draw_text(text, font, color):
@@ -10,30 +9,20 @@ def draw_text(text, font, color):
 
 
 def get_text(current_texts, key):
-    text = current_texts.get(key)
-    if text is not None:
-        return text
-    text = LANGUAGES["ru"].get(key)
-    if text is not None:
-        return text
-    print(f"Warning: Localization key '{key}' not found in any language.")
-    return f"[{key}]"
+    # Каталоги из localization.load_catalog уже содержат подстановки
+    return current_texts[key]
 
 
-def create_target(WIDTH, HEIGHT, size):
+def create_target(WIDTH, HEIGHT, size, rng=random):
     x_min, x_max = int(WIDTH * 0.4), WIDTH - size - 20
     y_min, y_max = int(HEIGHT * 0.2), HEIGHT - size - int(HEIGHT * 0.25)
-    return pygame.Rect(
-        random.randint(x_min, x_max), random.randint(y_min, y_max), size, size
-    )
+    return pygame.Rect(rng.randint(x_min, x_max), rng.randint(y_min, y_max), size, size)
 
 
-def create_obstacle(WIDTH, HEIGHT, size):
+def create_obstacle(WIDTH, HEIGHT, size, rng=random):
     x_min, x_max = int(WIDTH * 0.4), WIDTH - size - 50
     y_min, y_max = int(HEIGHT * 0.2), HEIGHT - size - int(HEIGHT * 0.3)
-    return pygame.Rect(
-        random.randint(x_min, x_max), random.randint(y_min, y_max), size, size
-    )
+    return pygame.Rect(rng.randint(x_min, x_max), rng.randint(y_min, y_max), size, size)
 
 
 def create_trail_particle(trail_particles, x, y):
@@ -0,0 +1,128 @@
+import pygame
+
+
+class VirtualList:
+    """Прокручиваемый список, который рисует и проверяет только видимые строки.
+
+    Поверхности строк кэшируются по (ключ, вариант); вариант описывает
+    оформление строки (выбрана, под курсором и т.п.). Кэш строки
+    сбрасывается через invalidate(ключ), весь кэш — при смене шрифта.
+    """
+
+    def __init__(self, row_height=40):
+        self.row_height = row_height
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.keys = []
+        self.scroll = 0
+        self.style = None
+        self.pending_key = None  # scroll_to до первого set_rect
+        self.cache = {}  # ключ -> {вариант: поверхность}
+
+    def set_items(self, keys):
+        self.keys = list(keys)
+        alive = set(self.keys)
+        for key in [key for key in self.cache if key not in alive]:
+            del self.cache[key]
+        self.scroll_by(0)
+
+    def set_rect(self, x, y, width, max_height):
+        """Высота списка — по числу строк, но не больше max_height."""
+        height = min(
+            len(self.keys) * self.row_height, max(self.row_height, max_height)
+        )
+        self.rect = pygame.Rect(x, y, width, height)
+        self.scroll_by(0)
+        if self.pending_key is not None:
+            key, self.pending_key = self.pending_key, None
+            self.scroll_to(key)
+
+    def set_style(self, style):
+        if style is not self.style:
+            self.style = style
+            self.cache.clear()
+
+    def invalidate(self, key=None):
+        if key is None:
+            self.cache.clear()
+        else:
+            self.cache.pop(key, None)
+
+    def max_scroll(self):
+        return max(0, len(self.keys) * self.row_height - self.rect.height)
+
+    def scroll_by(self, dy):
+        self.scroll = min(max(0, self.scroll + dy), self.max_scroll())
+
+    def scroll_to(self, key):
+        if key not in self.keys:
+            return
+        if not self.rect.height:
+            # Размеры списка еще не заданы: прокрутка откладывается до set_rect
+            self.pending_key = key
+            return
+        top = self.keys.index(key) * self.row_height
+        if top < self.scroll:
+            self.scroll_by(top - self.scroll)
+        elif top + self.row_height > self.scroll + self.rect.height:
+            self.scroll_by(top + self.row_height - self.scroll - self.rect.height)
+
+    def handle_event(self, event, mx, my):
+        """Прокрутка колесом над списком; True, если событие обработано."""
+        if event.type == pygame.MOUSEWHEEL and self.rect.collidepoint(mx, my):
+            self.scroll_by(-event.y * self.row_height)
+            return True
+        return False
+
+    def row_rect(self, index):
+        return pygame.Rect(
+            self.rect.x,
+            self.rect.y + index * self.row_height - self.scroll,
+            self.rect.width,
+            self.row_height,
+        )
+
+    def visible_rows(self):
+        first = self.scroll // self.row_height
+        last = min(
+            len(self.keys),
+            (self.scroll + self.rect.height + self.row_height - 1) // self.row_height,
+        )
+        for index in range(first, last):
+            yield self.keys[index], self.row_rect(index)
+
+    def index_at(self, mx, my):
+        """Номер строки под точкой или None; считается за O(1), без обхода строк."""
+        if not self.rect.collidepoint(mx, my):
+            return None
+        index = (my - self.rect.y + self.scroll) // self.row_height
+        return index if index < len(self.keys) else None
+
+    def row_at(self, mx, my):
+        index = self.index_at(mx, my)
+        return None if index is None else self.keys[index]
+
+    def draw(self, screen, variant_for, render):
+        """variant_for(ключ, rect) -> вариант; render(ключ, вариант) -> поверхность."""
+        clip = screen.get_clip()
+        screen.set_clip(self.rect)
+        for key, rect in self.visible_rows():
+            variant = variant_for(key, rect)
+            variants = self.cache.setdefault(key, {})
+            surf = variants.get(variant)
+            if surf is None:
+                surf = variants[variant] = render(key, variant)
+            screen.blit(surf, rect.topleft)
+        screen.set_clip(clip)
+
+        if self.max_scroll() > 0:
+            track = pygame.Rect(self.rect.right - 6, self.rect.y, 6, self.rect.height)
+            thumb_h = max(
+                20, track.height * track.height // (len(self.keys) * self.row_height)
+            )
+            thumb_y = (
+                track.y + (track.height - thumb_h) * self.scroll // self.max_scroll()
+            )
+            pygame.draw.rect(screen, (200, 200, 200), track)
+            pygame.draw.rect(
+                screen, (100, 100, 100), (track.x, thumb_y, track.width, thumb_h)
+            )